@@ -0,0 +1,34 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Benchmarks for PyInform written in the style of `airspeed velocity`_ (asv).
+
+With asv installed, the suite can be run against a range of commits and the
+results, stored as JSON under ``.asv/results``, compared between them ::
+
+    $ asv run
+    $ asv compare HEAD~1 HEAD
+
+Because asv builds PyInform from a clean checkout, the inform binary must be
+provided via the ``PYINFORM_LIBINFORM`` environment variable.
+
+The suite can also be run directly against the installed PyInform, writing the
+results as JSON ::
+
+    $ python -m benchmarks --output results.json
+    $ python -m benchmarks --filter transfer_entropy
+
+.. _airspeed velocity: https://asv.readthedocs.io
+"""
+import numpy as np
+
+SEED = 2019
+
+
+def random_series(b, shape, seed=SEED):
+    """
+    Generate a reproducible base-*b* time series of the given *shape*.
+    """
+    rng = np.random.RandomState(seed)
+    return rng.randint(0, b, size=shape).astype(np.int32)
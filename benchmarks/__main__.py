@@ -0,0 +1,115 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Run the benchmark suite without asv, writing the results as JSON.
+"""
+import argparse
+import inspect
+import itertools
+import json
+import platform
+import re
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+import pyinform
+
+from benchmarks import dist, timeseries, utils
+
+MODULES = [timeseries, dist, utils]
+
+
+def commit():
+    """
+    Get the hash of the checked out commit, if any.
+    """
+    try:
+        out = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL)
+        return out.decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parameters(cls):
+    """
+    Enumerate every combination of the parameters of a benchmark class.
+    """
+    params = getattr(cls, "params", [])
+    names = getattr(cls, "param_names", [])
+    if len(names) == 1:
+        params = [params]
+    for values in itertools.product(*params):
+        yield dict(zip(names, values)), values
+
+
+def benchmarks(pattern):
+    """
+    Find all ``time_`` benchmarks whose fully-qualified name matches *pattern*.
+    """
+    for module in MODULES:
+        for clsname, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for name, _ in inspect.getmembers(cls, inspect.isfunction):
+                fullname = "{}.{}.{}".format(module.__name__, clsname, name)
+                if name.startswith("time_") and re.search(pattern, fullname):
+                    yield fullname, cls, name
+
+
+def run(fullname, cls, name, repeat):
+    """
+    Time one benchmark for every combination of its parameters.
+    """
+    results = []
+    for params, values in parameters(cls):
+        instance = cls()
+        try:
+            if hasattr(instance, "setup"):
+                instance.setup(*values)
+        except NotImplementedError:
+            continue
+        method = getattr(instance, name)
+        timer = timeit.Timer(lambda: method(*values))
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+        results.append({"benchmark": fullname, "params": params, "seconds": best})
+        sys.stderr.write("{} {} {:.3e}s\n".format(fullname, params, best))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--output", "-o", default=None,
+                        help="file to which the JSON results are written (default: stdout)")
+    parser.add_argument("--filter", "-f", default="",
+                        help="only run benchmarks whose names match this regular expression")
+    parser.add_argument("--repeat", "-r", type=int, default=5,
+                        help="number of timing repeats for each benchmark")
+    args = parser.parse_args(argv)
+
+    results = []
+    for fullname, cls, name in benchmarks(args.filter):
+        results.extend(run(fullname, cls, name, args.repeat))
+
+    report = {
+        "commit": commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "libinform": pyinform.get_libpath(),
+        "libinform_version": pyinform.get_libversion(),
+        "results": results,
+    }
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+from benchmarks import random_series
+from pyinform import shannon
+from pyinform.dist import Dist
+
+
+class DistConstruction:
+    """
+    Construction and copying of distributions.
+    """
+    params = [10, 10**3, 10**5]
+    param_names = ["support"]
+
+    def setup(self, support):
+        self.counts = list(random_series(100, support))
+        self.dist = Dist(self.counts)
+
+    def time_alloc(self, support):
+        Dist(support)
+
+    def time_create(self, support):
+        Dist(self.counts)
+
+    def time_copy(self, support):
+        self.dist.copy()
+
+    def time_resize(self, support):
+        self.dist.copy().resize(2 * support)
+
+    def time_dump(self, support):
+        self.dist.dump()
+
+
+class DistObservation:
+    """
+    Observing and querying events one at a time.
+    """
+    params = [10, 10**3]
+    param_names = ["support"]
+
+    def setup(self, support):
+        self.events = [int(x) for x in random_series(support, 10**3)]
+        self.dist = Dist(support)
+        for event in self.events:
+            self.dist.tick(event)
+
+    def time_tick(self, support):
+        d = Dist(support)
+        for event in self.events:
+            d.tick(event)
+
+    def time_getitem(self, support):
+        d = self.dist
+        for event in self.events:
+            d[event]
+
+    def time_probability(self, support):
+        d = self.dist
+        for event in self.events:
+            d.probability(event)
+
+
+class ShannonMeasures:
+    """
+    The Shannon information measures applied to distributions.
+    """
+    params = [10, 10**3, 10**5]
+    param_names = ["support"]
+
+    def setup(self, support):
+        self.p = Dist(list(random_series(100, support, seed=1) + 1))
+        self.q = Dist(list(random_series(100, support, seed=2) + 1))
+
+    def time_entropy(self, support):
+        shannon.entropy(self.p)
+
+    def time_mutual_info(self, support):
+        shannon.mutual_info(self.p, self.q, self.q)
+
+    def time_conditional_entropy(self, support):
+        shannon.conditional_entropy(self.p, self.q)
+
+    def time_relative_entropy(self, support):
+        shannon.relative_entropy(self.p, self.q)
@@ -0,0 +1,332 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import numpy as np
+
+from benchmarks import random_series
+from pyinform import batch, gaussian, integration, ksg
+from pyinform.error import ErrorCode, error_guard
+from pyinform import (active_info, block_entropy, conditional_entropy,
+                      entropy_rate, excess_entropy, mutual_info,
+                      predictive_info, relative_entropy, separable_info,
+                      transfer_entropy, transfer_entropy_pair)
+
+
+class HistoryMeasures:
+    """
+    Measures of a single time series with a history length.
+    """
+    params = ([1, 10, 100], [10**2, 10**4, 10**6], [2, 4], [1, 2, 4, 8])
+    param_names = ["trials", "length", "base", "k"]
+
+    def setup(self, trials, length, base, k):
+        if trials * length > 10**7:
+            raise NotImplementedError()
+        self.series = random_series(base, (trials, length))
+
+    def time_active_info(self, trials, length, base, k):
+        active_info(self.series, k)
+
+    def time_active_info_local(self, trials, length, base, k):
+        active_info(self.series, k, local=True)
+
+    def time_entropy_rate(self, trials, length, base, k):
+        entropy_rate(self.series, k)
+
+    def time_entropy_rate_local(self, trials, length, base, k):
+        entropy_rate(self.series, k, local=True)
+
+    def time_block_entropy(self, trials, length, base, k):
+        block_entropy(self.series, k)
+
+    def time_block_entropy_local(self, trials, length, base, k):
+        block_entropy(self.series, k, local=True)
+
+
+class PredictiveInfo:
+    """
+    Predictive information over a grid of past and future block lengths.
+    """
+    params = ([10**4, 10**6], [2, 4])
+    param_names = ["length", "base"]
+
+    def setup(self, length, base):
+        self.xs = random_series(base, length, seed=1)
+
+    def time_predictive_info(self, length, base):
+        predictive_info(self.xs, 3, 2)
+
+    def time_predictive_info_grid(self, length, base):
+        predictive_info(self.xs, [1, 2, 3, 4], [1, 2, 3, 4])
+
+    def time_excess_entropy_sweep(self, length, base):
+        excess_entropy(self.xs, [1, 2, 3, 4])
+
+
+class SeparableInfo:
+    """
+    Separable information of a target given many sources.
+    """
+    params = ([10**4, 10**6], [1, 10, 100], [1, 4])
+    param_names = ["length", "sources", "k"]
+
+    def setup(self, length, sources, k):
+        if length * sources > 10**7:
+            raise NotImplementedError()
+        self.sources = random_series(2, (sources, length), seed=1)
+        self.target = random_series(2, length, seed=2)
+
+    def time_separable_info(self, length, sources, k):
+        separable_info(self.sources, self.target, k)
+
+    def time_separable_info_local(self, length, sources, k):
+        separable_info(self.sources, self.target, k, local=True)
+
+
+class Integration:
+    """
+    Integration across every bipartition of a system of time series.
+    """
+    params = ([8, 16], [10**3, 10**4])
+    param_names = ["variables", "length"]
+
+    def setup(self, variables, length):
+        self.series = random_series(2, (variables, length), seed=1)
+
+    def time_subset_entropies(self, variables, length):
+        integration.subset_entropies(self.series)
+
+    def time_minimum_information_partition(self, variables, length):
+        integration.minimum_information_partition(self.series)
+
+
+class TransferEntropy:
+    """
+    Transfer entropy with and without background processes.
+    """
+    params = ([1, 10, 100], [10**2, 10**4, 10**6], [2, 4], [1, 2, 4], [0, 1, 2])
+    param_names = ["trials", "length", "base", "k", "conditions"]
+
+    def setup(self, trials, length, base, k, conditions):
+        if trials * length > 10**7:
+            raise NotImplementedError()
+        self.source = random_series(base, (trials, length), seed=1)
+        self.target = random_series(base, (trials, length), seed=2)
+        if conditions == 0:
+            self.condition = None
+        elif conditions == 1:
+            self.condition = random_series(base, (trials, length), seed=3)
+        else:
+            self.condition = random_series(base, (conditions, trials, length), seed=3)
+
+    def time_transfer_entropy(self, trials, length, base, k, conditions):
+        transfer_entropy(self.source, self.target, k, condition=self.condition)
+
+    def time_transfer_entropy_local(self, trials, length, base, k, conditions):
+        transfer_entropy(self.source, self.target, k, condition=self.condition, local=True)
+
+    def time_transfer_entropy_pair(self, trials, length, base, k, conditions):
+        if self.condition is not None:
+            raise NotImplementedError()
+        transfer_entropy_pair(self.source, self.target, k)
+
+    def time_transfer_entropy_both(self, trials, length, base, k, conditions):
+        if self.condition is not None:
+            raise NotImplementedError()
+        transfer_entropy(self.source, self.target, k)
+        transfer_entropy(self.target, self.source, k)
+
+
+class EmbeddedTransferEntropy:
+    """
+    Transfer entropy with embedded source and target histories.
+    """
+    params = ([10**4, 10**6], [2, 4], [1, 2, 4], [1, 3])
+    param_names = ["length", "base", "src_k", "tau"]
+
+    def setup(self, length, base, src_k, tau):
+        self.source = random_series(base, length, seed=1)
+        self.target = random_series(base, length, seed=2)
+
+    def time_transfer_entropy(self, length, base, src_k, tau):
+        transfer_entropy(self.source, self.target, 2, l=src_k, tau_source=tau, tau_target=tau)
+
+
+class LagScan:
+    """
+    Transfer entropy and mutual information over a range of delays.
+    """
+    params = ([10**4, 10**6], [2, 4], [10, 100])
+    param_names = ["length", "base", "delays"]
+
+    def setup(self, length, base, delays):
+        self.source = random_series(base, length, seed=1)
+        self.target = random_series(base, length, seed=2)
+
+    def time_transfer_entropy_profile(self, length, base, delays):
+        transfer_entropy(self.source, self.target, 2, delay=range(delays))
+
+    def time_transfer_entropy_sliced(self, length, base, delays):
+        for d in range(delays):
+            transfer_entropy(self.source[:length - d], self.target[d:], 2)
+
+    def time_mutual_info_profile(self, length, base, delays):
+        mutual_info(self.source, self.target, delay=range(delays))
+
+
+class PerTrial:
+    """
+    Measures of each of many short trials, at once and one trial at a time.
+    """
+    params = ([10**2, 10**4], [100], [2, 4])
+    param_names = ["trials", "length", "base"]
+
+    def setup(self, trials, length, base):
+        self.source = random_series(base, (trials, length), seed=1)
+        self.target = random_series(base, (trials, length), seed=2)
+
+    def time_active_info(self, trials, length, base):
+        active_info(self.target, 2, per_trial=True)
+
+    def time_active_info_rows(self, trials, length, base):
+        for xs in self.target:
+            active_info(xs, 2)
+
+    def time_transfer_entropy(self, trials, length, base):
+        transfer_entropy(self.source, self.target, 2, per_trial=True)
+
+    def time_transfer_entropy_rows(self, trials, length, base):
+        for ys, xs in zip(self.source, self.target):
+            transfer_entropy(ys, xs, 2)
+
+
+class Ensemble:
+    """
+    Measures of each time step across many trials, at once and one time step
+    at a time.
+    """
+    params = ([10**2, 10**4], [100], [2, 4])
+    param_names = ["trials", "length", "base"]
+
+    def setup(self, trials, length, base):
+        self.source = random_series(base, (trials, length), seed=1)
+        self.target = random_series(base, (trials, length), seed=2)
+
+    def time_active_info(self, trials, length, base):
+        active_info(self.target, 2, ensemble=True)
+
+    def time_active_info_time_steps(self, trials, length, base):
+        for t in range(length - 2):
+            active_info(self.target[:, t:t + 3], 2)
+
+    def time_transfer_entropy(self, trials, length, base):
+        transfer_entropy(self.source, self.target, 2, ensemble=True)
+
+
+class CallOverhead:
+    """
+    The per-call cost of the measures for time series short enough that the
+    wrappers, rather than the inform kernels, dominate.
+    """
+    params = ([10, 100, 1000],)
+    param_names = ["length"]
+
+    def setup(self, length):
+        self.source = random_series(2, length, seed=1)
+        self.target = random_series(2, length, seed=2)
+
+    def time_active_info(self, length):
+        active_info(self.target, 2, b=2)
+
+    def time_active_info_local(self, length):
+        active_info(self.target, 2, b=2, local=True)
+
+    def time_transfer_entropy(self, length):
+        transfer_entropy(self.source, self.target, 2, b=2)
+
+    def time_mutual_info(self, length):
+        mutual_info(self.source, self.target, b=2)
+
+    def time_error_guard(self, length):
+        error_guard(ErrorCode(0))
+
+
+class Batch:
+    """
+    Many independent transfer entropies computed in a pool of threads.
+    """
+    params = ([10**4, 10**5], [1, 2, 4, 8])
+    param_names = ["length", "threads"]
+
+    def setup(self, length, threads):
+        self.pairs = [(random_series(2, length, seed=2 * i), random_series(2, length, seed=2 * i + 1))
+                      for i in range(32)]
+
+    def time_transfer_entropy(self, length, threads):
+        batch.map(transfer_entropy, self.pairs, threads=threads, k=2)
+
+
+class Continuous:
+    """
+    Nearest-neighbour estimators of continuously-valued time series.
+    """
+    params = ([10**3, 10**4], [None, 4])
+    param_names = ["length", "threads"]
+
+    def setup(self, length, threads):
+        rng = np.random.RandomState(2019)
+        self.xs = rng.normal(size=length)
+        self.ys = self.xs + rng.normal(size=length)
+
+    def time_mutual_info(self, length, threads):
+        ksg.mutual_info(self.xs, self.ys, threads=threads)
+
+    def time_transfer_entropy(self, length, threads):
+        ksg.transfer_entropy(self.xs, self.ys, k=1, threads=threads)
+
+
+class GaussianMatrix:
+    """
+    Gaussian transfer entropy between every pair of many time series.
+    """
+    params = ([10, 100, 1000], [1, 2])
+    param_names = ["channels", "k"]
+
+    def setup(self, channels, k):
+        self.data = np.random.RandomState(2019).normal(size=(channels, 5000))
+
+    def time_transfer_entropy_matrix(self, channels, k):
+        gaussian.transfer_entropy_matrix(self.data, k)
+
+
+class PairMeasures:
+    """
+    Measures of a pair of time series without a history length.
+    """
+    params = ([10**2, 10**4, 10**6, 10**7], [2, 4, 16])
+    param_names = ["length", "base"]
+
+    def setup(self, length, base):
+        self.xs = random_series(base, length, seed=1)
+        self.ys = random_series(base, length, seed=2)
+
+    def time_mutual_info(self, length, base):
+        mutual_info(self.xs, self.ys)
+
+    def time_mutual_info_local(self, length, base):
+        mutual_info(self.xs, self.ys, local=True)
+
+    def time_conditional_entropy(self, length, base):
+        conditional_entropy(self.xs, self.ys)
+
+    def time_conditional_entropy_local(self, length, base):
+        conditional_entropy(self.xs, self.ys, local=True)
+
+    def time_relative_entropy(self, length, base):
+        relative_entropy(self.xs, self.ys)
+
+    def time_relative_entropy_local(self, length, base):
+        relative_entropy(self.xs, self.ys, local=True)
+
+    def peakmem_mutual_info(self, length, base):
+        mutual_info(self.xs, self.ys)
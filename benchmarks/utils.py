@@ -0,0 +1,83 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import numpy as np
+
+from benchmarks import SEED, random_series
+from pyinform import utils
+
+
+class Binning:
+    """
+    Binning of continuously-valued time series.
+    """
+    params = [10**2, 10**4, 10**6]
+    param_names = ["length"]
+
+    def setup(self, length):
+        self.series = np.random.RandomState(SEED).normal(size=length)
+
+    def time_series_range(self, length):
+        utils.series_range(self.series)
+
+    def time_bin_series_bins(self, length):
+        utils.bin_series(self.series, b=4)
+
+    def time_bin_series_step(self, length):
+        utils.bin_series(self.series, step=0.5)
+
+    def time_bin_series_bounds(self, length):
+        utils.bin_series(self.series, bounds=[-1.0, 0.0, 1.0])
+
+
+class BlackBoxing:
+    """
+    Coarse-graining groups of nodes with history.
+    """
+    params = ([10**2, 10**4, 10**6], [1, 3])
+    param_names = ["length", "k"]
+
+    def setup(self, length, k):
+        self.series = random_series(2, (8, length))
+        self.parts = [0, 0, 1, 1, 2, 2, 3, 3]
+
+    def time_black_box(self, length, k):
+        utils.black_box(self.series, parts=self.parts, k=k)
+
+
+class Coalescing:
+    """
+    Coalescing of time series into contiguous states.
+    """
+    params = ([10**2, 10**4, 10**6], [2, 100])
+    param_names = ["length", "base"]
+
+    def setup(self, length, base):
+        self.series = 3 * random_series(base, length) - base
+
+    def time_coalesce_series(self, length, base):
+        utils.coalesce_series(self.series)
+
+
+class Encoding:
+    """
+    Encoding and decoding of single states.
+    """
+    params = ([2, 4], [1, 8, 16])
+    param_names = ["base", "size"]
+
+    def setup(self, base, size):
+        # inform encodes states as 32-bit integers
+        if base**size >= 2**31:
+            raise NotImplementedError()
+        self.state = random_series(base, size)
+        self.encoding = utils.encode(self.state, b=base)
+
+    def time_encode(self, base, size):
+        utils.encode(self.state, b=base)
+
+    def time_encode_infer_base(self, base, size):
+        utils.encode(self.state)
+
+    def time_decode(self, base, size):
+        utils.decode(self.encoding, base, size)
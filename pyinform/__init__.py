@@ -1,17 +1,24 @@
 # Copyright 2016-2019 Douglas G. Moore. All rights reserved.
 # Use of this source code is governed by a MIT
 # license that can be found in the LICENSE file.
+import os
+import re
+
 from ctypes import CDLL
 
+LIBINFORM_ENV = "PYINFORM_LIBINFORM"
 
-def get_libpath():
+_libpath = None
+_libversion = None
+
+
+def _bundled_libpath():
     """
-    Get the library path of the the distributed inform binary.
+    Find the newest inform binary distributed alongside the package, returning
+    its path and version.
     """
-    import os
-    import re
     from os.path import dirname, abspath, realpath, join
-    from platform import system
+    from platform import machine, system
 
     libre = re.compile(r"^inform-(\d+)\.(\d+)\.(\d+)$")
 
@@ -32,31 +39,116 @@ def get_libpath():
     if libdir is None:
         raise ImportError("cannot find libinform")
 
+    arch = machine().lower()
+    if arch in ("amd64", "x86_64"):
+        arch = "x86_64"
+
     if system() == 'Linux':
-        platform = "linux-x86_64"
+        platform = "linux-{}".format(arch)
         library = "libinform.so.{}.{}.{}".format(major, minor, revision)
     elif system() == 'Darwin':
-        platform = "macosx-x86_64"
+        platform = "macosx-{}".format(arch)
         library = "libinform.{}.{}.{}.dylib".format(major, minor, revision)
     elif system() == 'Windows':
-        platform = "win-amd64"
+        platform = "win-amd64" if arch == "x86_64" else "win-{}".format(arch)
         library = "inform.dll"
     else:
         raise RuntimeError("unsupported platform - \"{}\"".format(system()))
 
-    return os.path.join(libdir, "lib", platform, library)
+    return join(libdir, "lib", platform, library), (major, minor, revision)
+
+
+def _parse_libversion(path):
+    """
+    Extract the version of an inform binary from its file name, returning
+    ``None`` if the name does not carry one.
+    """
+    match = re.search(r"inform\D*?(\d+(?:\.\d+)*)", os.path.basename(path))
+    if match is None:
+        return None
+    return tuple(int(x) for x in match.group(1).split("."))
+
+
+def _resolve_libpath():
+    """
+    Resolve the inform binary to load, trying (in order) the path named by the
+    ``PYINFORM_LIBINFORM`` environment variable, a system-wide installation
+    found by ``ctypes.util.find_library``, and finally the binary distributed
+    with PyInform.
+    """
+    from ctypes.util import find_library
+
+    path = os.environ.get(LIBINFORM_ENV)
+    if path:
+        if not os.path.isfile(path):
+            raise ImportError("{} does not name a file - \"{}\"".format(LIBINFORM_ENV, path))
+        return path, _parse_libversion(path)
+
+    path = find_library("inform")
+    if path is not None:
+        return path, _parse_libversion(path)
+
+    return _bundled_libpath()
+
+
+def get_libpath():
+    """
+    Get the path of the inform binary used by PyInform.
+
+    The binary is resolved once, and the result is cached for the life of the
+    interpreter. The following locations are tried in order:
+
+    1. the path in the ``PYINFORM_LIBINFORM`` environment variable, e.g. a
+       locally compiled ``-march=native`` build,
+    2. a system-wide installation located by ``ctypes.util.find_library``,
+    3. the binary distributed with PyInform.
+
+    :return: the path (or, for system installations, the name) of the library
+    :rtype: str
+    :raises ImportError: if no inform binary can be found
+    """
+    global _libpath, _libversion
+    if _libpath is None:
+        _libpath, _libversion = _resolve_libpath()
+    return _libpath
+
+
+def get_libversion():
+    """
+    Get the version of the inform binary used by PyInform, as a tuple of
+    integers, e.g. ``(1, 0, 1)``. If the version cannot be determined from the
+    library's file name, ``None`` is returned.
+
+    :return: the version of the library
+    :rtype: tuple or None
+    :raises ImportError: if no inform binary can be found
+    """
+    get_libpath()
+    return _libversion
 
 
 _inform = CDLL(get_libpath())
 
 from . import utils                                  # noqa: F401
+from . import batch                                  # noqa: F401
+from . import gaussian                               # noqa: F401
+from . import instrument                             # noqa: F401
+from . import integration                            # noqa: F401
+from . import ksg                                    # noqa: F401
 from . import shannon                                # noqa: F401
-from .transferentropy import transfer_entropy        # noqa: F401
+from .transferentropy import (transfer_entropy,      # noqa: F401
+                              transfer_entropy_pair)
+from .separableinfo import separable_info            # noqa: F401
 from .relativeentropy import relative_entropy        # noqa: F401
-from .mutualinfo import mutual_info                  # noqa: F401
+from .predictiveinfo import (predictive_info,        # noqa: F401
+                             excess_entropy)
+from .mutualinfo import (mutual_info, multi_info,    # noqa: F401
+                         mutual_info_matrix)
 from .error import InformError                       # noqa: F401
 from .entropyrate import entropy_rate                # noqa: F401
 from .dist import Dist                               # noqa: F401
 from .conditionalentropy import conditional_entropy  # noqa: F401
+from .conditionalmutualinfo import (                 # noqa: F401
+    conditional_mutual_info, conditional_mutual_info_batch)
 from .blockentropy import block_entropy              # noqa: F401
 from .activeinfo import active_info                  # noqa: F401
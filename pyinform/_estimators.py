@@ -0,0 +1,125 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Entropy estimators computed from a single histogram.
+
+The plug-in estimate of the entropy is biased downwards, severely so when the
+number of observations is not much larger than the number of states. Each of
+the estimators provided here corrects the plug-in estimate using nothing but
+the histogram's counts (and, for the NSB estimator, the size of the state
+space), so no additional passes over the data are required.
+"""
+import numpy as np
+
+from pyinform import _special
+
+ESTIMATORS = ("plugin", "miller-madow", "jackknife", "chao-shen", "nsb")
+
+_LN2 = np.log(2.0)
+
+
+def check(estimator):
+    """
+    Ensure that *estimator* names a known estimator.
+
+    :raises ValueError: if the estimator is unknown
+    """
+    if estimator not in ESTIMATORS:
+        raise ValueError("unknown estimator {!r}; expected one of {}".format(estimator, ", ".join(ESTIMATORS)))
+
+
+def entropy(counts, estimator="plugin", size=None):
+    """
+    Estimate the entropy (in bits) of the distribution from which a histogram
+    of *counts* was drawn.
+
+    The *size* of the state space is required by the ``"nsb"`` estimator, and
+    defaults to the number of bins of the histogram.
+    """
+    check(estimator)
+    c = np.asarray(counts, dtype=np.float64)
+    if size is None:
+        size = c.size
+    c = c[c > 0]
+    n = c.sum()
+    if n == 0:
+        return 0.0
+
+    s = np.sum(c * np.log2(c))
+    h = np.log2(n) - s / n
+    if estimator == "plugin":
+        return float(h)
+    elif estimator == "miller-madow":
+        return float(h + (c.size - 1) / (2.0 * n * _LN2))
+    elif estimator == "jackknife":
+        return float(_jackknife(c, n, s, h))
+    elif estimator == "chao-shen":
+        return float(_chao_shen(c, n))
+    return float(_nsb(c, n, float(size)))
+
+
+def _jackknife(c, n, s, h):
+    """
+    The jackknife estimate. The entropy with one observation left out is
+    updated from the sum :math:`s = \\sum_i c_i \\log_2 c_i` in constant time,
+    and is the same for every observation of a given state.
+    """
+    if n < 2:
+        return h
+    d = c - 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dlog = np.where(d > 0, d * np.log2(d), 0.0)
+    loo = np.log2(n - 1) - (s - c * np.log2(c) + dlog) / (n - 1)
+    return n * h - (n - 1) / n * np.sum(c * loo)
+
+
+def _chao_shen(c, n):
+    """
+    The coverage-adjusted Horvitz-Thompson estimate of Chao and Shen.
+    """
+    singletons = np.count_nonzero(c == 1)
+    if singletons == n:
+        singletons = n - 1
+    p = (1.0 - singletons / n) * c / n
+    return (0.0 - np.sum(p * np.log(p) / (1.0 - (1.0 - p)**n))) / _LN2
+
+
+def _nsb(c, n, size):
+    """
+    The estimate of Nemenman, Shafee and Bialek: the posterior mean entropy
+    under a mixture of symmetric Dirichlet priors chosen to be nearly uniform
+    in the expected entropy.
+
+    The mixture is integrated over the logarithm of the concentration
+    :math:`\\beta`, first coarsely over a wide range and then finely about the
+    peak of the integrand.
+    """
+    # The sums over the states depend only upon the distinct counts
+    c, multiplicity = np.unique(c, return_counts=True)
+    size = max(size, float(np.sum(multiplicity)))
+    unobserved = size - np.sum(multiplicity)
+
+    def integrand(t):
+        beta = np.exp(t)[:, np.newaxis]
+        kb = size * beta
+        log_likelihood = _special.gammaln(kb) - _special.gammaln(n + kb) \
+            + np.sum(multiplicity * (_special.gammaln(c + beta) - _special.gammaln(beta)), axis=1, keepdims=True)
+        prior = size * _special.trigamma(kb + 1.0) - _special.trigamma(beta + 1.0)
+        mean = _special.digamma(n + kb + 1.0) \
+            - np.sum(multiplicity * (c + beta) * _special.digamma(c + beta + 1.0), axis=1, keepdims=True) / (n + kb) \
+            - unobserved * beta * _special.digamma(beta + 1.0) / (n + kb)
+        with np.errstate(divide="ignore"):
+            log_weight = log_likelihood + np.log(prior) + np.log(beta)
+        return log_weight.ravel(), mean.ravel()
+
+    t = np.linspace(np.log(1e-8) - np.log(size), np.log(1e8), 400)
+    log_weight, _ = integrand(t)
+    peak = np.argmax(log_weight)
+    above = np.flatnonzero(log_weight > log_weight[peak] - 50.0)
+    lo, hi = t[max(above[0] - 1, 0)], t[min(above[-1] + 1, t.size - 1)]
+
+    t = np.linspace(lo, hi, 1000)
+    log_weight, mean = integrand(t)
+    weight = np.exp(log_weight - np.amax(log_weight))
+    return np.sum(weight * mean) / np.sum(weight) / _LN2
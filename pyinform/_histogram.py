@@ -0,0 +1,202 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Vectorized histogram and entropy primitives used by the measures which are
+not (yet) provided by the ``inform`` C library.
+
+States are represented as arrays of non-negative 64-bit integer codes together
+with the size of the space from which they are drawn. Joint states are built
+by mixed-radix encoding, and codes are relabeled into the observed states
+whenever the encoding would otherwise overflow, so the histograms never need
+to be larger than the number of distinct observations.
+"""
+import numpy as np
+
+# The largest state space that is encoded directly
+MAX_SIZE = 2**62
+
+# State spaces no larger than this are counted with a dense histogram
+DENSE_SIZE = 2**20
+
+# The number of codes processed at once when counting many histograms
+CHUNK_SIZE = 2**22
+
+
+def check_states(xs, b):
+    """
+    Ensure that every state of *xs* is in ``[0, b)``.
+
+    :raises ValueError: if a state is negative or not less than the base
+    """
+    if xs.size != 0 and (np.amin(xs) < 0 or np.amax(xs) >= b):
+        raise ValueError("time series has states outside of the base")
+
+
+def compress(codes):
+    """
+    Relabel *codes* into the contiguous range ``[0, n)`` where *n* is the
+    number of distinct codes, preserving their order.
+    """
+    states, labels = np.unique(codes, return_inverse=True)
+    return labels.reshape(codes.shape).astype(np.int64), states.size
+
+
+def join(xs, xsize, ys, ysize):
+    """
+    Encode the joint state of two (broadcastable) code arrays.
+    """
+    if xsize * ysize > MAX_SIZE:
+        xs, xsize = compress(xs)
+        ys, ysize = compress(ys)
+    return np.asarray(xs, dtype=np.int64) * ysize + ys, xsize * ysize
+
+
+def encode(rows, bases):
+    """
+    Encode the joint state of a sequence of rows with the given bases. The
+    first row is the most significant.
+    """
+    codes, size = np.zeros(np.shape(rows[0]), dtype=np.int64), 1
+    for row, b in zip(rows, bases):
+        codes, size = join(codes, size, row, int(b))
+    return codes, size
+
+
+def counts(codes, size):
+    """
+    Count the occurrences of each observed state. Empty bins may or may not be
+    included.
+    """
+    if size <= DENSE_SIZE:
+        return np.bincount(codes.ravel(), minlength=size)
+    return np.unique(codes, return_counts=True)[1]
+
+
+def entropy(counts):
+    """
+    Compute the plug-in Shannon entropy (in bits) of a histogram.
+    """
+    counts = counts[counts > 0]
+    n = counts.sum()
+    if n == 0:
+        return 0.0
+    p = counts / float(n)
+    return float(-np.sum(p * np.log2(p)))
+
+
+def entropies(counts):
+    """
+    Compute the plug-in Shannon entropy (in bits) of each histogram along the
+    last axis of *counts*.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    n = counts.sum(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = counts / n
+        h = np.where(p > 0, p * np.log2(p), 0.0)
+    return -h.sum(axis=-1)
+
+
+def row_entropies(codes, size):
+    """
+    Compute the plug-in Shannon entropy (in bits) of the states in each row of
+    a 2-D array of *codes*.
+    """
+    m, n = codes.shape
+    if n == 0:
+        return np.zeros(m, dtype=np.float64)
+    return np.log2(n) - row_xlog2x_sums(codes, size) / n
+
+
+def row_xlog2x_sums(codes, size):
+    """
+    Compute the :py:func:`xlog2x_sum` of the histogram of the states in each
+    row of a 2-D array of *codes*.
+
+    Rows are counted together into a single dense histogram, in blocks small
+    enough to bound the memory used. If the state space is too large for a
+    dense histogram, even once relabeled into the observed states, the
+    (row, state) pairs are counted by sorting instead.
+    """
+    m, n = codes.shape
+    if size > DENSE_SIZE:
+        codes, size = compress(codes)
+    if size > DENSE_SIZE:
+        rows = np.arange(m, dtype=np.int64)[:, np.newaxis]
+        keys, c = np.unique((codes + rows * size).ravel(), return_counts=True)
+        return np.bincount(keys // size, weights=_xlog2x(c.astype(np.float64)), minlength=m)
+
+    s = np.empty(m, dtype=np.float64)
+    step = max(1, min(DENSE_SIZE // size, CHUNK_SIZE // max(n, 1)))
+    for start in range(0, m, step):
+        block = codes[start:start + step]
+        rows = block.shape[0]
+        offsets = np.arange(rows, dtype=np.int64)[:, np.newaxis] * size
+        c = np.bincount((block + offsets).ravel(), minlength=rows * size)
+        s[start:start + rows] = _xlog2x(c.reshape(rows, size).astype(np.float64)).sum(axis=1)
+    return s
+
+
+def local_counts(codes, size):
+    """
+    Count the number of occurrences of the state of each code, returning an
+    array of the same shape as *codes*.
+    """
+    if size <= DENSE_SIZE:
+        return np.bincount(codes.ravel(), minlength=size)[codes]
+    _, labels, c = np.unique(codes, return_inverse=True, return_counts=True)
+    return c[labels.reshape(codes.shape)]
+
+
+def row_local_counts(codes, size):
+    """
+    Count the number of occurrences of the state of each code within its row
+    of a 2-D array of *codes*, returning an array of the same shape.
+    """
+    m = codes.shape[0]
+    if size > DENSE_SIZE or m * size > MAX_SIZE:
+        codes, size = compress(codes)
+    offsets = np.arange(m, dtype=np.int64)[:, np.newaxis] * size
+    return local_counts(codes + offsets, m * size)
+
+
+def xlog2x_sum(counts):
+    """
+    Compute :math:`\\sum_i c_i \\log_2 c_i` over the counts of a histogram. The
+    entropy of a histogram of *N* observations is :math:`\\log_2 N - S/N`
+    where :math:`S` is this sum; combinations of entropies over the same
+    observations are more accurately computed from these sums, as the
+    :math:`\\log_2 N` terms cancel exactly.
+    """
+    return float(np.sum(_xlog2x(np.asarray(counts, dtype=np.float64))))
+
+
+def suffix_xlog2x_sums(codes, starts):
+    """
+    Compute the :py:func:`xlog2x_sum` of the histogram of the states in
+    ``codes[:, start:]`` for each of the *starts* of a 2-D array of *codes*.
+
+    A single histogram is counted once and then updated by removing the
+    columns dropped between successive starts, so the cost of each additional
+    start is proportional to the number of columns it drops and the number of
+    distinct states.
+    """
+    if codes.size != 0 and np.amax(codes) >= min(codes.size, DENSE_SIZE):
+        codes, _ = compress(codes)
+    c = np.bincount(codes.ravel())
+
+    sums = np.empty(len(starts), dtype=np.float64)
+    prev = 0
+    for i in np.argsort(starts, kind="stable"):
+        start = starts[i]
+        if start > prev:
+            c -= np.bincount(codes[:, prev:start].ravel(), minlength=c.size)
+            prev = start
+        sums[i] = xlog2x_sum(c)
+    return sums
+
+
+def _xlog2x(c):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(c > 0, c * np.log2(c), 0.0)
@@ -0,0 +1,84 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Prototypes of the ``inform`` C functions called by the time series measures.
+
+Each function is looked up and its prototype set once, when the measure's
+module is imported, rather than on every call. Time series and results are
+passed to the functions as ``numpy.ndarray`` directly, via the argument types
+defined here, rather than being cast to a ctypes pointer by the caller; for
+short time series, such casts are a large part of the cost of a call.
+"""
+import numpy as np
+
+from ctypes import byref, c_double, c_int, POINTER
+from numpy.ctypeslib import ndpointer
+
+from pyinform import _inform
+
+
+def _array(dtype, ctype):
+    """
+    Create an argument type accepting C-contiguous arrays of the given
+    *dtype*, as with ``numpy.ctypeslib.ndpointer``.
+
+    Writable arrays are passed by reference to their first element, which is
+    several times cheaper than constructing the array's ``ctypes`` attribute;
+    anything else is left to ``ndpointer``, which validates it.
+    """
+    dtype = np.dtype(dtype)
+    base = ndpointer(dtype, flags="C_CONTIGUOUS")
+
+    class _ArrayType(base):
+        @classmethod
+        def from_param(cls, obj):
+            if type(obj) is np.ndarray and obj.dtype == dtype and obj.size != 0 \
+                    and obj.flags.c_contiguous and obj.flags.writeable:
+                return byref(ctype.from_buffer(obj))
+            return base.from_param(obj)
+
+    return _ArrayType
+
+
+# A time series of (32-bit) states
+SERIES = _array(np.int32, c_int)
+
+# An array of (64-bit) floating point results
+VALUES = _array(np.float64, c_double)
+
+# An error code, passed by reference
+ERROR = POINTER(c_int)
+
+
+class OPTIONAL_SERIES(SERIES):
+    """
+    A time series which may be ``None``, passed as a null pointer.
+    """
+    @classmethod
+    def from_param(cls, obj):
+        if obj is None:
+            return None
+        return SERIES.from_param(obj)
+
+
+_prototypes = {}
+
+
+def prototype(name, restype, argtypes):
+    """
+    Get the function *name* of the ``inform`` library with the given
+    prototype.
+
+    Each prototype is created once and shared by every module which asks for
+    it. Each distinct prototype of a function is a distinct function object,
+    so that no module can change the prototype of a function used by another.
+    """
+    key = (name, restype, tuple(argtypes))
+    f = _prototypes.get(key)
+    if f is None:
+        f = _inform[name]
+        f.argtypes = argtypes
+        f.restype = restype
+        _prototypes[key] = f
+    return f
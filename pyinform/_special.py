@@ -0,0 +1,61 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Vectorized special functions of positive real arguments, so that the entropy
+estimators do not depend upon scipy.
+
+Each function shifts its arguments up to at least ``SHIFT`` via the functions'
+recurrence relations and then evaluates the asymptotic expansion, which is
+accurate to near machine precision from there on.
+"""
+import numpy as np
+
+SHIFT = 10.0
+
+_HALF_LOG_2PI = 0.5 * np.log(2.0 * np.pi)
+
+
+def _shift(x, term):
+    """
+    Shift *x* up to at least ``SHIFT``, accumulating *term* of each value
+    shifted past.
+    """
+    x = np.array(x, dtype=np.float64)
+    acc = np.zeros_like(x)
+    small = x < SHIFT
+    while np.any(small):
+        acc[small] += term(x[small])
+        x[small] += 1.0
+        small = x < SHIFT
+    return x, acc
+
+
+def digamma(x):
+    """
+    The digamma function :math:`\\psi(x) = \\frac{d}{dx} \\ln \\Gamma(x)`.
+    """
+    x, acc = _shift(x, lambda y: 1.0 / y)
+    r = 1.0 / (x * x)
+    series = r * (1.0 / 12 - r * (1.0 / 120 - r * (1.0 / 252 - r * (1.0 / 240 - r * (1.0 / 132 - r * (691.0 / 32760))))))
+    return np.log(x) - 0.5 / x - series - acc
+
+
+def trigamma(x):
+    """
+    The trigamma function :math:`\\psi_1(x) = \\frac{d^2}{dx^2} \\ln \\Gamma(x)`.
+    """
+    x, acc = _shift(x, lambda y: 1.0 / (y * y))
+    r = 1.0 / (x * x)
+    series = r * (1.0 / 6 - r * (1.0 / 30 - r * (1.0 / 42 - r * (1.0 / 30 - r * (5.0 / 66)))))
+    return 1.0 / x + 0.5 * r + series / x + acc
+
+
+def gammaln(x):
+    """
+    The natural logarithm of the gamma function, :math:`\\ln \\Gamma(x)`.
+    """
+    x, acc = _shift(x, np.log)
+    r = 1.0 / (x * x)
+    series = (1.0 / 12 - r * (1.0 / 360 - r * (1.0 / 1260 - r * (1.0 / 1680 - r * (1.0 / 1188))))) / x
+    return (x - 0.5) * np.log(x) - x + _HALF_LOG_2PI + series - acc
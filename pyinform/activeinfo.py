@@ -84,64 +84,178 @@ Or if you are feeling verbose:
     array([0.30595849, 0.86312057])
     >>> ai.mean()
     0.5845395307173363
+
+Both are one call to the ``inform`` C library per initial condition. The
+active information of every initial condition can instead be computed at once
+with ``per_trial=True``, in a single pass which counts the histograms of the
+initial conditions together:
+
+.. doctest:: active_info
+
+    >>> active_info(series, k=2, per_trial=True)
+    array([0.30595849, 0.86312057])
+
+Ensemble Estimation
+^^^^^^^^^^^^^^^^^^^
+
+If the process is not stationary, the probabilities can instead be estimated
+at each time step across the initial conditions with ``ensemble=True``. The
+active information is then a function of time, with one value for each time
+step after the first :math:`k`:
+
+.. doctest:: active_info
+
+    >>> series = [[0,0,1,1,1,1,0,0,0], [1,0,0,1,0,0,1,0,0],
+    ...           [0,1,1,0,1,1,0,1,1], [1,1,0,0,1,0,0,1,0]]
+    >>> active_info(series, k=2, ensemble=True)
+    array([1.        , 1.        , 0.81127812, 0.5       , 0.81127812,
+           0.5       , 0.31127812])
+
+The same is true of :py:func:`~.blockentropy.block_entropy`,
+:py:func:`~.entropyrate.entropy_rate` and
+:py:func:`~.transferentropy.transfer_entropy`.
 """
 
 import numpy as np
 
-from ctypes import byref, c_int, c_ulong, c_double, POINTER
-from pyinform import _inform
+from ctypes import byref, c_int, c_ulong, c_double
+from pyinform import _histogram
+from pyinform._prototype import prototype, ERROR, SERIES, VALUES
 from pyinform.error import ErrorCode, error_guard
+from pyinform.instrument import probe
 
 
-def active_info(series, k, local=False):
+def active_info(series, k, local=False, b=None, per_trial=False, ensemble=False):
     """
     Compute the average or local active information of a timeseries with history
     length *k*.
 
+    If *per_trial* is ``True``, the active information of each initial
+    condition is computed separately, i.e. as if each row of the time series
+    were passed to :py:func:`active_info` alone.
+
+    If *ensemble* is ``True``, the probabilities are estimated at each time
+    step across the initial conditions rather than pooled over time, and the
+    active information is returned as a function of time: one value for each
+    time step after the first *k*, or the local values of each initial
+    condition at each such time step.
+
     :param series: the time series
     :type series: sequence or ``numpy.ndarray``
     :param int k: the history length
     :param bool local: compute the local active information
+    :param int b: the base of the time series, inferred from the data if ``None``
+    :param bool per_trial: compute the active information of each initial condition
+    :param bool ensemble: estimate the probabilities at each time step across the initial conditions
     :returns: the average or local active information
     :rtype: float or ``numpy.ndarray``
     :raises ValueError: if the time series has no initial conditions
     :raises ValueError: if the time series is greater than 2-D
+    :raises ValueError: if both *local* and *per_trial* are requested
+    :raises ValueError: if both *per_trial* and *ensemble* are requested
     :raises InformError: if an error occurs within the ``inform`` C call
     """
+    p = probe("active_info")
+
     xs = np.ascontiguousarray(series, np.int32)
+    p.converted(series, xs)
 
     if xs.ndim == 0:
         raise ValueError("empty timeseries")
     elif xs.ndim > 2:
         raise ValueError("dimension greater than 2")
+    elif xs.size == 0:
+        raise ValueError("empty timeseries")
+    elif local is True and per_trial is True:
+        raise ValueError("local and per-trial values cannot both be computed")
+    elif per_trial is True and ensemble is True:
+        raise ValueError("per-trial and ensemble values cannot both be computed")
+    p.phase("convert")
 
-    b = max(2, np.amax(xs) + 1)
+    if b is None:
+        b = max(2, np.amax(xs) + 1)
+    p.phase("base")
 
-    data = xs.ctypes.data_as(POINTER(c_int))
     if xs.ndim == 1:
         n, m = 1, xs.shape[0]
     else:
         n, m = xs.shape
 
+    if per_trial is True:
+        ai = _per_trial_active_info(xs.reshape(n, m), b, k)
+        p.allocated(ai)
+        p.phase("kernel")
+        p.finish((xs.size,), (b,), k)
+        return ai
+
+    if ensemble is True:
+        ai = _ensemble_active_info(xs.reshape(n, m), b, k, local)
+        p.allocated(ai)
+        p.phase("kernel")
+        p.finish((xs.size,), (b,), k)
+        return ai
+
     e = ErrorCode(0)
 
     if local is True:
         q = max(0, m - k)
         ai = np.empty((n, q), dtype=np.float64)
-        out = ai.ctypes.data_as(POINTER(c_double))
-        _local_active_info(data, c_ulong(n), c_ulong(m), c_int(b), c_ulong(k), out, byref(e))
+        p.allocated(ai)
+        p.phase("alloc")
+        _local_active_info(xs, n, m, c_int(b), k, ai, byref(e))
     else:
-        ai = _active_info(data, c_ulong(n), c_ulong(m), c_int(b), c_ulong(k), byref(e))
+        ai = _active_info(xs, n, m, c_int(b), k, byref(e))
 
     error_guard(e)
+    p.phase("kernel")
+    p.finish((xs.size,), (b,), k)
 
     return ai
 
 
-_active_info = _inform.inform_active_info
-_active_info.argtypes = [POINTER(c_int), c_ulong, c_ulong, c_int, c_ulong, POINTER(c_int)]
-_active_info.restype = c_double
+def _per_trial_active_info(xs, b, k):
+    """
+    Compute the active information of each row of *xs*, counting the
+    histograms of every row in a single pass.
+    """
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the history length must be positive and less than the length of the time series")
+    _histogram.check_states(xs, b)
+
+    q = m - k
+    history, hsize = _histogram.encode([xs[:, i:i + q] for i in range(k)], [b] * k)
+    future, fsize = _histogram.join(history, hsize, xs[:, k:], b)
+    s = _histogram.row_xlog2x_sums(history, hsize) + _histogram.row_xlog2x_sums(xs[:, k:], b) \
+        - _histogram.row_xlog2x_sums(future, fsize)
+    return np.log2(q) - s / q
+
+
+def _ensemble_active_info(xs, b, k, local):
+    """
+    Compute the average or local active information at each time step of
+    *xs*, counting the histograms of every time step across the rows in a
+    single pass.
+    """
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the history length must be positive and less than the length of the time series")
+    _histogram.check_states(xs, b)
+
+    # One row per time step, one column per initial condition
+    q = m - k
+    history, hsize = _histogram.encode([xs[:, i:i + q].T for i in range(k)], [b] * k)
+    nexts = xs[:, k:].T
+    future, fsize = _histogram.join(history, hsize, nexts, b)
+    if local is True:
+        num = _histogram.row_local_counts(future, fsize) * float(n)
+        den = _histogram.row_local_counts(history, hsize) * _histogram.row_local_counts(nexts, b)
+        return np.log2(num / den).T
+    s = _histogram.row_xlog2x_sums(history, hsize) + _histogram.row_xlog2x_sums(nexts, b) \
+        - _histogram.row_xlog2x_sums(future, fsize)
+    return np.log2(n) - s / n
+
+
+_active_info = prototype("inform_active_info", c_double, [SERIES, c_ulong, c_ulong, c_int, c_ulong, ERROR])
 
-_local_active_info = _inform.inform_local_active_info
-_local_active_info.argtypes = [POINTER(c_int), c_ulong, c_ulong, c_int, c_ulong, POINTER(c_double), POINTER(c_int)]
-_local_active_info.restype = POINTER(c_double)
+_local_active_info = prototype("inform_local_active_info", None, [SERIES, c_ulong, c_ulong, c_int, c_ulong, VALUES, ERROR])
@@ -0,0 +1,329 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Awaitable versions of the time series measures, for use within an
+``asyncio`` event loop (Python 3.5 and later). This module
+(:py:mod:`pyinform.aio`) is not imported by ``import pyinform``, and must be
+imported explicitly.
+
+Each measure runs in a bounded pool of threads shared by the whole process, so
+that a long computation never blocks the event loop; ``ctypes`` releases the
+global interpreter lock while the ``inform`` C library runs, so the loop stays
+responsive. The number of computations running at once within each event loop
+is limited as well, so that a burst of requests queues rather than starving
+the loop of the pool's threads. Both limits are set via :py:func:`configure`.
+
+.. doctest:: aio
+
+    >>> import asyncio
+    >>> xs, ys = [0,1,1,1,1,0,0,0,0], [0,0,1,1,1,1,0,0,0]
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(aio.transfer_entropy(xs, ys, k=2))
+    0.6792696431662097
+    >>> loop.close()
+
+Cancellation
+------------
+
+A call into the ``inform`` C library cannot be interrupted. Cancelling a
+measure which is waiting for a thread prevents it from ever running, but one
+which has started runs to completion in the background and its result is
+discarded. To bound the work wasted on cancellation, the measures which
+compute many independent values are split into chunks, each computed by a
+separate call, and are cancelled between chunks:
+
+* a sequence of delays given to :py:func:`transfer_entropy` or
+  :py:func:`mutual_info` is computed a few delays at a time,
+* ``per_trial=True`` given to :py:func:`active_info`,
+  :py:func:`entropy_rate`, :py:func:`block_entropy` or
+  :py:func:`transfer_entropy` is computed a block of initial conditions at a
+  time, and
+* :py:func:`map` computes one input at a time.
+
+The chunks of a single call run one after another, so each call occupies at
+most one thread of the pool. A cancelled computation which has started keeps
+its place within the limit on the concurrency until it completes.
+
+Any other measure, such as those of :py:mod:`pyinform.ksg`,
+:py:mod:`pyinform.gaussian` or :py:mod:`pyinform.integration`, may be awaited
+via :py:func:`run`.
+"""
+import asyncio
+import weakref
+
+from functools import partial
+from multiprocessing import cpu_count
+
+import numpy as np
+
+from pyinform import activeinfo, blockentropy, conditionalentropy, conditionalmutualinfo, \
+    entropyrate, mutualinfo, predictiveinfo, relativeentropy, separableinfo, transferentropy
+
+# The number of delays of a lag profile computed by each chunk
+DELAY_CHUNK = 16
+
+# The number of initial conditions computed by each chunk of per-trial values
+TRIAL_CHUNK = 1024
+
+_threads = None
+_concurrency = None
+_executor = None
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def configure(threads=None, concurrency=None):
+    """
+    Set the number of threads in the pool which runs the measures, and the
+    largest number of measures which may run at once within each event loop.
+
+    The pool is replaced, without waiting for the computations already running
+    in the old pool. The limit on the concurrency takes effect in each event
+    loop the next time a measure is awaited.
+
+    :param int threads: the number of threads; the number of CPUs if ``None``
+    :param int concurrency: the number of concurrent measures per event loop; the number of threads if ``None``
+    :raises ValueError: if either number is not positive
+    """
+    global _threads, _concurrency, _executor
+    if (threads is not None and threads < 1) or (concurrency is not None and concurrency < 1):
+        raise ValueError("the number of threads and the concurrency must be positive")
+    _threads, _concurrency = threads, concurrency
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+    _semaphores.clear()
+
+
+def _pool():
+    """
+    Get the pool of threads, creating it if need be.
+    """
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _executor = ThreadPoolExecutor(_threads or cpu_count())
+    return _executor
+
+
+def _semaphore(loop):
+    """
+    Get the semaphore limiting the concurrency within an event loop.
+    """
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_concurrency or _threads or cpu_count())
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def run(measure, *args, **kwargs):
+    """
+    Await any measure, or other blocking function, in the pool of threads.
+
+    :param measure: the measure, called as ``measure(*args, **kwargs)``
+    :return: the result of the measure
+    """
+    loop = asyncio.get_event_loop()
+    semaphore = _semaphore(loop)
+    await semaphore.acquire()
+    try:
+        future = _pool().submit(partial(measure, *args, **kwargs))
+    except BaseException:
+        semaphore.release()
+        raise
+    # Hold the slot until the thread is done, even if the caller is cancelled
+    future.add_done_callback(partial(_release, loop, semaphore))
+    return await asyncio.wrap_future(future, loop=loop)
+
+
+def _release(loop, semaphore, future):
+    """
+    Release a slot of the semaphore from the thread which completed a future.
+    """
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(semaphore.release)
+
+
+async def map(measure, inputs, **kwargs):
+    """
+    Await a measure of each of many inputs, as in :py:func:`pyinform.batch.map`,
+    one input at a time.
+
+    :param measure: the measure, called as ``measure(*input, **kwargs)``
+    :param inputs: the inputs, each a time series or a tuple of time series
+    :type inputs: iterable
+    :return: the result of the measure for each input
+    :rtype: list
+    """
+    results = []
+    for xs in inputs:
+        args = xs if isinstance(xs, tuple) else (xs,)
+        results.append(await run(measure, *args, **kwargs))
+    return results
+
+
+async def _per_trial(measure, series, *args, **kwargs):
+    """
+    Await the per-trial values of a measure of a single time series, a block
+    of initial conditions at a time.
+    """
+    xs = np.ascontiguousarray(series, dtype=np.int32)
+    if xs.ndim != 2 or xs.shape[0] <= TRIAL_CHUNK:
+        return await run(measure, xs, *args, **kwargs)
+    if kwargs.get("b") is None:
+        kwargs["b"] = max(2, int(np.amax(xs)) + 1)
+    chunks = []
+    for start in range(0, xs.shape[0], TRIAL_CHUNK):
+        chunks.append(await run(measure, xs[start:start + TRIAL_CHUNK], *args, **kwargs))
+    return np.concatenate(chunks)
+
+
+async def active_info(series, k, **kwargs):
+    """
+    Await :py:func:`~pyinform.activeinfo.active_info`.
+    """
+    if kwargs.get("per_trial") is True:
+        return await _per_trial(activeinfo.active_info, series, k, **kwargs)
+    return await run(activeinfo.active_info, series, k, **kwargs)
+
+
+async def block_entropy(series, k, **kwargs):
+    """
+    Await :py:func:`~pyinform.blockentropy.block_entropy`.
+    """
+    if kwargs.get("per_trial") is True:
+        return await _per_trial(blockentropy.block_entropy, series, k, **kwargs)
+    return await run(blockentropy.block_entropy, series, k, **kwargs)
+
+
+async def entropy_rate(series, k, **kwargs):
+    """
+    Await :py:func:`~pyinform.entropyrate.entropy_rate`.
+    """
+    if kwargs.get("per_trial") is True:
+        return await _per_trial(entropyrate.entropy_rate, series, k, **kwargs)
+    return await run(entropyrate.entropy_rate, series, k, **kwargs)
+
+
+async def conditional_entropy(xs, ys, **kwargs):
+    """
+    Await :py:func:`~pyinform.conditionalentropy.conditional_entropy`.
+    """
+    return await run(conditionalentropy.conditional_entropy, xs, ys, **kwargs)
+
+
+async def conditional_mutual_info(xs, ys, zs, **kwargs):
+    """
+    Await :py:func:`~pyinform.conditionalmutualinfo.conditional_mutual_info`.
+    """
+    return await run(conditionalmutualinfo.conditional_mutual_info, xs, ys, zs, **kwargs)
+
+
+async def conditional_mutual_info_batch(xs, ys, zs, **kwargs):
+    """
+    Await :py:func:`~pyinform.conditionalmutualinfo.conditional_mutual_info_batch`.
+    """
+    return await run(conditionalmutualinfo.conditional_mutual_info_batch, xs, ys, zs, **kwargs)
+
+
+async def relative_entropy(xs, ys, **kwargs):
+    """
+    Await :py:func:`~pyinform.relativeentropy.relative_entropy`.
+    """
+    return await run(relativeentropy.relative_entropy, xs, ys, **kwargs)
+
+
+async def mutual_info(xs, ys, **kwargs):
+    """
+    Await :py:func:`~pyinform.mutualinfo.mutual_info`. A lag profile is
+    computed a few delays at a time.
+    """
+    delay = kwargs.pop("delay", None)
+    if delay is None or np.ndim(delay) == 0:
+        return await run(mutualinfo.mutual_info, xs, ys, delay=delay, **kwargs)
+    profile = []
+    for chunk in _delay_chunks(delay):
+        profile.append(await run(mutualinfo.mutual_info, xs, ys, delay=chunk, **kwargs))
+    return np.concatenate(profile)
+
+
+async def multi_info(series, **kwargs):
+    """
+    Await :py:func:`~pyinform.mutualinfo.multi_info`.
+    """
+    return await run(mutualinfo.multi_info, series, **kwargs)
+
+
+async def mutual_info_matrix(data, **kwargs):
+    """
+    Await :py:func:`~pyinform.mutualinfo.mutual_info_matrix`.
+    """
+    return await run(mutualinfo.mutual_info_matrix, data, **kwargs)
+
+
+async def predictive_info(series, k_past, k_future, **kwargs):
+    """
+    Await :py:func:`~pyinform.predictiveinfo.predictive_info`.
+    """
+    return await run(predictiveinfo.predictive_info, series, k_past, k_future, **kwargs)
+
+
+async def excess_entropy(series, k, **kwargs):
+    """
+    Await :py:func:`~pyinform.predictiveinfo.excess_entropy`.
+    """
+    return await run(predictiveinfo.excess_entropy, series, k, **kwargs)
+
+
+async def separable_info(sources, target, k, **kwargs):
+    """
+    Await :py:func:`~pyinform.separableinfo.separable_info`.
+    """
+    return await run(separableinfo.separable_info, sources, target, k, **kwargs)
+
+
+async def transfer_entropy(source, target, k, **kwargs):
+    """
+    Await :py:func:`~pyinform.transferentropy.transfer_entropy`. A lag profile
+    is computed a few delays at a time, and per-trial values a block of
+    initial conditions at a time.
+    """
+    delay = kwargs.pop("delay", None)
+    if delay is not None and np.ndim(delay) != 0:
+        profile = []
+        for chunk in _delay_chunks(delay):
+            profile.append(await run(transferentropy.transfer_entropy, source, target, k, delay=chunk, **kwargs))
+        return np.concatenate(profile)
+
+    ys = np.ascontiguousarray(source, dtype=np.int32)
+    xs = np.ascontiguousarray(target, dtype=np.int32)
+    if kwargs.get("per_trial") is not True or xs.ndim != 2 or xs.shape != ys.shape or xs.shape[0] <= TRIAL_CHUNK:
+        return await run(transferentropy.transfer_entropy, ys, xs, k, delay=delay, **kwargs)
+
+    cs = kwargs.pop("condition", None)
+    cs = np.ascontiguousarray(cs, dtype=np.int32) if cs is not None else None
+    if kwargs.get("b") is None:
+        kwargs["b"] = max(2, int(max(np.amax(xs), np.amax(ys), np.amax(cs) if cs is not None else 0)) + 1)
+    chunks = []
+    for start in range(0, xs.shape[0], TRIAL_CHUNK):
+        rows = slice(start, start + TRIAL_CHUNK)
+        condition = None if cs is None else (cs[:, rows] if cs.ndim == 3 else cs[rows])
+        chunks.append(await run(transferentropy.transfer_entropy, ys[rows], xs[rows], k,
+                                condition=condition, delay=delay, **kwargs))
+    return np.concatenate(chunks)
+
+
+async def transfer_entropy_pair(x, y, k, **kwargs):
+    """
+    Await :py:func:`~pyinform.transferentropy.transfer_entropy_pair`.
+    """
+    return await run(transferentropy.transfer_entropy_pair, x, y, k, **kwargs)
+
+
+def _delay_chunks(delays):
+    """
+    Split a sequence of delays into chunks of at most ``DELAY_CHUNK`` delays.
+    """
+    delays = np.asarray(delays, dtype=np.int64)
+    return [delays[i:i + DELAY_CHUNK] for i in range(0, delays.size, DELAY_CHUNK)] or [delays]
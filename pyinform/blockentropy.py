@@ -66,59 +66,167 @@ Or you can compute the block entropy on each initial condition and average:
 """
 import numpy as np
 
-from ctypes import byref, c_int, c_ulong, c_double, POINTER
-from pyinform import _inform
+from ctypes import byref, c_int, c_ulong, c_double
+from pyinform import _estimators, _histogram
+from pyinform._prototype import prototype, ERROR, SERIES, VALUES
 from pyinform.error import ErrorCode, error_guard
+from pyinform.instrument import probe
 
 
-def block_entropy(series, k, local=False):
+def block_entropy(series, k, local=False, b=None, estimator="plugin", per_trial=False,
+                  ensemble=False):
     """
     Compute the (local) block entropy of a time series with block size *k*.
 
+    A bias-corrected *estimator* may be chosen in place of the plug-in
+    estimate, as described in :py:func:`~.shannon.entropy`, and is computed
+    from the same histogram of the blocks. The ``"nsb"`` estimator takes every
+    one of the :math:`b^k` blocks to be possible.
+
+    If *per_trial* is ``True``, the block entropy of each initial condition is
+    computed separately, as if each row of the time series were passed alone,
+    in a single pass which counts the histograms of every row together.
+
+    If *ensemble* is ``True``, the probabilities are estimated at each time
+    step across the initial conditions rather than pooled over time, and the
+    block entropy is returned as a function of time: one value for each
+    block of *k* time steps, or the local values of each initial condition at each.
+
     :param series: the time series
     :type series: sequence or `numpy.ndarray`
     :param int k: the block size
     :param bool local: compute the local block entropy
+    :param int b: the base of the time series, inferred from the data if ``None``
+    :param str estimator: the entropy estimator, one of ``"plugin"``, ``"miller-madow"``, ``"jackknife"``, ``"chao-shen"`` or ``"nsb"``
+    :param bool per_trial: compute the block entropy of each initial condition
+    :param bool ensemble: estimate the probabilities at each time step across the initial conditions
     :returns: the average or local block entropy
     :rtype: float or `numpy.ndarray`
     :raises ValueError: if the time series has no initial conditions
     :raises ValueError: if the time series is greater than 2-D
+    :raises ValueError: if the estimator is unknown
+    :raises ValueError: if *local* is requested of an estimator other than ``"plugin"``
+    :raises ValueError: if *per_trial* is requested along with *local* or an estimator other than ``"plugin"``
+    :raises ValueError: if *ensemble* is requested along with *per_trial* or an estimator other than ``"plugin"``
     :raises InformError: if an error occurs within the ``inform`` C call
     """
+    p = probe("block_entropy")
+
     xs = np.ascontiguousarray(series, np.int32)
+    p.converted(series, xs)
 
     if xs.ndim == 0:
         raise ValueError("empty timeseries")
     elif xs.ndim > 2:
         raise ValueError("dimension greater than 2")
+    elif xs.size == 0:
+        raise ValueError("empty timeseries")
+
+    _estimators.check(estimator)
+    if estimator != "plugin" and local is True:
+        raise ValueError("local values are only defined for the plug-in estimator")
+    elif per_trial is True and (local is True or estimator != "plugin"):
+        raise ValueError("per-trial values are only computed for the average plug-in estimate")
+    elif ensemble is True and (per_trial is True or estimator != "plugin"):
+        raise ValueError("ensemble values are only computed for the plug-in estimate, and not per trial")
+    p.phase("convert")
 
-    b = max(2, np.amax(xs) + 1)
+    if b is None:
+        b = max(2, np.amax(xs) + 1)
+    p.phase("base")
 
-    data = xs.ctypes.data_as(POINTER(c_int))
     if xs.ndim == 1:
         n, m = 1, xs.shape[0]
     else:
         n, m = xs.shape
 
+    if per_trial is True:
+        h = _per_trial_block_entropy(xs.reshape(n, m), b, k)
+        p.allocated(h)
+        p.phase("kernel")
+        p.finish((xs.size,), (b,), k)
+        return h
+
+    if ensemble is True:
+        h = _ensemble_block_entropy(xs.reshape(n, m), b, k, local)
+        p.allocated(h)
+        p.phase("kernel")
+        p.finish((xs.size,), (b,), k)
+        return h
+
+    if estimator != "plugin":
+        h = _estimated_block_entropy(xs.reshape(n, m), b, k, estimator)
+        p.phase("kernel")
+        p.finish((xs.size,), (b,), k)
+        return h
+
     e = ErrorCode(0)
 
     if local is True:
         q = max(0, m - k + 1)
         ai = np.empty((n, q), dtype=np.float64)
-        out = ai.ctypes.data_as(POINTER(c_double))
-        _local_block_entropy(data, c_ulong(n), c_ulong(m), c_int(b), c_ulong(k), out, byref(e))
+        p.allocated(ai)
+        p.phase("alloc")
+        _local_block_entropy(xs, n, m, c_int(b), k, ai, byref(e))
     else:
-        ai = _block_entropy(data, c_ulong(n), c_ulong(m), c_int(b), c_ulong(k), byref(e))
+        ai = _block_entropy(xs, n, m, c_int(b), k, byref(e))
 
     error_guard(e)
+    p.phase("kernel")
+    p.finish((xs.size,), (b,), k)
 
     return ai
 
 
-_block_entropy = _inform.inform_block_entropy
-_block_entropy.argtypes = [POINTER(c_int), c_ulong, c_ulong, c_int, c_ulong, POINTER(c_int)]
-_block_entropy.restype = c_double
+def _estimated_block_entropy(xs, b, k, estimator):
+    """
+    Estimate the block entropy of the rows of *xs* from a single histogram of
+    the blocks.
+    """
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the block size must be positive and less than the length of the time series")
+    _histogram.check_states(xs, b)
+
+    q = m - k + 1
+    codes, size = _histogram.encode([xs[:, i:i + q] for i in range(k)], [b] * k)
+    return _estimators.entropy(_histogram.counts(codes, size), estimator, size=float(b)**k)
+
+
+def _per_trial_block_entropy(xs, b, k):
+    """
+    Compute the block entropy of each row of *xs*, counting the histograms of
+    every row in a single pass.
+    """
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the block size must be positive and less than the length of the time series")
+    _histogram.check_states(xs, b)
+
+    q = m - k + 1
+    codes, size = _histogram.encode([xs[:, i:i + q] for i in range(k)], [b] * k)
+    return np.log2(q) - _histogram.row_xlog2x_sums(codes, size) / q
+
+
+def _ensemble_block_entropy(xs, b, k, local):
+    """
+    Compute the average or local block entropy at each time step of *xs*,
+    counting the histograms of every time step across the rows in a single
+    pass.
+    """
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the block size must be positive and less than the length of the time series")
+    _histogram.check_states(xs, b)
+
+    # One row per time step, one column per initial condition
+    q = m - k + 1
+    codes, size = _histogram.encode([xs[:, i:i + q].T for i in range(k)], [b] * k)
+    if local is True:
+        return np.log2(float(n) / _histogram.row_local_counts(codes, size)).T
+    return np.log2(n) - _histogram.row_xlog2x_sums(codes, size) / n
+
+
+_block_entropy = prototype("inform_block_entropy", c_double, [SERIES, c_ulong, c_ulong, c_int, c_ulong, ERROR])
 
-_local_block_entropy = _inform.inform_local_block_entropy
-_local_block_entropy.argtypes = [POINTER(c_int), c_ulong, c_ulong, c_int, c_ulong, POINTER(c_double), POINTER(c_int)]
-_local_block_entropy.restype = POINTER(c_double)
+_local_block_entropy = prototype("inform_local_block_entropy", None, [SERIES, c_ulong, c_ulong, c_int, c_ulong, VALUES, ERROR])
@@ -47,12 +47,13 @@ Examples
 """
 import numpy as np
 
-from ctypes import byref, c_int, c_ulong, c_double, POINTER
-from pyinform import _inform
+from ctypes import byref, c_int, c_ulong, c_double
+from pyinform._prototype import prototype, ERROR, SERIES, VALUES
 from pyinform.error import ErrorCode, error_guard
+from pyinform.instrument import probe
 
 
-def conditional_entropy(xs, ys, local=False):
+def conditional_entropy(xs, ys, local=False, b=None):
     """
     Compute the (local) conditional entropy between two time series.
 
@@ -63,41 +64,55 @@ def conditional_entropy(xs, ys, local=False):
     :param ys: the time series drawn from the target distribution
     :type ys: a sequence or ``numpy.ndarray``
     :param bool local: compute the local conditional entropy
+    :param b: the base of the time series, either one for both or a pair ``(bx, by)``; inferred from the data if ``None``
+    :type b: int or pair of ints
     :return: the local or average conditional entropy
     :rtype: float or ``numpy.ndarray``
     :raises ValueError: if the time series have different shapes
     :raises InformError: if an error occurs within the ``inform`` C call
     """
+    p = probe("conditional_entropy")
+
     us = np.ascontiguousarray(xs, dtype=np.int32)
     vs = np.ascontiguousarray(ys, dtype=np.int32)
+    p.converted(xs, us)
+    p.converted(ys, vs)
     if us.shape != vs.shape:
         raise ValueError("timeseries lengths do not match")
+    elif us.size == 0:
+        raise ValueError("empty timeseries")
+    p.phase("convert")
+
+    if b is None:
+        bx = max(2, np.amax(us) + 1)
+        by = max(2, np.amax(vs) + 1)
+    elif np.ndim(b) == 0:
+        bx, by = b, b
+    else:
+        bx, by = b
+    p.phase("base")
 
-    bx = max(2, np.amax(us) + 1)
-    by = max(2, np.amax(vs) + 1)
-
-    xdata = us.ctypes.data_as(POINTER(c_int))
-    ydata = vs.ctypes.data_as(POINTER(c_int))
     n = us.size
 
     e = ErrorCode(0)
 
     if local is True:
         ce = np.empty(us.shape, dtype=np.float64)
-        out = ce.ctypes.data_as(POINTER(c_double))
-        _local_conditional_entropy(xdata, ydata, c_ulong(n), c_int(bx), c_int(by), out, byref(e))
+        p.allocated(ce)
+        p.phase("alloc")
+        _local_conditional_entropy(us, vs, n, c_int(bx), c_int(by), ce, byref(e))
     else:
-        ce = _conditional_entropy(xdata, ydata, c_ulong(n), c_int(bx), c_int(by), byref(e))
+        ce = _conditional_entropy(us, vs, n, c_int(bx), c_int(by), byref(e))
 
     error_guard(e)
+    p.phase("kernel")
+    p.finish((us.size, vs.size), (bx, by))
 
     return ce
 
 
-_conditional_entropy = _inform.inform_conditional_entropy
-_conditional_entropy.argtypes = [POINTER(c_int), POINTER(c_int), c_ulong, c_int, c_int, POINTER(c_int)]
-_conditional_entropy.restype = c_double
+_conditional_entropy = prototype("inform_conditional_entropy", c_double,
+                                 [SERIES, SERIES, c_ulong, c_int, c_int, ERROR])
 
-_local_conditional_entropy = _inform.inform_local_conditional_entropy
-_local_conditional_entropy.argtypes = [POINTER(c_int), POINTER(c_int), c_ulong, c_int, c_int, POINTER(c_double), POINTER(c_int)]
-_local_conditional_entropy.restype = c_double
+_local_conditional_entropy = prototype("inform_local_conditional_entropy", None,
+                                       [SERIES, SERIES, c_ulong, c_int, c_int, VALUES, ERROR])
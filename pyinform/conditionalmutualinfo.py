@@ -0,0 +1,207 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+`Conditional mutual information`_ (CMI) is the mutual information between two
+random variables :math:`X` and :math:`Y` given knowledge of a third,
+:math:`Z`. When applied to time series, the three time series are used to
+construct the empirical distributions and then
+:py:func:`~.shannon.conditional_mutual_info` can be applied. Locally CMI is
+defined as
+
+.. math::
+
+    i_{i}(X;Y|Z) = \\log_2 \\frac{p(x_i, y_i, z_i)p(z_i)}{p(x_i, z_i)p(y_i, z_i)}.
+
+The conditional mutual information is then just the time average of
+:math:`i_{i}(X;Y|Z)`
+
+.. math::
+
+    I(X;Y|Z) = H(X,Z) + H(Y,Z) - H(Z) - H(X,Y,Z).
+
+The condition may consist of any number of time series,
+:math:`Z = \\{Z_1, \\ldots, Z_l\\}`, in which case their joint state is used.
+
+See [Cover1991]_ for more details.
+
+.. _Conditional mutual information: https://en.wikipedia.org/wiki/Conditional_mutual_information
+
+Examples
+--------
+
+.. doctest:: conditional_mutual_info
+
+    >>> xs = [0,0,1,1,1,1,0,0,0]
+    >>> ys = [0,1,1,1,1,0,0,0,1]
+    >>> zs = [0,0,1,1,0,0,1,1,1]
+    >>> conditional_mutual_info(xs, ys, zs)  # doctest: +ELLIPSIS
+    0.233318385567...
+    >>> conditional_mutual_info(xs, ys, zs, local=True)
+    array([ 0.        ,  0.        ,  0.73696559,  0.73696559,  0.        ,
+            0.        ,  0.73696559,  0.73696559, -0.84799691])
+
+Several time series may be conditioned on at once
+
+.. doctest:: conditional_mutual_info
+
+    >>> ws = [1,0,0,0,1,1,0,0,1]
+    >>> conditional_mutual_info(xs, ys, [zs, ws])  # doctest: +ELLIPSIS
+    0.528320833573...
+
+When many pairs of time series are to be conditioned on the same time
+series, :py:func:`conditional_mutual_info_batch` computes the condition's
+states and histogram only once:
+
+.. doctest:: conditional_mutual_info
+
+    >>> conditional_mutual_info_batch([xs, ys], [ys, xs], zs)
+    array([0.23331839, 0.23331839])
+"""
+import numpy as np
+
+from pyinform import _histogram
+from pyinform.instrument import probe
+
+
+def conditional_mutual_info(xs, ys, zs, local=False, b=None):
+    """
+    Compute the (local) conditional mutual information between two time
+    series, conditioned on one or more time series.
+
+    :param xs: a time series
+    :type xs: a sequence or ``numpy.ndarray``
+    :param ys: a time series
+    :type ys: a sequence or ``numpy.ndarray``
+    :param zs: the conditioning time series, either a single time series or a sequence of them
+    :type zs: a sequence or ``numpy.ndarray``
+    :param bool local: compute the local conditional mutual information
+    :param b: the base of the time series, either one for all or a triple ``(bx, by, bz)`` with ``bz`` one for all conditions or one per condition; inferred from the data if ``None``
+    :type b: int or triple
+    :return: the local or average conditional mutual information
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if the time series have different shapes
+    :raises ValueError: if the time series are empty
+    :raises ValueError: if a time series has states outside of its base
+    """
+    p = probe("conditional_mutual_info")
+
+    us = np.asarray(xs, dtype=np.int32)
+    vs = np.asarray(ys, dtype=np.int32)
+    if us.shape != vs.shape:
+        raise ValueError("timeseries lengths do not match")
+    elif us.size == 0:
+        raise ValueError("empty timeseries")
+    ws = _condition_rows(zs, us.shape)
+    p.phase("convert")
+
+    bx, by, bz = _bases(b, us, vs, ws)
+    p.phase("base")
+
+    _histogram.check_states(us, bx)
+    _histogram.check_states(vs, by)
+    for w, c in zip(ws, bz):
+        _histogram.check_states(w, c)
+
+    zc, zsize = _histogram.encode(ws, bz)
+    xz, xzsize = _histogram.join(us.ravel(), bx, zc, zsize)
+    yz, yzsize = _histogram.join(vs.ravel(), by, zc, zsize)
+    xyz, xyzsize = _histogram.join(us.ravel(), bx, yz, yzsize)
+
+    if local is True:
+        num = _histogram.local_counts(xyz, xyzsize) * _histogram.local_counts(zc, zsize)
+        den = _histogram.local_counts(xz, xzsize) * _histogram.local_counts(yz, yzsize)
+        cmi = np.log2(num / den.astype(np.float64)).reshape(us.shape)
+        p.allocated(cmi)
+    else:
+        cmi = _entropy(xz, xzsize) + _entropy(yz, yzsize) - _entropy(zc, zsize) - _entropy(xyz, xyzsize)
+
+    p.phase("kernel")
+    p.finish((us.size, vs.size) + (us.size,) * len(ws), (bx, by) + tuple(bz))
+
+    return cmi
+
+
+def conditional_mutual_info_batch(xs, ys, zs, b=None):
+    """
+    Compute the conditional mutual information between each of many pairs of
+    time series, all conditioned on the same time series.
+
+    The state of the condition, and its histogram, are computed only once
+    and shared by every pair.
+
+    :param xs: the first time series of each pair
+    :type xs: a sequence or ``numpy.ndarray``
+    :param ys: the second time series of each pair
+    :type ys: a sequence or ``numpy.ndarray``
+    :param zs: the conditioning time series, either a single time series or a sequence of them
+    :type zs: a sequence or ``numpy.ndarray``
+    :param b: the base of the time series, either one for all or a triple ``(bx, by, bz)`` with ``bz`` one for all conditions or one per condition; inferred from the data if ``None``
+    :type b: int or triple
+    :return: the conditional mutual information of each pair
+    :rtype: ``numpy.ndarray``
+    :raises ValueError: if the time series have different shapes
+    :raises ValueError: if the time series are empty
+    :raises ValueError: if a time series has states outside of its base
+    """
+    us = np.asarray(xs, dtype=np.int32)
+    vs = np.asarray(ys, dtype=np.int32)
+    if us.shape != vs.shape:
+        raise ValueError("timeseries lengths do not match")
+    elif us.ndim < 2:
+        raise ValueError("must provide a sequence of time series")
+    elif us.size == 0:
+        raise ValueError("empty timeseries")
+    ws = _condition_rows(zs, us.shape[1:])
+
+    npairs = us.shape[0]
+    us = us.reshape(npairs, -1)
+    vs = vs.reshape(npairs, -1)
+
+    bx, by, bz = _bases(b, us, vs, ws)
+
+    _histogram.check_states(us, bx)
+    _histogram.check_states(vs, by)
+    for w, c in zip(ws, bz):
+        _histogram.check_states(w, c)
+
+    zc, zsize = _histogram.encode(ws, bz)
+    xz, xzsize = _histogram.join(us, bx, zc, zsize)
+    yz, yzsize = _histogram.join(vs, by, zc, zsize)
+    xyz, xyzsize = _histogram.join(us, bx, yz, yzsize)
+
+    return _histogram.row_entropies(xz, xzsize) + _histogram.row_entropies(yz, yzsize) \
+        - _entropy(zc, zsize) - _histogram.row_entropies(xyz, xyzsize)
+
+
+def _condition_rows(zs, shape):
+    """
+    Reshape the condition(s) into an array with one flattened condition per
+    row.
+    """
+    ws = np.asarray(zs, dtype=np.int32)
+    if ws.shape == shape:
+        return ws.reshape(1, -1)
+    elif ws.ndim == len(shape) + 1 and ws.shape[1:] == shape and ws.shape[0] != 0:
+        return ws.reshape(ws.shape[0], -1)
+    raise ValueError("condition has a shape that's inconsistent with the time series")
+
+
+def _bases(b, us, vs, ws):
+    """
+    Determine the bases of the time series and each condition.
+    """
+    if b is None:
+        bx = max(2, int(np.amax(us)) + 1)
+        by = max(2, int(np.amax(vs)) + 1)
+        bz = np.maximum(2, np.amax(ws, axis=1) + 1)
+    elif np.ndim(b) == 0:
+        bx, by, bz = int(b), int(b), np.full(len(ws), b)
+    else:
+        bx, by, bz = b
+        bz = np.broadcast_to(bz, (len(ws),))
+    return int(bx), int(by), tuple(int(c) for c in bz)
+
+
+def _entropy(codes, size):
+    return _histogram.entropy(_histogram.counts(codes, size))
@@ -72,60 +72,175 @@ Of course multiple initial conditions are handled.
 
 import numpy as np
 
-from ctypes import byref, c_int, c_ulong, c_double, POINTER
-from pyinform import _inform
+from ctypes import byref, c_int, c_ulong, c_double
+from pyinform import _estimators, _histogram
+from pyinform._prototype import prototype, ERROR, SERIES, VALUES
 from pyinform.error import ErrorCode, error_guard
+from pyinform.instrument import probe
 
 
-def entropy_rate(series, k, local=False):
+def entropy_rate(series, k, local=False, b=None, estimator="plugin", per_trial=False,
+                 ensemble=False):
     """
     Compute the average or local entropy rate of a time series with history
     length *k*.
 
+    A bias-corrected *estimator* may be chosen in place of the plug-in
+    estimate, as described in :py:func:`~.shannon.entropy`. The entropy rate
+    is then the difference of the estimated entropies of the histories with
+    and without the next state, both counted in the same pass over the time
+    series.
+
+    If *per_trial* is ``True``, the entropy rate of each initial condition is
+    computed separately, as if each row of the time series were passed alone,
+    in a single pass which counts the histograms of every row together.
+
+    If *ensemble* is ``True``, the probabilities are estimated at each time
+    step across the initial conditions rather than pooled over time, and the
+    entropy rate is returned as a function of time: one value for each
+    time step after the first *k*, or the local values of each initial condition at each.
+
     :param series: the time series
     :type series: sequence or ``numpy.ndarray``
     :param int k: the history length
     :param bool local: compute the local active information
+    :param int b: the base of the time series, inferred from the data if ``None``
+    :param str estimator: the entropy estimator, one of ``"plugin"``, ``"miller-madow"``, ``"jackknife"``, ``"chao-shen"`` or ``"nsb"``
+    :param bool per_trial: compute the entropy rate of each initial condition
+    :param bool ensemble: estimate the probabilities at each time step across the initial conditions
     :returns: the average or local entropy rate
     :rtype: float or ``numpy.ndarray``
     :raises ValueError: if the time series has no initial conditions
     :raises ValueError: if the time series is greater than 2-D
+    :raises ValueError: if the estimator is unknown
+    :raises ValueError: if *local* is requested of an estimator other than ``"plugin"``
+    :raises ValueError: if *per_trial* is requested along with *local* or an estimator other than ``"plugin"``
+    :raises ValueError: if *ensemble* is requested along with *per_trial* or an estimator other than ``"plugin"``
     :raises InformError: if an error occurs within the ``inform`` C call
     """
+    p = probe("entropy_rate")
+
     xs = np.ascontiguousarray(series, np.int32)
+    p.converted(series, xs)
 
     if xs.ndim == 0:
         raise ValueError("empty timeseries")
     elif xs.ndim > 2:
         raise ValueError("dimension greater than 2")
+    elif xs.size == 0:
+        raise ValueError("empty timeseries")
+
+    _estimators.check(estimator)
+    if estimator != "plugin" and local is True:
+        raise ValueError("local values are only defined for the plug-in estimator")
+    elif per_trial is True and (local is True or estimator != "plugin"):
+        raise ValueError("per-trial values are only computed for the average plug-in estimate")
+    elif ensemble is True and (per_trial is True or estimator != "plugin"):
+        raise ValueError("ensemble values are only computed for the plug-in estimate, and not per trial")
+    p.phase("convert")
 
-    b = max(2, np.amax(xs) + 1)
+    if b is None:
+        b = max(2, np.amax(xs) + 1)
+    p.phase("base")
 
-    data = xs.ctypes.data_as(POINTER(c_int))
     if xs.ndim == 1:
         n, m = 1, xs.shape[0]
     else:
         n, m = xs.shape
 
+    if per_trial is True:
+        er = _per_trial_entropy_rate(xs.reshape(n, m), b, k)
+        p.allocated(er)
+        p.phase("kernel")
+        p.finish((xs.size,), (b,), k)
+        return er
+
+    if ensemble is True:
+        er = _ensemble_entropy_rate(xs.reshape(n, m), b, k, local)
+        p.allocated(er)
+        p.phase("kernel")
+        p.finish((xs.size,), (b,), k)
+        return er
+
+    if estimator != "plugin":
+        h = _estimated_entropy_rate(xs.reshape(n, m), b, k, estimator)
+        p.phase("kernel")
+        p.finish((xs.size,), (b,), k)
+        return h
+
     e = ErrorCode(0)
 
     if local is True:
         q = max(0, m - k)
         er = np.empty((n, q), dtype=np.float64)
-        out = er.ctypes.data_as(POINTER(c_double))
-        _local_entropy_rate(data, c_ulong(n), c_ulong(m), c_int(b), c_ulong(k), out, byref(e))
+        p.allocated(er)
+        p.phase("alloc")
+        _local_entropy_rate(xs, n, m, c_int(b), k, er, byref(e))
     else:
-        er = _entropy_rate(data, c_ulong(n), c_ulong(m), c_int(b), c_ulong(k), byref(e))
+        er = _entropy_rate(xs, n, m, c_int(b), k, byref(e))
 
     error_guard(e)
+    p.phase("kernel")
+    p.finish((xs.size,), (b,), k)
 
     return er
 
 
-_entropy_rate = _inform.inform_entropy_rate
-_entropy_rate.argtypes = [POINTER(c_int), c_ulong, c_ulong, c_int, c_ulong, POINTER(c_int)]
-_entropy_rate.restype = c_double
+def _estimated_entropy_rate(xs, b, k, estimator):
+    """
+    Estimate the entropy rate of the rows of *xs* as the difference of the
+    estimated entropies of the histories and of the histories together with
+    the next state, both counted in a single pass.
+    """
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the history length must be positive and less than the length of the time series")
+    _histogram.check_states(xs, b)
+
+    q = m - k
+    history, hsize = _histogram.encode([xs[:, i:i + q] for i in range(k)], [b] * k)
+    future, fsize = _histogram.join(history, hsize, xs[:, k:], b)
+    return _estimators.entropy(_histogram.counts(future, fsize), estimator, size=float(b)**(k + 1)) \
+        - _estimators.entropy(_histogram.counts(history, hsize), estimator, size=float(b)**k)
+
+
+def _per_trial_entropy_rate(xs, b, k):
+    """
+    Compute the entropy rate of each row of *xs*, counting the histograms of
+    every row in a single pass.
+    """
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the history length must be positive and less than the length of the time series")
+    _histogram.check_states(xs, b)
+
+    q = m - k
+    history, hsize = _histogram.encode([xs[:, i:i + q] for i in range(k)], [b] * k)
+    future, fsize = _histogram.join(history, hsize, xs[:, k:], b)
+    return (_histogram.row_xlog2x_sums(history, hsize) - _histogram.row_xlog2x_sums(future, fsize)) / q
+
+
+def _ensemble_entropy_rate(xs, b, k, local):
+    """
+    Compute the average or local entropy rate at each time step of *xs*,
+    counting the histograms of every time step across the rows in a single
+    pass.
+    """
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the history length must be positive and less than the length of the time series")
+    _histogram.check_states(xs, b)
+
+    # One row per time step, one column per initial condition
+    q = m - k
+    history, hsize = _histogram.encode([xs[:, i:i + q].T for i in range(k)], [b] * k)
+    future, fsize = _histogram.join(history, hsize, xs[:, k:].T, b)
+    if local is True:
+        num = _histogram.row_local_counts(history, hsize).astype(np.float64)
+        return np.log2(num / _histogram.row_local_counts(future, fsize)).T
+    return (_histogram.row_xlog2x_sums(history, hsize) - _histogram.row_xlog2x_sums(future, fsize)) / n
+
+
+_entropy_rate = prototype("inform_entropy_rate", c_double, [SERIES, c_ulong, c_ulong, c_int, c_ulong, ERROR])
 
-_local_entropy_rate = _inform.inform_local_entropy_rate
-_local_entropy_rate.argtypes = [POINTER(c_int), c_ulong, c_ulong, c_int, c_ulong, POINTER(c_double), POINTER(c_int)]
-_local_entropy_rate.restype = POINTER(c_double)
+_local_entropy_rate = prototype("inform_local_entropy_rate", None, [SERIES, c_ulong, c_ulong, c_int, c_ulong, VALUES, ERROR])
@@ -58,8 +58,12 @@ class InformError(Exception):
 def error_guard(e, func=None):
     """
     Raise an appropriately formated error if `e` is a failure
+
+    This is called after every call to ``inform``, so success is checked in
+    Python rather than by a further call into the library; ``inform`` signals
+    success with an error code of zero.
     """
-    if is_failure(e):
+    if (e.value if isinstance(e, ErrorCode) else e) != 0:
         raise InformError(e, func)
 
 
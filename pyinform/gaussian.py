@@ -0,0 +1,349 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+When continuously-valued time series are (close to) jointly Gaussian, the
+mutual information and transfer entropy are functions of their covariance
+alone [Barnett2009]_. The transfer entropy from :math:`Y` to :math:`X`, for
+example, is
+
+.. math::
+
+    T_{Y \\rightarrow X}(k) = \\frac{1}{2} \\log_2 \\frac{\\sigma^2(x_{i+1} | x^{(k)}_i)}{\\sigma^2(x_{i+1} | x^{(k)}_i, y_i)},
+
+where :math:`\\sigma^2(x | z)` is the variance of the residual of the linear
+regression of :math:`x` on :math:`z`, a Schur complement of the covariance
+matrix of the embedded time series. These estimators cost a few matrix
+products rather than a histogram per pair, and so are far cheaper than binning
+the time series and measuring them as discrete time series; they are exact for
+linear-Gaussian processes and a useful approximation for many others. Every
+measure in this module (:py:mod:`pyinform.gaussian`) is in bits.
+
+As with the discrete measures, the time series may have many initial
+conditions, each a row of a 2-D array, and the samples of every initial
+condition are pooled.
+
+.. doctest:: gaussian
+
+    >>> import numpy as np
+    >>> rng = np.random.RandomState(2019)
+    >>> xs = rng.normal(size=10000)
+    >>> ys = np.zeros(10000)
+    >>> for i in range(1, 10000):
+    ...     ys[i] = 0.5 * ys[i - 1] + 0.8 * xs[i - 1] + rng.normal()
+    ...
+    >>> gaussian.transfer_entropy(xs, ys, k=1)  # analytically 0.3568 bits
+    0.36201438923872975
+
+Matrices of Time Series
+-----------------------
+
+:py:func:`transfer_entropy_matrix` computes the transfer entropy between every
+ordered pair of a collection of time series, for one or many delays. The
+lagged covariances of every time series are computed once, with one matrix
+product per lag, and the conditional variances of every pair follow from them
+by batched linear algebra, so that the matrix of thousands of time series
+costs seconds rather than a million calls to :py:func:`transfer_entropy`.
+"""
+import numpy as np
+
+from pyinform.ksg import _condition_columns, _series
+
+_LOG2 = np.log(2.0)
+
+
+def mutual_info(xs, ys, local=False, delay=None):
+    """
+    Compute the mutual information between two continuously-valued time series
+    under a Gaussian approximation.
+
+    If a *delay* :math:`d` is given, *xs* is lagged :math:`d` time steps behind
+    *ys*, as in :py:func:`pyinform.mutualinfo.mutual_info`. Given a sequence of
+    delays, the mutual information at each delay is returned as a lag profile.
+
+    :param xs: a time series
+    :type xs: a sequence or ``numpy.ndarray``
+    :param ys: a time series
+    :type ys: a sequence or ``numpy.ndarray``
+    :param bool local: compute the local mutual information
+    :param delay: the delay, or a sequence of delays, of *xs* relative to *ys*
+    :type delay: int or sequence of ints
+    :return: the average or local mutual information, or the lag profile
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if the time series are empty or have different shapes
+    :raises ValueError: if the time series are greater than 2-D, not finite or constant
+    :raises ValueError: if a delay leaves no time steps
+    :raises ValueError: if *local* is requested along with a sequence of delays
+    """
+    us, vs = _series(xs), _series(ys)
+    if us.shape != vs.shape:
+        raise ValueError("timeseries lengths do not match")
+    shape = us.shape
+    us, vs = np.atleast_2d(us), np.atleast_2d(vs)
+    m = us.shape[1]
+
+    delays = np.asarray(0 if delay is None else delay, dtype=np.int64)
+    if np.any(delays < 0) or np.any(delays >= m):
+        raise ValueError("delay must be non-negative and less than the length of the time series")
+    elif delays.ndim != 0:
+        if local is True:
+            raise ValueError("the local mutual information cannot be computed over a sequence of delays")
+        return np.array([_mutual_info(us, vs, d, False) for d in delays])
+
+    d = int(delays)
+    mi = _mutual_info(us, vs, d, local)
+    if local is True:
+        return mi.reshape(shape[:-1] + (m - d,))
+    return mi
+
+
+def _mutual_info(us, vs, d, local):
+    """
+    Compute the mutual information of *us* lagged *d* time steps behind *vs*.
+    """
+    m = us.shape[1]
+    v = _centered([vs[:, d:].ravel(), us[:, :m - d].ravel()])
+    cov = _covariance(v)
+    return _information(v, cov, 0, [], [1], local)
+
+
+def transfer_entropy(source, target, k, condition=None, local=False, delay=None):
+    """
+    Compute the transfer entropy from one continuously-valued time series to
+    another, with target history length *k*, under a Gaussian approximation.
+
+    Optionally, time series can be provided against which to *condition*, and
+    the source can be lagged by a *delay*, as in
+    :py:func:`pyinform.transferentropy.transfer_entropy`. Given a sequence of
+    delays, the transfer entropy at each delay is returned as a lag profile.
+
+    :param source: the source time series
+    :type source: a sequence or ``numpy.ndarray``
+    :param target: the target time series
+    :type target: a sequence or ``numpy.ndarray``
+    :param int k: the history length
+    :param condition: time series on which the transfer entropy is conditioned
+    :type condition: a sequence or ``numpy.ndarray``
+    :param bool local: compute the local transfer entropy
+    :param delay: the delay, or a sequence of delays, of the source relative to the target
+    :type delay: int or sequence of ints
+    :return: the average or local transfer entropy, or the lag profile
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if the time series are empty or have different shapes
+    :raises ValueError: if the time series are greater than 2-D, not finite or constant
+    :raises ValueError: if *k* is not positive
+    :raises ValueError: if the history length and delay leave no time steps
+    :raises ValueError: if *local* is requested along with a sequence of delays
+    """
+    ys, xs = _series(source), _series(target)
+    if xs.shape != ys.shape:
+        raise ValueError("timeseries lengths do not match")
+    shape = xs.shape
+    xs, ys = np.atleast_2d(xs), np.atleast_2d(ys)
+    n, m = xs.shape
+
+    if condition is None:
+        cs = np.empty((0, n, m))
+    else:
+        cs = _condition_columns(condition, shape).T.reshape(-1, n, m)
+
+    delays = np.asarray(0 if delay is None else delay, dtype=np.int64)
+    if k < 1:
+        raise ValueError("the history length must be positive")
+    elif np.any(delays < 0) or np.any(k + delays >= m):
+        raise ValueError("the delay must be non-negative, and with the history length leave at least one time step")
+    elif delays.ndim != 0:
+        if local is True:
+            raise ValueError("the local transfer entropy cannot be computed over a sequence of delays")
+        return np.array([_transfer_entropy(ys, xs, cs, k, d, False) for d in delays])
+
+    d = int(delays)
+    te = _transfer_entropy(ys, xs, cs, k, d, local)
+    if local is True:
+        return te.reshape(shape[:-1] + (m - k - d,))
+    return te
+
+
+def _transfer_entropy(ys, xs, cs, k, d, local):
+    """
+    Compute the transfer entropy from *ys*, lagged *d* time steps, to *xs*
+    given the conditions *cs*.
+    """
+    start = k + d
+    rows = [_lagged(xs, start, lag) for lag in range(k + 1)]
+    rows.extend(_lagged(c, start, 1) for c in cs)
+    rows.append(_lagged(ys, start, 1 + d))
+    v = _centered(rows)
+    cov = _covariance(v)
+    p = len(rows)
+    return _information(v, cov, 0, list(range(1, p - 1)), [p - 1], local)
+
+
+def mutual_info_matrix(data, axis=0):
+    """
+    Compute the mutual information between every pair of a collection of
+    continuously-valued time series under a Gaussian approximation. The
+    diagonal of the result holds the differential entropy of each time series.
+
+    :param data: the time series
+    :type data: 2-D or 3-D sequence or ``numpy.ndarray``
+    :param int axis: the axis of *data* which indexes the time series
+    :return: the mutual information matrix
+    :rtype: ``numpy.ndarray``
+    :raises ValueError: if *data* is not 2-D or 3-D, is empty, not finite or has a constant time series
+    """
+    xs = _collection(data, axis)
+    v = xs.reshape(xs.shape[0], -1)
+    v = v - np.mean(v, axis=1, keepdims=True)
+    cov = _covariance(v)
+    var = np.diag(cov)
+    r2 = cov**2 / (var[:, np.newaxis] * var[np.newaxis, :])
+    with np.errstate(divide="ignore"):
+        mi = -0.5 * np.log2(np.clip(1.0 - r2, 0.0, 1.0))
+    mi[np.diag_indices_from(mi)] = 0.5 * np.log2(2 * np.pi * np.e * var)
+    return mi
+
+
+def transfer_entropy_matrix(data, k, axis=0, delay=None):
+    """
+    Compute the transfer entropy from every time series of a collection to
+    every other, with target history length *k*, under a Gaussian
+    approximation. The element :math:`(i, j)` of the result is the transfer
+    entropy from the :math:`i`-th time series to the :math:`j`-th, as
+    :py:func:`transfer_entropy` would compute it, and the diagonal is zero.
+
+    Given a sequence of delays, a matrix is returned for each delay.
+
+    :param data: the time series
+    :type data: 2-D or 3-D sequence or ``numpy.ndarray``
+    :param int k: the history length
+    :param int axis: the axis of *data* which indexes the time series
+    :param delay: the delay, or a sequence of delays, of the sources relative to the targets
+    :type delay: int or sequence of ints
+    :return: the transfer entropy matrix, or a matrix for each delay
+    :rtype: ``numpy.ndarray``
+    :raises ValueError: if *data* is not 2-D or 3-D, is empty, not finite or has a constant time series
+    :raises ValueError: if *k* is not positive
+    :raises ValueError: if the history length and delay leave no time steps
+    """
+    xs = _collection(data, axis)
+    if xs.ndim == 2:
+        xs = xs[:, np.newaxis, :]
+    m = xs.shape[2]
+
+    delays = np.asarray(0 if delay is None else delay, dtype=np.int64)
+    if k < 1:
+        raise ValueError("the history length must be positive")
+    elif np.any(delays < 0) or np.any(k + delays >= m):
+        raise ValueError("the delay must be non-negative, and with the history length leave at least one time step")
+    elif delays.ndim != 0:
+        return np.array([_transfer_entropy_matrix(xs, k, d) for d in delays])
+    return _transfer_entropy_matrix(xs, k, int(delays))
+
+
+def _transfer_entropy_matrix(xs, k, d):
+    """
+    Compute the transfer entropy matrix of the time series *xs*, each a 2-D
+    array of initial conditions, at the delay *d*.
+
+    For each target :math:`j` the regression of its next state on its own
+    history is solved once. The covariance of each source :math:`i` with the
+    target's next state and history is then adjusted for that history (a Schur
+    complement) for every pair at once, giving the covariance :math:`a_{ij}`
+    and variance :math:`v_{ij}` of the residuals, from which
+    :math:`T_{i \\rightarrow j} = -\\frac{1}{2}\\log_2(1 - a_{ij}^2 / (r_j v_{ij}))`
+    where :math:`r_j` is the residual variance of the target alone.
+    """
+    nvars = xs.shape[0]
+    start = k + d
+    lags = [np.stack([_lagged(x, start, lag) for x in xs]) for lag in range(k + 1)]
+    lags = [u - np.mean(u, axis=1, keepdims=True) for u in lags]
+    source = lags[1 + d] if 1 + d <= k else _centered([_lagged(x, start, 1 + d) for x in xs])
+    samples = source.shape[1]
+
+    # The covariance of every source with every target's next state and history
+    cross = np.stack([np.dot(source, u.T) for u in lags], axis=2) / samples
+    own = np.einsum("anc,bnc->nab", np.stack(lags), np.stack(lags)) / samples
+    var = np.einsum("nc,nc->n", source, source) / samples
+    if np.any(own[:, 0, 0] <= 0) or np.any(var <= 0):
+        raise ValueError("the time series must not be constant")
+
+    history = np.linalg.inv(own[:, 1:, 1:])
+    beta = np.einsum("jab,jb->ja", history, own[:, 1:, 0])
+    r = own[:, 0, 0] - np.einsum("ja,ja->j", own[:, 0, 1:], beta)
+    a = cross[:, :, 0] - np.einsum("ija,ja->ij", cross[:, :, 1:], beta)
+    v = var[:, np.newaxis] - np.einsum("ija,jab,ijb->ij", cross[:, :, 1:], history, cross[:, :, 1:])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        te = -0.5 * np.log2(np.clip(1.0 - a**2 / (r[np.newaxis, :] * v), 0.0, 1.0))
+    te[np.diag_indices(nvars)] = 0.0
+    return te
+
+
+def _information(v, cov, i, given, extra, local):
+    """
+    Compute the information the variables *extra* carry about the variable *i*
+    beyond the variables *given*, from the centered samples *v* and their
+    covariance *cov*.
+    """
+    v1, b1 = _conditional_variance(cov, i, given)
+    v2, b2 = _conditional_variance(cov, i, given + extra)
+    info = 0.5 * np.log2(v1 / v2)
+    if local is not True:
+        return float(info)
+    e1 = v[i] - np.dot(b1, v[given])
+    e2 = v[i] - np.dot(b2, v[given + extra])
+    return info + (e1**2 / v1 - e2**2 / v2) / (2 * _LOG2)
+
+
+def _conditional_variance(cov, i, given):
+    """
+    Compute the variance of the residual of the regression of the variable *i*
+    on the variables *given*, i.e. the Schur complement of the covariance of
+    *given* in that of *i* and *given*, and the regression coefficients.
+    """
+    if len(given) == 0:
+        return cov[i, i], np.empty(0)
+    beta = np.linalg.solve(cov[np.ix_(given, given)], cov[given, i])
+    return cov[i, i] - np.dot(cov[i, given], beta), beta
+
+
+def _lagged(xs, start, lag):
+    """
+    Get the samples of the 2-D time series *xs* lagged *lag* time steps behind
+    the time steps from *start* onward.
+    """
+    return xs[:, start - lag:xs.shape[1] - lag].ravel()
+
+
+def _centered(rows):
+    """
+    Stack the samples of several variables into rows, and center each.
+    """
+    v = np.array(rows, dtype=np.float64)
+    return v - np.mean(v, axis=1, keepdims=True)
+
+
+def _covariance(v):
+    """
+    Compute the covariance of the centered variables *v*.
+    """
+    cov = np.dot(v, v.T) / v.shape[1]
+    if np.any(np.diag(cov) <= 0):
+        raise ValueError("the time series must not be constant")
+    return cov
+
+
+def _collection(data, axis):
+    """
+    Convert a collection of time series to an array with the time series along
+    the first axis.
+    """
+    xs = np.asarray(data, dtype=np.float64)
+    if xs.ndim not in (2, 3):
+        raise ValueError("data must be 2-D or 3-D")
+    elif xs.size == 0:
+        raise ValueError("empty timeseries")
+    elif not np.all(np.isfinite(xs)):
+        raise ValueError("timeseries must be finite")
+    return np.ascontiguousarray(np.moveaxis(xs, axis, 0))
@@ -0,0 +1,159 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Each call to one of the time series measures spends its time in a handful of
+phases: converting the inputs to contiguous arrays, inferring the base of the
+time series, allocating the result and, finally, running the ``inform`` C
+kernel. This module (:py:mod:`pyinform.instrument`) provides an opt-in way to
+see how the time is split between those phases.
+
+Instrumentation is disabled until a hook is registered, and a disabled
+measure pays for little more than a handful of no-op method calls. The
+simplest way to collect measurements is the :py:func:`.record` context
+manager:
+
+.. doctest:: instrument
+
+    >>> with instrument.record() as records:
+    ...     te = transfer_entropy([0,1,1,1,1,0,0,0,0], [0,0,1,1,1,1,0,0,0], k=2)
+    ...
+    >>> len(records)
+    1
+    >>> records[0].measure
+    'transfer_entropy'
+    >>> sorted(records[0].phases)
+    ['base', 'convert', 'kernel']
+
+Each measurement is a :py:class:`.Record`, a ``namedtuple`` which can be
+converted to a plain ``dict`` via ``Record._asdict`` for export to other
+tools. Long-running processes can instead register a callback via
+:py:func:`.add_hook` which is called with each record as it is produced.
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+from time import perf_counter
+
+Record = namedtuple("Record", ["measure", "phases", "sizes", "bases", "k", "nbytes"])
+Record.__doc__ = """
+A single instrumented call to a measure.
+
+:param str measure: the name of the measure
+:param dict phases: the time (in seconds) spent in each phase of the call
+:param tuple sizes: the number of elements in each input time series
+:param tuple bases: the base of each input time series
+:param k: the history length (or block size), if any
+:param int nbytes: the number of bytes allocated by the call for converted inputs and results
+"""
+
+_hooks = []
+
+
+def add_hook(hook):
+    """
+    Register a callable to be called with each :py:class:`.Record` produced.
+
+    :param hook: the callable
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """
+    Unregister a callable previously registered with :py:func:`.add_hook`.
+
+    :param hook: the callable
+    :raises ValueError: if the callable is not registered
+    """
+    _hooks.remove(hook)
+
+
+@contextmanager
+def record():
+    """
+    Collect a :py:class:`.Record` for every measure called within the context.
+
+    :return: the list into which records are collected
+    :rtype: list
+    """
+    records = []
+    add_hook(records.append)
+    try:
+        yield records
+    finally:
+        remove_hook(records.append)
+
+
+class _Probe(object):
+    """
+    A probe accumulates the measurements of a single call to a measure.
+    """
+    __slots__ = ("measure", "phases", "nbytes", "_last")
+
+    def __init__(self, measure):
+        self.measure = measure
+        self.phases = {}
+        self.nbytes = 0
+        self._last = perf_counter()
+
+    def phase(self, name):
+        """
+        Attribute the time elapsed since the last phase to the *name* phase.
+        """
+        now = perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + (now - self._last)
+        self._last = now
+
+    def converted(self, original, converted):
+        """
+        Account for the memory used to convert *original* into *converted*.
+        """
+        if converted is not original:
+            self.nbytes += converted.nbytes
+
+    def allocated(self, array):
+        """
+        Account for the memory used by a newly allocated *array*.
+        """
+        self.nbytes += array.nbytes
+
+    def finish(self, sizes, bases, k=None):
+        """
+        Emit the record of the call to all registered hooks.
+        """
+        rec = Record(self.measure, self.phases, tuple(sizes),
+                     tuple(int(b) for b in bases), k, self.nbytes)
+        for hook in list(_hooks):
+            hook(rec)
+
+
+class _NullProbe(object):
+    """
+    A probe which does nothing, used when instrumentation is disabled.
+    """
+    __slots__ = ()
+
+    def phase(self, name):
+        pass
+
+    def converted(self, original, converted):
+        pass
+
+    def allocated(self, array):
+        pass
+
+    def finish(self, sizes, bases, k=None):
+        pass
+
+
+_null_probe = _NullProbe()
+
+
+def probe(measure):
+    """
+    Create a probe for a call to *measure*. If no hooks are registered, a
+    shared probe which does nothing is returned.
+    """
+    if _hooks:
+        return _Probe(measure)
+    return _null_probe
@@ -0,0 +1,353 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+The integration of a system of variables relative to a partition
+:math:`P = \\{M_1, \\ldots, M_r\\}` of them is the multi-information between
+the blocks of the partition [Tononi1994]_,
+
+.. math::
+
+    I_P(X) = \\sum_{k=1}^r H(M_k) - H(X_1, \\ldots, X_l),
+
+i.e. the information which is lost by treating the blocks as independent. For
+a bipartition it is the mutual information between the two halves of the
+system. The partition across which the least information is lost, once
+normalized by the size of its blocks,
+
+.. math::
+
+    N_P = (r - 1) \\min_k H(M_k),
+
+is the minimum information partition [Balduzzi2008]_, and the integration
+across it is a measure of how much the system is more than the sum of its
+parts.
+
+Every such measure is a sum of the joint entropies of subsets of the
+variables, and each subset appears in a great many partitions. This module
+(:py:mod:`pyinform.integration`) computes the joint entropy of every subset
+once, by extending the encoded states of each subset by one variable at a
+time, and stores them by the subset's bitmask (the :math:`i`-th variable being
+the :math:`i`-th bit). The integration across every partition is then a few
+lookups. The partitions are generated lazily by
+:py:func:`pyinform.utils.partitions.partitions`.
+
+.. doctest:: integration
+
+    >>> xs = [[0,0,1,1,0,1,0,1],
+    ...       [0,1,1,1,0,1,0,1],
+    ...       [0,1,0,1,1,1,0,1]]
+    >>> integration.integration(xs)
+    array([0.204434  , 0.704434  , 0.59436094])
+    >>> integration.integration(xs, [(1, 6), [[0, 1], [2]]])
+    array([0.59436094, 0.204434  ])
+    >>> integration.minimum_information_partition(xs)
+    ((3, 4), 0.20443400292496516)
+
+Both the subset entropies and the search for the minimum information
+partition can be split across a pool of *processes*. There are :math:`2^l`
+subsets of :math:`l` variables and :math:`2^{l-1} - 1` bipartitions, so
+systems of 15 to 25 variables are within reach when the search is restricted
+to bipartitions (the default); the number of partitions into any number of
+blocks grows far more quickly, and every partition can only be searched for a
+dozen or so variables.
+"""
+import numpy as np
+
+from pyinform import _histogram
+from pyinform.utils.partitions import partitions as _partitions, _completions
+
+# The largest number of variables whose subset entropies may be computed
+MAX_VARIABLES = 30
+
+
+def subset_entropies(series, b=None, processes=None):
+    """
+    Compute the joint entropy of every subset of a collection of time series.
+
+    The entropy of the subset with bitmask :math:`s` is the :math:`s`-th
+    element of the result; the entropy of the empty subset is zero.
+
+    :param series: the time series, one per row
+    :type series: sequence or ``numpy.ndarray``
+    :param b: the base of the time series, either one for all or one per series; inferred from the data if ``None``
+    :type b: int or sequence of ints
+    :param int processes: the number of worker processes; computed serially if ``None``
+    :return: the entropy of each subset
+    :rtype: ``numpy.ndarray``
+    :raises ValueError: if fewer than one time series is given, or the time series are empty
+    :raises ValueError: if more than ``MAX_VARIABLES`` time series are given
+    :raises ValueError: if the number of bases does not match the number of time series
+    :raises ValueError: if a time series has states outside of its base
+    """
+    rows, bs = _convert(series, b)
+    nvars = rows.shape[0]
+
+    depth = 0
+    if processes is not None:
+        while depth < nvars and (1 << depth) < 4 * processes:
+            depth += 1
+
+    h = np.empty(1 << nvars, dtype=np.float64)
+    high = np.arange(1 << (nvars - depth), dtype=np.int64) << depth
+    if processes is None or depth == 0:
+        for prefix in range(1 << depth):
+            h[prefix | high] = _subset_entropies(rows, bs, depth, prefix)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(rows, bs, depth)) as pool:
+            for prefix, hs in enumerate(pool.map(_worker_subset_entropies, range(1 << depth))):
+                h[prefix | high] = hs
+    return h
+
+
+def integration(series, partitions=None, b=None, processes=None):
+    """
+    Compute the integration of a collection of time series relative to each of
+    many partitions.
+
+    The *partitions* may be any iterable, including a generator such as
+    :py:func:`pyinform.utils.partitions.partitions`; each partition is a
+    sequence of blocks, and each block either a bitmask or a sequence of the
+    indices of its time series. By default, the integration is computed across
+    every bipartition, in the order of ``utils.partitions(len(series), blocks=2)``.
+
+    :param series: the time series, one per row
+    :type series: sequence or ``numpy.ndarray``
+    :param partitions: the partitions
+    :type partitions: iterable
+    :param b: the base of the time series, either one for all or one per series; inferred from the data if ``None``
+    :type b: int or sequence of ints
+    :param int processes: the number of worker processes computing the subset entropies; computed serially if ``None``
+    :return: the integration relative to each partition
+    :rtype: ``numpy.ndarray``
+    :raises ValueError: if a partition's blocks do not partition the time series
+    """
+    h = subset_entropies(series, b=b, processes=processes)
+    full = h.size - 1
+
+    if partitions is None:
+        first, second = _bipartitions(full.bit_length())
+        return h[first] + h[second] - h[full]
+
+    nvars = full.bit_length()
+    return np.fromiter((sum(h[m] for m in _blocks(p, nvars)) - h[full] for p in partitions), dtype=np.float64)
+
+
+def minimum_information_partition(series, blocks=2, normalize=True, b=None, processes=None):
+    """
+    Find the partition of a collection of time series across which the least
+    information is lost, returning the partition and the integration relative
+    to it.
+
+    The partitions are compared by their integration divided by
+    :math:`(r - 1)\\min_k H(M_k)` if *normalize* is ``True``, and those with
+    a block of zero entropy are then passed over unless no other remains.
+    Only partitions into *blocks* blocks are considered, or partitions into
+    any number of blocks (but one) if *blocks* is ``None``. Ties are broken in
+    favour of the partition generated first by
+    :py:func:`pyinform.utils.partitions.partitions`.
+
+    :param series: the time series, one per row
+    :type series: sequence or ``numpy.ndarray``
+    :param int blocks: the number of blocks, or ``None`` for any number
+    :param bool normalize: compare the partitions by their normalized integration
+    :param b: the base of the time series, either one for all or one per series; inferred from the data if ``None``
+    :type b: int or sequence of ints
+    :param int processes: the number of worker processes; computed serially if ``None``
+    :return: the minimum information partition and the integration relative to it
+    :rtype: (tuple, float)
+    :raises ValueError: if fewer than two time series are given
+    :raises ValueError: if *blocks* is not in ``[2, l]`` for *l* time series
+    """
+    h = subset_entropies(series, b=b, processes=processes)
+    full = h.size - 1
+    nvars = full.bit_length()
+    if nvars < 2:
+        raise ValueError("at least two time series must be partitioned")
+    elif blocks is not None and not 2 <= blocks <= nvars:
+        raise ValueError("the number of blocks must be between 2 and the number of time series")
+
+    if blocks == 2:
+        first, second = _bipartitions(nvars)
+        info = h[first] + h[second] - h[full]
+        score = _normalized(info, 1, np.minimum(h[first], h[second])) if normalize else info
+        i = int(np.argmin(score))
+        return (int(first[i]), int(second[i])), float(info[i])
+
+    depth = 1
+    if processes is not None:
+        while depth < nvars and sum(1 for _ in _prefixes(depth + 1, blocks)) <= 4 * processes:
+            depth += 1
+    prefixes = list(_prefixes(depth, blocks))
+
+    if processes is None:
+        best = [_search(h, nvars, prefix, blocks, normalize) for prefix in prefixes]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(processes, initializer=_init_search, initargs=(h, nvars, blocks, normalize)) as pool:
+            best = list(pool.map(_worker_search, prefixes))
+    score, info, partition = min((r for r in best if r is not None), key=lambda r: r[0])
+    return partition, info
+
+
+def _convert(series, b):
+    """
+    Convert a collection of time series into one row per time series, with a
+    base for each.
+    """
+    xs = np.ascontiguousarray(series, dtype=np.int32)
+    if xs.ndim < 2:
+        raise ValueError("must provide a sequence of time series")
+    elif xs.size == 0:
+        raise ValueError("empty timeseries")
+
+    nvars = xs.shape[0]
+    if nvars > MAX_VARIABLES:
+        raise ValueError("the subset entropies of more than {} time series cannot be stored".format(MAX_VARIABLES))
+    rows = xs.reshape(nvars, -1)
+
+    if b is None:
+        bs = np.maximum(2, np.amax(rows, axis=1) + 1)
+    elif np.ndim(b) == 0:
+        bs = np.full(nvars, b, dtype=np.int64)
+    else:
+        bs = np.asarray(b, dtype=np.int64)
+        if bs.shape != (nvars,):
+            raise ValueError("the number of bases does not match the number of time series")
+    for row, base in zip(rows, bs):
+        _histogram.check_states(row, base)
+    return rows, bs
+
+
+def _subset_entropies(rows, bs, depth, prefix):
+    """
+    Compute the joint entropy of each subset of the *rows* whose intersection
+    with the first *depth* rows is the bitmask *prefix*, indexed by the bitmask
+    of the rest of the subset shifted down by *depth*.
+
+    The subsets are visited depth first, each extending the encoded states of
+    its parent by the states of one more row, so that every subset is encoded
+    and counted once.
+    """
+    nvars, n = rows.shape
+    codes, size = np.zeros(n, dtype=np.int64), 1
+    for i in range(depth):
+        if prefix >> i & 1:
+            codes, size = _histogram.join(codes, size, rows[i], bs[i])
+
+    # Relabel the states once they outnumber the observations, keeping the
+    # histograms dense and small
+    limit = min(_histogram.DENSE_SIZE, 4 * n)
+    h = np.empty(1 << (nvars - depth), dtype=np.float64)
+    stack = [(codes, size, 0, depth)]
+    while stack:
+        codes, size, mask, start = stack.pop()
+        if size > limit:
+            codes, size = _histogram.compress(codes)
+        h[mask] = _histogram.entropy(_histogram.counts(codes, size))
+        for j in range(start, nvars):
+            c, s = _histogram.join(codes, size, rows[j], bs[j])
+            stack.append((c, s, mask | 1 << (j - depth), j + 1))
+    return h
+
+
+def _bipartitions(nvars):
+    """
+    The bitmasks of the blocks of every bipartition of *nvars* variables, in the
+    order of ``utils.partitions(nvars, blocks=2)``.
+    """
+    # The i-th bit of v, from the most significant, labels the (i + 1)-th variable
+    v = np.arange(1, 1 << (nvars - 1), dtype=np.int64)
+    second = np.zeros_like(v)
+    for i in range(1, nvars):
+        second |= ((v >> (nvars - 1 - i)) & 1) << i
+    return ((1 << nvars) - 1) ^ second, second
+
+
+def _blocks(partition, nvars):
+    """
+    Convert the blocks of a partition into bitmasks, checking that they
+    partition *nvars* variables.
+    """
+    masks = []
+    for block in partition:
+        if isinstance(block, (int, np.integer)):
+            masks.append(int(block))
+        else:
+            masks.append(sum(1 << int(i) for i in set(block)))
+    union = 0
+    for m in masks:
+        if m <= 0 or m & union:
+            raise ValueError("the blocks of a partition must be non-empty and disjoint")
+        union |= m
+    if union != (1 << nvars) - 1:
+        raise ValueError("the blocks of a partition must cover every time series")
+    return masks
+
+
+def _normalized(info, r, smallest):
+    """
+    Normalize the integration across partitions with *r* + 1 blocks, the
+    smallest of whose entropies is *smallest*.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(smallest > 0, info / (r * smallest), np.inf)
+
+
+def _prefixes(depth, blocks):
+    """
+    The restricted growth strings of length *depth* which may begin a
+    partition into *blocks* blocks.
+    """
+    for p in _partitions(depth):
+        if blocks is None or len(p) <= blocks:
+            labels = [0] * depth
+            for label, mask in enumerate(p):
+                for i in range(depth):
+                    if mask >> i & 1:
+                        labels[i] = label
+            yield labels
+
+
+def _search(h, nvars, prefix, blocks, normalize):
+    """
+    Find the partition with the least (normalized) integration among those
+    beginning with *prefix*, returning its score, integration and blocks, or
+    ``None`` if there is no such partition.
+    """
+    full = h.size - 1
+    best = None
+    for p in _completions(prefix, nvars, blocks):
+        if len(p) == 1:
+            continue
+        info = sum(h[m] for m in p) - h[full]
+        score = info
+        if normalize:
+            score = float(_normalized(info, len(p) - 1, min(h[m] for m in p)))
+        if best is None or score < best[0]:
+            best = (score, float(info), p)
+    return best
+
+
+_worker_data = None
+
+
+def _init_worker(*args):
+    global _worker_data
+    _worker_data = args
+
+
+def _worker_subset_entropies(prefix):
+    rows, bs, depth = _worker_data
+    return _subset_entropies(rows, bs, depth, prefix)
+
+
+def _init_search(*args):
+    global _worker_data
+    _worker_data = args
+
+
+def _worker_search(prefix):
+    h, nvars, blocks, normalize = _worker_data
+    return _search(h, nvars, prefix, blocks, normalize)
@@ -0,0 +1,387 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+The Kraskov-Stoegbauer-Grassberger (KSG) estimators [Kraskov2004]_ measure the
+information shared by continuously-valued time series without binning them.
+Rather than counting the occurrences of discrete states, they count how many
+samples lie near each sample: the distance from each sample to its
+:math:`K`-th nearest neighbour in the joint space sets the scale, and the
+number of samples within that distance in each marginal space stands in for
+the marginal densities. The mutual information is estimated as
+
+.. math::
+
+    I(X;Y) = \\psi(K) + \\psi(N) - \\langle \\psi(n_x + 1) + \\psi(n_y + 1) \\rangle,
+
+where :math:`\\psi` is the digamma function, :math:`N` is the number of samples
+and :math:`n_x` (:math:`n_y`) is the number of samples strictly within the
+distance of the :math:`K`-th neighbour in the :math:`X` (:math:`Y`) space,
+measured in the maximum norm. The conditional mutual information is estimated
+likewise [Frenzel2007]_,
+
+.. math::
+
+    I(X;Y|Z) = \\psi(K) - \\langle \\psi(n_{xz} + 1) + \\psi(n_{yz} + 1) - \\psi(n_z + 1) \\rangle,
+
+and the transfer entropy is the conditional mutual information between the
+source and the next state of the target, given the target's history.
+Every measure in this module (:py:mod:`pyinform.ksg`) is in bits.
+
+As with the discrete measures, the time series may have many initial
+conditions, each a row of a 2-D array, and the samples of every initial
+condition are pooled. Unlike the discrete measures, there is no base.
+
+.. doctest:: ksg
+
+    >>> import numpy as np
+    >>> rng = np.random.RandomState(2019)
+    >>> xs = rng.normal(size=2000)
+    >>> ys = xs + rng.normal(size=2000)
+    >>> ksg.mutual_info(xs, ys)  # analytically 0.5 bits
+    0.5006002222609807
+
+Neighbour Searches
+------------------
+
+The neighbours are found via a k-d tree (``scipy.spatial.cKDTree``) if scipy is
+installed, e.g. with ``pip install pyinform[ksg]``; otherwise, by comparing
+every pair of samples, which is only feasible for a few tens of thousands of
+samples. Each tree is built once per space, and the tree of a condition is
+shared by every pair of :py:func:`conditional_mutual_info_batch`. The queries
+are made ``CHUNK`` samples at a time, optionally in a pool of *threads*; the
+tree releases the global interpreter lock while it is searched, so that with
+scipy installed series of a million samples are within reach.
+
+The estimators assume that no two samples coincide. Time series with many
+repeated values, e.g. quantized measurements, should have low-amplitude noise
+added to them before they are measured.
+"""
+import numpy as np
+
+from multiprocessing import cpu_count
+
+from pyinform._special import digamma
+
+# The number of samples in each chunk of queries
+CHUNK = 1 << 14
+
+# The largest number of distances computed at once when searching without a tree
+BRUTE_BLOCK = 1 << 22
+
+_LOG2 = np.log(2.0)
+
+
+def mutual_info(xs, ys, neighbors=4, local=False, threads=None):
+    """
+    Estimate the mutual information between two continuously-valued time
+    series.
+
+    :param xs: a time series
+    :type xs: a sequence or ``numpy.ndarray``
+    :param ys: a time series
+    :type ys: a sequence or ``numpy.ndarray``
+    :param int neighbors: the number of neighbours, :math:`K`
+    :param bool local: compute the local mutual information
+    :param int threads: the number of threads querying the neighbours; serially if ``None``
+    :return: the average or local mutual information
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if the time series are empty or have different shapes
+    :raises ValueError: if the time series are greater than 2-D or not finite
+    :raises ValueError: if *neighbors* is not positive or is not less than the number of samples
+    """
+    us, vs = _series(xs), _series(ys)
+    if us.shape != vs.shape:
+        raise ValueError("timeseries lengths do not match")
+    n = _check_neighbors(neighbors, us.size)
+
+    x, y = us.reshape(-1, 1), vs.reshape(-1, 1)
+    eps = _Index(np.hstack((x, y))).kth_distances(neighbors, threads)
+    nx = _Index(x).counts(eps, threads)
+    ny = _Index(y).counts(eps, threads)
+
+    psi = _digamma_table(n)
+    mi = (digamma(neighbors) + psi[n - 1] - psi[nx] - psi[ny]) / _LOG2
+    if local is True:
+        return mi.reshape(us.shape)
+    return float(np.mean(mi))
+
+
+def conditional_mutual_info(xs, ys, zs, neighbors=4, local=False, threads=None):
+    """
+    Estimate the conditional mutual information between two continuously-valued
+    time series given one or more others.
+
+    The condition *zs* is either a single time series, with the same shape as
+    *xs*, or a stack of such time series (one more dimension), each
+    conditioned upon jointly.
+
+    :param xs: a time series
+    :type xs: a sequence or ``numpy.ndarray``
+    :param ys: a time series
+    :type ys: a sequence or ``numpy.ndarray``
+    :param zs: the conditioning time series
+    :type zs: a sequence or ``numpy.ndarray``
+    :param int neighbors: the number of neighbours, :math:`K`
+    :param bool local: compute the local conditional mutual information
+    :param int threads: the number of threads querying the neighbours; serially if ``None``
+    :return: the average or local conditional mutual information
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if the time series are empty or have different shapes
+    :raises ValueError: if the time series are greater than 2-D or not finite
+    :raises ValueError: if *neighbors* is not positive or is not less than the number of samples
+    """
+    us, vs = _series(xs), _series(ys)
+    if us.shape != vs.shape:
+        raise ValueError("timeseries lengths do not match")
+    z = _condition_columns(zs, us.shape)
+    _check_neighbors(neighbors, us.size)
+
+    cmi = _cmi(us.reshape(-1, 1), vs.reshape(-1, 1), z, _Index(z), neighbors, threads)
+    if local is True:
+        return cmi.reshape(us.shape)
+    return float(np.mean(cmi))
+
+
+def conditional_mutual_info_batch(xs, ys, zs, neighbors=4, threads=None):
+    """
+    Estimate the conditional mutual information of many pairs of
+    continuously-valued time series, each given the same condition.
+
+    The pairs are stacked along the first axis of *xs* and *ys*, and *zs* is
+    as in :py:func:`conditional_mutual_info` for a single pair. The neighbour
+    index of the condition is built once and shared by every pair.
+
+    :param xs: the first time series of each pair
+    :type xs: a sequence or ``numpy.ndarray``
+    :param ys: the second time series of each pair
+    :type ys: a sequence or ``numpy.ndarray``
+    :param zs: the conditioning time series
+    :type zs: a sequence or ``numpy.ndarray``
+    :param int neighbors: the number of neighbours, :math:`K`
+    :param int threads: the number of threads querying the neighbours; serially if ``None``
+    :return: the conditional mutual information of each pair
+    :rtype: ``numpy.ndarray``
+    :raises ValueError: if the time series are empty or have different shapes
+    :raises ValueError: if the time series are greater than 3-D or not finite
+    :raises ValueError: if *neighbors* is not positive or is not less than the number of samples
+    """
+    us = np.array(xs, dtype=np.float64)
+    vs = np.array(ys, dtype=np.float64)
+    if us.ndim < 2 or us.ndim > 3:
+        raise ValueError("the pairs must be stacked along the first axis of 2-D or 3-D arrays")
+    elif us.shape != vs.shape:
+        raise ValueError("timeseries lengths do not match")
+    elif us.size == 0:
+        raise ValueError("empty timeseries")
+    elif not (np.all(np.isfinite(us)) and np.all(np.isfinite(vs))):
+        raise ValueError("timeseries must be finite")
+    z = _condition_columns(zs, us.shape[1:])
+    _check_neighbors(neighbors, z.shape[0])
+
+    index = _Index(z)
+    cmi = np.empty(us.shape[0], dtype=np.float64)
+    for i in range(us.shape[0]):
+        cmi[i] = np.mean(_cmi(us[i].reshape(-1, 1), vs[i].reshape(-1, 1), z, index, neighbors, threads))
+    return cmi
+
+
+def transfer_entropy(source, target, k, condition=None, neighbors=4, local=False, threads=None):
+    """
+    Estimate the transfer entropy from one continuously-valued time series to
+    another, with target history length *k*.
+
+    The transfer entropy is estimated as the conditional mutual information
+    between the source and the next state of the target given the target's
+    *k*-history and, if provided, the previous states of the *condition*
+    (one or a stack of time series, as in
+    :py:func:`pyinform.transferentropy.transfer_entropy`).
+
+    :param source: the source time series
+    :type source: a sequence or ``numpy.ndarray``
+    :param target: the target time series
+    :type target: a sequence or ``numpy.ndarray``
+    :param int k: the history length
+    :param condition: time series on which the transfer entropy is conditioned
+    :type condition: a sequence or ``numpy.ndarray``
+    :param int neighbors: the number of neighbours, :math:`K`
+    :param bool local: compute the local transfer entropy
+    :param int threads: the number of threads querying the neighbours; serially if ``None``
+    :return: the average or local transfer entropy
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if the time series are empty or have different shapes
+    :raises ValueError: if the time series are greater than 2-D or not finite
+    :raises ValueError: if *k* is not positive or not less than the length of the time series
+    :raises ValueError: if *neighbors* is not positive or is not less than the number of samples
+    """
+    ys, xs = _series(source), _series(target)
+    if xs.shape != ys.shape:
+        raise ValueError("timeseries lengths do not match")
+    shape = xs.shape
+    xs, ys = np.atleast_2d(xs), np.atleast_2d(ys)
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the history length must be positive and less than the length of the time series")
+    q = m - k
+    _check_neighbors(neighbors, n * q)
+
+    columns = [xs[:, i:i + q].reshape(-1) for i in range(k)]
+    if condition is not None:
+        cs = _condition_columns(condition, shape).reshape(n, m, -1)
+        columns.extend(cs[:, k - 1:m - 1, j].reshape(-1) for j in range(cs.shape[2]))
+    z = np.column_stack(columns)
+
+    future = xs[:, k:].reshape(-1, 1)
+    past = ys[:, k - 1:m - 1].reshape(-1, 1)
+    te = _cmi(future, past, z, _Index(z), neighbors, threads)
+    if local is True:
+        return te.reshape(n, q)
+    return float(np.mean(te))
+
+
+def _cmi(x, y, z, zindex, neighbors, threads):
+    """
+    Compute the local conditional mutual information of the samples *x* and
+    *y* given *z*, each a 2-D array of samples, given the neighbour index of
+    *z*.
+    """
+    eps = _Index(np.hstack((x, y, z))).kth_distances(neighbors, threads)
+    nxz = _Index(np.hstack((x, z))).counts(eps, threads)
+    nyz = _Index(np.hstack((y, z))).counts(eps, threads)
+    nz = zindex.counts(eps, threads)
+
+    psi = _digamma_table(z.shape[0])
+    return (digamma(neighbors) - psi[nxz] - psi[nyz] + psi[nz]) / _LOG2
+
+
+def _series(series):
+    """
+    Convert a continuously-valued time series to an array, checking that it is
+    non-empty, finite and at most 2-D.
+    """
+    xs = np.ascontiguousarray(series, dtype=np.float64)
+    if xs.ndim == 0 or xs.size == 0:
+        raise ValueError("empty timeseries")
+    elif xs.ndim > 2:
+        raise ValueError("dimension greater than 2")
+    elif not np.all(np.isfinite(xs)):
+        raise ValueError("timeseries must be finite")
+    return xs
+
+
+def _condition_columns(zs, shape):
+    """
+    Convert one or a stack of conditioning time series, each of the given
+    *shape*, into a 2-D array with a column per time series.
+    """
+    ws = np.array(zs, dtype=np.float64)
+    if ws.shape == tuple(shape):
+        ws = ws.reshape((1,) + ws.shape)
+    elif ws.shape[1:] != tuple(shape) or ws.shape[0] == 0:
+        raise ValueError("the condition must have the same shape as the time series, or be a stack of them")
+    if not np.all(np.isfinite(ws)):
+        raise ValueError("timeseries must be finite")
+    return np.ascontiguousarray(ws.reshape(ws.shape[0], -1).T)
+
+
+def _check_neighbors(neighbors, n):
+    """
+    Check that there are more than *neighbors* samples, returning the number
+    of samples.
+    """
+    if neighbors < 1 or neighbors >= n:
+        raise ValueError("the number of neighbors must be positive and less than the number of samples")
+    return n
+
+
+def _digamma_table(n):
+    """
+    Tabulate :math:`\\psi(c + 1)` for the counts :math:`c = 0, \\ldots, n - 1`.
+    """
+    return digamma(np.arange(1, n + 1, dtype=np.float64))
+
+
+def _chunks(n, query, threads):
+    """
+    Apply *query* to the samples ``[start, stop)`` of each chunk of *n* samples,
+    concatenating the results.
+    """
+    bounds = [(start, min(n, start + CHUNK)) for start in range(0, n, CHUNK)]
+    if threads is None or threads == 1 or len(bounds) == 1:
+        return np.concatenate([query(a, b) for a, b in bounds])
+    elif threads < 1:
+        raise ValueError("the number of threads must be positive")
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(min(threads, cpu_count(), len(bounds))) as pool:
+        return np.concatenate(list(pool.map(lambda ab: query(*ab), bounds)))
+
+
+class _Index(object):
+    """
+    A neighbour index of samples in the maximum norm, each sample a row of a
+    2-D array. The index is a k-d tree if scipy is available, and otherwise
+    compares every pair of samples.
+    """
+
+    def __init__(self, points):
+        self.points = np.ascontiguousarray(points, dtype=np.float64)
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            self.tree = None
+        else:
+            self.tree = cKDTree(self.points, leafsize=16, balanced_tree=False, compact_nodes=False)
+
+    def kth_distances(self, k, threads=None):
+        """
+        Find the distance from each sample to its *k*-th nearest neighbour,
+        other than itself.
+        """
+        if self.tree is not None:
+            def query(a, b):
+                return self.tree.query(self.points[a:b], k=[k + 1], p=np.inf)[0][:, 0]
+        else:
+            def query(a, b):
+                return np.concatenate([np.partition(d, k, axis=1)[:, k] for d in self._distances(a, b)])
+        return _chunks(self.points.shape[0], query, threads)
+
+    def counts(self, radii, threads=None):
+        """
+        Count the samples strictly within the radius of each sample, other than
+        itself.
+        """
+        if self.tree is not None:
+            def query(a, b):
+                r = radii[a:b]
+                c = self.tree.query_ball_point(self.points[a:b], np.nextafter(r, 0), p=np.inf, return_length=True)
+                return np.where(r > 0, c - 1, 0)
+        else:
+            def query(a, b):
+                r = radii[a:b]
+                c = np.concatenate([np.count_nonzero(d < r[i:i + d.shape[0], np.newaxis], axis=1)
+                                    for i, d in zip(self._offsets(a, b), self._distances(a, b))])
+                return np.where(r > 0, c - 1, 0)
+        return _chunks(self.points.shape[0], query, threads)
+
+    def _offsets(self, a, b):
+        """
+        The offsets, relative to *a*, of the blocks of :py:meth:`_distances`.
+        """
+        return range(0, b - a, self._block())
+
+    def _block(self):
+        return max(1, BRUTE_BLOCK // self.points.shape[0])
+
+    def _distances(self, a, b):
+        """
+        Generate the distances from the samples ``[a, b)`` to every sample, a
+        block of rows at a time.
+        """
+        block = self._block()
+        for start in range(a, b, block):
+            stop = min(b, start + block)
+            d = np.zeros((stop - start, self.points.shape[0]))
+            for j in range(self.points.shape[1]):
+                np.maximum(d, np.abs(self.points[start:stop, j, np.newaxis] - self.points[:, j]), out=d)
+            yield d
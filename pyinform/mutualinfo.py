@@ -36,64 +36,371 @@ Examples
             0.22239242,  0.22239242,  0.22239242,  0.22239242,  0.22239242,
             0.22239242,  0.22239242,  0.22239242,  0.22239242,  0.22239242,
             0.22239242,  1.5849625 ,  1.5849625 ,  1.5849625 , -1.5849625 ])
+
+The mutual information between one time series and a delayed copy of the
+other can be computed over a range of delays in a single call:
+
+.. doctest:: mutual_info
+
+    >>> mutual_info(xs, ys, delay=[0, 1, 2, 3])
+    array([0.21417095, 0.13975501, 0.05574292, 0.01703622])
+
+The multivariate generalization, the multi-information or total correlation,
+is provided by :py:func:`multi_info` which accepts any number of time series:
+
+.. doctest:: mutual_info
+
+    >>> zs = [0,1,1,0,1,1,1,1,0,1,1,1,1,1,1,1,0,1,0,1]
+    >>> multi_info([xs, ys, zs])  # doctest: +ELLIPSIS
+    0.37353374935...
+
+It can also be computed over many subsets of the time series at once, in
+which case the entropy of each time series is only computed once:
+
+.. doctest:: mutual_info
+
+    >>> multi_info([xs, ys, zs], subsets=[[0, 1], [0, 2], [1, 2], [0, 1, 2]])
+    array([0.21417095, 0.05430832, 0.14365835, 0.37353375])
+
+If the mutual information between every pair of a collection of time series is
+needed, :py:func:`mutual_info_matrix` computes the entropy of each time series
+only once:
+
+.. doctest:: mutual_info
+
+    >>> mutual_info_matrix([xs, ys, zs])
+    array([[0.72192809, 0.21417095, 0.05430832],
+           [0.21417095, 0.81127812, 0.14365835],
+           [0.05430832, 0.14365835, 0.81127812]])
 """
 import numpy as np
 
-from ctypes import byref, c_int, c_ulong, c_double, POINTER
-from pyinform import _inform
+from ctypes import byref, c_int, c_ulong, c_double
+from pyinform import _histogram
+from pyinform._prototype import prototype, ERROR, SERIES, VALUES
 from pyinform.error import ErrorCode, error_guard
+from pyinform.instrument import probe
 
 
-def mutual_info(xs, ys, local=False):
+def mutual_info(xs, ys, local=False, b=None, delay=None):
     """
     Compute the (local) mutual information between two time series.
 
-    This function explicitly takes the logarithmic base *b* as an argument.
+    The mutual information is computed as :math:`H(Y) - H(Y|X)` directly from
+    the time series' buffers, so no copies of the time series are made beyond
+    any conversion to contiguous ``int32`` arrays.
+
+    If a *delay* :math:`d` is given, *xs* is lagged :math:`d` time steps behind
+    *ys* along the last axis, i.e. the result is that of
+    ``mutual_info(xs[..., :-d], ys[..., d:])``. Given a sequence of delays,
+    the average mutual information at each delay is returned as a lag
+    profile. The marginal histograms are then counted once and updated
+    incrementally from one delay to the next, and only the joint histogram is
+    counted anew for each delay.
 
     :param xs: a time series
     :type xs: a sequence or ``numpy.ndarray``
     :param ys: a time series
     :type ys: a sequence or ``numpy.ndarray``
     :param bool local: compute the local mutual information
-    :return: the local or average mutual information
+    :param b: the base of the time series, either one for both or a pair ``(bx, by)``; inferred from the data if ``None``
+    :type b: int or pair of ints
+    :param delay: the delay, or a sequence of delays, of *xs* relative to *ys*
+    :type delay: int or sequence of ints
+    :return: the local or average mutual information, or the lag profile
     :rtype: float or ``numpy.ndarray``
     :raises ValueError: if the time series have different shapes
+    :raises ValueError: if a delay leaves no time steps
+    :raises ValueError: if *local* is requested along with a sequence of delays
     :raises InformError: if an error occurs within the ``inform`` C call
     """
+    p = probe("mutual_info")
+
     us = np.ascontiguousarray(xs, dtype=np.int32)
     vs = np.ascontiguousarray(ys, dtype=np.int32)
+    p.converted(xs, us)
+    p.converted(ys, vs)
     if us.shape != vs.shape:
         raise ValueError("timeseries lengths do not match")
+    elif us.size == 0:
+        raise ValueError("empty timeseries")
 
-    series = np.ascontiguousarray([us.flatten(), vs.flatten()], dtype=np.int32)
+    if delay is not None:
+        delays = np.asarray(delay, dtype=np.int64)
+        if np.any(delays < 0) or np.any(delays >= us.shape[-1]):
+            raise ValueError("delay must be non-negative and less than the length of the time series")
+        elif delays.ndim == 0 and delay != 0:
+            m = us.shape[-1] - delay
+            us = np.ascontiguousarray(us[..., :m])
+            vs = np.ascontiguousarray(vs[..., delay:])
+        elif delays.ndim != 0 and local is True:
+            raise ValueError("the local mutual information cannot be computed over a sequence of delays")
+    p.phase("convert")
 
-    bx = max(2, np.amax(us) + 1)
-    by = max(2, np.amax(vs) + 1)
+    if b is None:
+        bx = max(2, np.amax(us) + 1)
+        by = max(2, np.amax(vs) + 1)
+    elif np.ndim(b) == 0:
+        bx, by = b, b
+    else:
+        bx, by = b
+    p.phase("base")
 
-    bs = np.ascontiguousarray([bx, by], dtype=np.int32)
+    if delay is not None and delays.ndim != 0:
+        mi = _lag_profile(us.reshape(-1, us.shape[-1]), vs.reshape(-1, vs.shape[-1]), bx, by, delays)
+        p.phase("kernel")
+        p.finish((us.size, vs.size), (bx, by))
+        return mi
 
-    seriesdata = series.ctypes.data_as(POINTER(c_int))
-    bsdata = bs.ctypes.data_as(POINTER(c_int))
-    l, n = series.shape
+    n = us.size
+    if n < 2:
+        # The marginal entropy kernel needs at least two observations, and
+        # such short series cost nothing to stack for the general kernel.
+        mi = multi_info([us.ravel(), vs.ravel()], local=local, b=[bx, by])
+        return mi.reshape(us.shape) if local is True else mi
 
     e = ErrorCode(0)
 
     if local is True:
         mi = np.empty(us.shape, dtype=np.float64)
-        out = mi.ctypes.data_as(POINTER(c_double))
-        _local_mutual_info(seriesdata, c_ulong(l), c_ulong(n), bsdata, out, byref(e))
+        ce = np.empty(us.shape, dtype=np.float64)
+        p.allocated(mi)
+        p.allocated(ce)
+        p.phase("alloc")
+        _local_conditional_entropy(us, vs, n, c_int(bx), c_int(by), ce, byref(e))
+        error_guard(e)
+        _local_marginal_entropy(vs, 1, n, c_int(by), 1, mi, byref(e))
+        error_guard(e)
+        mi -= ce
+    else:
+        ce = _conditional_entropy(us, vs, n, c_int(bx), c_int(by), byref(e))
+        error_guard(e)
+        mi = _marginal_entropy(vs, 1, n, c_int(by), 1, byref(e)) - ce
+        error_guard(e)
+
+    p.phase("kernel")
+    p.finish((us.size, vs.size), (bx, by))
+
+    return mi
+
+
+def _lag_profile(xs, ys, bx, by, delays):
+    """
+    Compute the mutual information between the rows of *xs* and *ys* with
+    *xs* lagged by each of the *delays*.
+    """
+    _histogram.check_states(xs, bx)
+    _histogram.check_states(ys, by)
+
+    n, m = xs.shape
+    # Lagging xs by d drops the last d time steps of xs and the first d of ys,
+    # and the entropies are combined as sums of c*log2(c) over the histograms.
+    s = -_histogram.suffix_xlog2x_sums(xs[:, ::-1], delays) - _histogram.suffix_xlog2x_sums(ys, delays)
+    for i, d in enumerate(delays):
+        codes, size = _histogram.join(xs[:, :m - d], bx, ys[:, d:], by)
+        s[i] += _histogram.xlog2x_sum(_histogram.counts(codes, size))
+    total = n * (m - delays)
+    return np.log2(total) + s / total
+
+
+def multi_info(series, local=False, b=None, subsets=None):
+    """
+    Compute the (local) multivariate mutual information, also known as the
+    total correlation or multi-information, of *l* time series
+
+    .. math::
+
+        I(X_1; \\ldots; X_l) = \\sum_{i=1}^l H(X_i) - H(X_1, \\ldots, X_l).
+
+    The time series may be provided as a sequence, or as an array whose first
+    axis indexes the series. An ``int32``, C-contiguous array is handed to the
+    ``inform`` C library without being copied.
+
+    If *subsets* is provided, the multi-information of each subset of the
+    series (given as a sequence of indices) is computed instead. Each
+    marginal entropy is computed once and shared by every subset containing
+    that series.
+
+    :param series: the time series
+    :type series: sequence or ``numpy.ndarray``
+    :param bool local: compute the local multi-information
+    :param b: the base of the time series, either one for all or one per series; inferred from the data if ``None``
+    :type b: int or sequence of ints
+    :param subsets: the subsets of the time series over which to compute the multi-information
+    :type subsets: sequence of sequences of ints
+    :return: the local or average multi-information, or one value per subset
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if fewer than two dimensions are provided
+    :raises ValueError: if the time series are empty
+    :raises ValueError: if the number of bases does not match the number of time series
+    :raises ValueError: if *local* is requested along with *subsets*
+    :raises ValueError: if a subset contains states outside of its base
+    :raises InformError: if an error occurs within the ``inform`` C call
+    """
+    p = probe("multi_info")
+
+    xs = np.ascontiguousarray(series, dtype=np.int32)
+    p.converted(series, xs)
+    if xs.ndim < 2:
+        raise ValueError("must provide a sequence of time series")
+    elif xs.size == 0:
+        raise ValueError("empty timeseries")
+
+    nvars = xs.shape[0]
+    rows = xs.reshape(nvars, -1)
+    n = rows.shape[1]
+    p.phase("convert")
+
+    if b is None:
+        bs = np.maximum(2, np.amax(rows, axis=1) + 1).astype(np.int32)
+    elif np.ndim(b) == 0:
+        bs = np.full(nvars, b, dtype=np.int32)
     else:
-        mi = _mutual_info(seriesdata, c_ulong(l), c_ulong(n), bsdata, byref(e))
+        bs = np.ascontiguousarray(b, dtype=np.int32)
+        if bs.shape != (nvars,):
+            raise ValueError("the number of bases does not match the number of time series")
+    p.phase("base")
+
+    if subsets is not None:
+        if local is True:
+            raise ValueError("the local multi-information cannot be computed over subsets")
+        mi = _subset_multi_info(rows, bs, subsets)
+        p.phase("kernel")
+        p.finish((n,) * nvars, bs)
+        return mi
+
+    e = ErrorCode(0)
+
+    if local is True:
+        mi = np.empty(xs.shape[1:], dtype=np.float64)
+        p.allocated(mi)
+        p.phase("alloc")
+        _local_mutual_info(rows, nvars, n, bs, mi, byref(e))
+    else:
+        mi = _mutual_info(rows, nvars, n, bs, byref(e))
 
     error_guard(e)
+    p.phase("kernel")
+    p.finish((n,) * nvars, bs)
 
     return mi
 
 
-_mutual_info = _inform.inform_mutual_info
-_mutual_info.argtypes = [POINTER(c_int), c_ulong, c_ulong, POINTER(c_int), POINTER(c_int)]
-_mutual_info.restype = c_double
+def _subset_multi_info(rows, bs, subsets):
+    """
+    Compute the multi-information of each subset of the *rows*, computing each
+    marginal entropy at most once.
+    """
+    marginals = {}
+    mi = np.empty(len(subsets), dtype=np.float64)
+    for j, subset in enumerate(subsets):
+        subset = [range(len(rows))[i] for i in subset]
+        for i in subset:
+            if i not in marginals:
+                _histogram.check_states(rows[i], bs[i])
+                marginals[i] = _histogram.entropy(_histogram.counts(rows[i], bs[i]))
+        codes, size = _histogram.encode(rows[subset], bs[subset])
+        mi[j] = sum(marginals[i] for i in subset) - _histogram.entropy(_histogram.counts(codes, size))
+    return mi
+
+
+def mutual_info_matrix(data, axis=0, b=None, processes=None):
+    """
+    Compute the mutual information between every pair of a collection of time
+    series.
+
+    The entropy of each time series is computed once, and only the joint
+    histogram is counted for each pair, so this is considerably faster than
+    calling :py:func:`mutual_info` for each pair. The diagonal of the result
+    holds the entropy of each time series.
+
+    For large collections the rows of the matrix can be computed in parallel
+    by a pool of *processes*.
+
+    :param data: the time series
+    :type data: 2-D sequence or ``numpy.ndarray``
+    :param int axis: the axis of *data* which indexes the time series
+    :param b: the base of the time series, either one for all or one per series; inferred from the data if ``None``
+    :type b: int or sequence of ints
+    :param int processes: the number of worker processes; computed serially if ``None``
+    :return: the mutual information matrix
+    :rtype: ``numpy.ndarray``
+    :raises ValueError: if *data* is not 2-D or is empty
+    :raises ValueError: if the number of bases does not match the number of time series
+    :raises ValueError: if a time series has states outside of its base
+    """
+    xs = np.asarray(data)
+    if xs.ndim != 2:
+        raise ValueError("data must be 2-D")
+    elif xs.size == 0:
+        raise ValueError("empty timeseries")
+
+    xs = np.ascontiguousarray(np.moveaxis(xs, axis, 0), dtype=np.int32)
+    nvars = xs.shape[0]
+
+    if b is None:
+        bs = np.maximum(2, np.amax(xs, axis=1) + 1)
+    elif np.ndim(b) == 0:
+        bs = np.full(nvars, b, dtype=np.int64)
+    else:
+        bs = np.asarray(b, dtype=np.int64)
+        if bs.shape != (nvars,):
+            raise ValueError("the number of bases does not match the number of time series")
+
+    if np.amin(xs) < 0 or np.any(np.amax(xs, axis=1) >= bs):
+        raise ValueError("time series has states outside of the base")
+
+    bmax = int(np.amax(bs))
+    marginals = _histogram.row_entropies(xs, bmax)
+
+    joint = np.zeros((nvars, nvars), dtype=np.float64)
+    if processes is None:
+        for i in range(nvars):
+            joint[i, i + 1:] = _joint_entropies(xs, i, bmax)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(xs, bmax)) as pool:
+            for i, h in enumerate(pool.map(_worker_joint_entropies, range(nvars), chunksize=max(1, nvars // (4 * processes)))):
+                joint[i, i + 1:] = h
+
+    mi = marginals[:, np.newaxis] + marginals[np.newaxis, :] - (joint + joint.T)
+    mi[np.diag_indices(nvars)] = marginals
+    return mi
+
+
+def _joint_entropies(xs, i, bmax):
+    """
+    Compute the joint entropy of the *i*-th time series with each subsequent
+    time series.
+    """
+    codes = xs[i].astype(np.int64) * bmax + xs[i + 1:]
+    return _histogram.row_entropies(codes, bmax * bmax)
+
+
+_worker_data = None
+
+
+def _init_worker(xs, bmax):
+    global _worker_data
+    _worker_data = (xs, bmax)
+
+
+def _worker_joint_entropies(i):
+    xs, bmax = _worker_data
+    return _joint_entropies(xs, i, bmax)
+
+
+_mutual_info = prototype("inform_mutual_info", c_double, [SERIES, c_ulong, c_ulong, SERIES, ERROR])
+
+_local_mutual_info = prototype("inform_local_mutual_info", None, [SERIES, c_ulong, c_ulong, SERIES, VALUES, ERROR])
+
+_marginal_entropy = prototype("inform_block_entropy", c_double, [SERIES, c_ulong, c_ulong, c_int, c_ulong, ERROR])
+
+_local_marginal_entropy = prototype("inform_local_block_entropy", None,
+                                    [SERIES, c_ulong, c_ulong, c_int, c_ulong, VALUES, ERROR])
+
+_conditional_entropy = prototype("inform_conditional_entropy", c_double,
+                                 [SERIES, SERIES, c_ulong, c_int, c_int, ERROR])
 
-_local_mutual_info = _inform.inform_local_mutual_info
-_local_mutual_info.argtypes = [POINTER(c_int), c_ulong, c_ulong, POINTER(c_int), POINTER(c_double), POINTER(c_int)]
-_local_mutual_info.restype = c_double
+_local_conditional_entropy = prototype("inform_local_conditional_entropy", None,
+                                       [SERIES, SERIES, c_ulong, c_int, c_int, VALUES, ERROR])
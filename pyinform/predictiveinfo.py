@@ -0,0 +1,244 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+The predictive information [Bialek2001]_ is the mutual information between the
+past and the future of a time series, i.e. between the :math:`k_p`-block
+leading up to a time step and the :math:`k_f`-block which follows it,
+
+.. math::
+
+    P_X(k_p, k_f) = \\langle p_{X,i}(k_p, k_f) \\rangle_i
+        = \\left\\langle \\log_2 \\frac{p(x^{(k_p)}_i, x^{(k_f)+}_{i+1})}{p(x^{(k_p)}_i)p(x^{(k_f)+}_{i+1})} \\right\\rangle_i,
+
+where :math:`x^{(k_f)+}_{i+1} = \\{x_{i+1}, \\ldots, x_{i+k_f}\\}` is the
+future :math:`k_f`-block. The excess entropy [Crutchfield2003]_ is the
+predictive information with pasts and futures of equal length,
+:math:`E_X(k) = P_X(k, k)`, and in the limit :math:`k \\rightarrow \\infty`
+measures the total amount of information the past of a process carries about
+its future.
+
+The joint state of each past and future is itself a block of
+:math:`k_p + k_f` states, so the joint histogram of every pair of block lengths
+with the same total is counted once, and the histograms of the pasts and
+futures are those of the shorter blocks over a prefix or a suffix of the time
+series. Given sequences of past and future block lengths,
+:py:func:`predictive_info` computes the whole grid of values by encoding each
+block length once.
+
+Examples
+--------
+
+.. doctest:: predictive_info
+
+    >>> xs = [0,0,1,1,1,1,0,0,0,1,0,0,1,1,0,0,0,1]
+    >>> predictive_info(xs, 2, 1)
+    0.23345859334434937
+    >>> predictive_info(xs, [1, 2], [1, 2, 3])
+    array([[0.02067296, 0.26309688, 0.36280663],
+           [0.23345859, 0.5576352 , 1.16310135]])
+    >>> excess_entropy(xs, 2)
+    0.557635198440019
+    >>> excess_entropy(xs, [1, 2, 3])
+    array([0.02067296, 0.5576352 , 1.83392722])
+"""
+
+import numpy as np
+
+from pyinform import _histogram
+from pyinform.instrument import probe
+
+
+def predictive_info(series, k_past, k_future, local=False, b=None):
+    """
+    Compute the average or local predictive information of a time series with
+    past block length *k_past* and future block length *k_future*.
+
+    Given sequences of past and future block lengths, the average predictive
+    information of every pair is returned, with the past block lengths along
+    the first axis.
+
+    :param series: the time series
+    :type series: sequence or ``numpy.ndarray``
+    :param k_past: the past block length, or a sequence of them
+    :type k_past: int or sequence of ints
+    :param k_future: the future block length, or a sequence of them
+    :type k_future: int or sequence of ints
+    :param bool local: compute the local predictive information
+    :param int b: the base of the time series, inferred from the data if ``None``
+    :returns: the average or local predictive information, or the grid of averages
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if the time series has no initial conditions
+    :raises ValueError: if the time series is greater than 2-D
+    :raises ValueError: if a block length is not positive, or the blocks are longer than the time series
+    :raises ValueError: if *local* is requested along with sequences of block lengths
+    :raises ValueError: if the time series has states outside of the base
+    """
+    p = probe("predictive_info")
+
+    xs, b = _convert(series, b, p)
+    kp = np.asarray(k_past, dtype=np.int64)
+    kf = np.asarray(k_future, dtype=np.int64)
+    _check_lengths(kp, kf, xs.shape[1])
+    if local is True and (kp.ndim != 0 or kf.ndim != 0):
+        raise ValueError("the local predictive information cannot be computed over a grid of block lengths")
+
+    if local is True:
+        pi = _local_predictive_info(xs, b, int(kp), int(kf))
+        p.allocated(pi)
+    else:
+        pairs = [(i, j) for i in np.ravel(kp) for j in np.ravel(kf)]
+        pi = _predictive_info(xs, b, pairs).reshape(kp.shape + kf.shape)
+        if pi.ndim == 0:
+            pi = float(pi)
+    p.phase("kernel")
+    p.finish((xs.size,), (b,), (k_past, k_future))
+
+    return pi
+
+
+def excess_entropy(series, k, local=False, b=None):
+    """
+    Compute the average or local excess entropy of a time series with block
+    length *k*, i.e. the predictive information with past and future block
+    lengths of *k*.
+
+    Given a sequence of block lengths, the average excess entropy at each is
+    returned.
+
+    :param series: the time series
+    :type series: sequence or ``numpy.ndarray``
+    :param k: the block length, or a sequence of them
+    :type k: int or sequence of ints
+    :param bool local: compute the local excess entropy
+    :param int b: the base of the time series, inferred from the data if ``None``
+    :returns: the average or local excess entropy
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if the time series has no initial conditions
+    :raises ValueError: if the time series is greater than 2-D
+    :raises ValueError: if a block length is not positive, or the blocks are longer than the time series
+    :raises ValueError: if *local* is requested along with a sequence of block lengths
+    :raises ValueError: if the time series has states outside of the base
+    """
+    p = probe("excess_entropy")
+
+    xs, b = _convert(series, b, p)
+    ks = np.asarray(k, dtype=np.int64)
+    _check_lengths(ks, ks, xs.shape[1])
+    if local is True and ks.ndim != 0:
+        raise ValueError("the local excess entropy cannot be computed over a sequence of block lengths")
+
+    if local is True:
+        ee = _local_predictive_info(xs, b, int(ks), int(ks))
+        p.allocated(ee)
+    else:
+        ee = _predictive_info(xs, b, [(i, i) for i in np.ravel(ks)]).reshape(ks.shape)
+        if ee.ndim == 0:
+            ee = float(ee)
+    p.phase("kernel")
+    p.finish((xs.size,), (b,), k)
+
+    return ee
+
+
+def _convert(series, b, p):
+    """
+    Convert a time series into a 2-D array of initial conditions, inferring its
+    base if need be.
+    """
+    xs = np.ascontiguousarray(series, np.int32)
+    p.converted(series, xs)
+
+    if xs.ndim == 0 or xs.size == 0:
+        raise ValueError("empty timeseries")
+    elif xs.ndim > 2:
+        raise ValueError("dimension greater than 2")
+    p.phase("convert")
+
+    if b is None:
+        b = max(2, np.amax(xs) + 1)
+    _histogram.check_states(xs, b)
+    p.phase("base")
+
+    return xs.reshape(-1, xs.shape[-1]), int(b)
+
+
+def _check_lengths(kp, kf, m):
+    """
+    Check that every pair of past and future block lengths fits within a time
+    series of length *m*.
+    """
+    if kp.size == 0 or kf.size == 0:
+        raise ValueError("no block lengths given")
+    elif np.amin(kp) < 1 or np.amin(kf) < 1:
+        raise ValueError("block lengths must be positive")
+    elif np.amax(kp) + np.amax(kf) > m:
+        raise ValueError("the past and future blocks must fit within the time series")
+
+
+def _blocks(xs, b, kmax):
+    """
+    Encode the blocks of every length up to *kmax* of the time series *xs*,
+    each block length extending the codes of the last by one state.
+    """
+    codes, size = xs.astype(np.int64), b
+    blocks = {1: (codes, size)}
+    for k in range(2, kmax + 1):
+        codes, size = _histogram.join(codes[:, :-1], size, xs[:, k - 1:], b)
+        blocks[k] = (codes, size)
+    return blocks
+
+
+def _predictive_info(xs, b, pairs):
+    """
+    Compute the predictive information of each (past, future) pair of block
+    lengths, counting the histogram of each block length once.
+
+    For a pair :math:`(k_p, k_f)`, the pasts are the first and the futures the
+    last :math:`m - k_p - k_f + 1` of the blocks of each length, and the joint
+    states are every block of length :math:`k_p + k_f`.
+    """
+    n, m = xs.shape
+    blocks = _blocks(xs, b, max(kp + kf for kp, kf in pairs))
+
+    joint = {}
+    for kp, kf in pairs:
+        if kp + kf not in joint:
+            codes, size = blocks[kp + kf]
+            joint[kp + kf] = _histogram.xlog2x_sum(_histogram.counts(codes, size))
+
+    # The sums of the pasts (prefixes) and futures (suffixes) of each block
+    # length, each counted once and then updated from one pair to the next
+    past, future = {}, {}
+    for k in set(kp for kp, _ in pairs):
+        kfs = sorted(set(kf for kp, kf in pairs if kp == k))
+        codes, _ = blocks[k]
+        past.update(zip(((k, kf) for kf in kfs), _histogram.suffix_xlog2x_sums(codes[:, ::-1], kfs)))
+    for k in set(kf for _, kf in pairs):
+        kps = sorted(set(kp for kp, kf in pairs if kf == k))
+        codes, _ = blocks[k]
+        future.update(zip(((kp, k) for kp in kps), _histogram.suffix_xlog2x_sums(codes, kps)))
+
+    pi = np.empty(len(pairs), dtype=np.float64)
+    for i, (kp, kf) in enumerate(pairs):
+        q = n * (m - kp - kf + 1)
+        pi[i] = np.log2(q) - (past[kp, kf] + future[kp, kf] - joint[kp + kf]) / q
+    return pi
+
+
+def _local_predictive_info(xs, b, kp, kf):
+    """
+    Compute the local predictive information of the time series *xs* with past
+    and future block lengths *kp* and *kf*.
+    """
+    n, m = xs.shape
+    q = m - kp - kf + 1
+    blocks = _blocks(xs, b, max(kp, kf))
+    (past, psize), (future, fsize) = blocks[kp], blocks[kf]
+    past = np.ascontiguousarray(past[:, :q])
+    future = np.ascontiguousarray(future[:, kp:])
+    joint, jsize = _histogram.join(past, psize, future, fsize)
+
+    num = _histogram.local_counts(joint, jsize) * float(n * q)
+    den = _histogram.local_counts(past, psize) * _histogram.local_counts(future, fsize).astype(np.float64)
+    return np.log2(num / den)
@@ -51,12 +51,13 @@ Examples
 
 import numpy as np
 
-from ctypes import byref, c_int, c_ulong, c_double, POINTER
-from pyinform import _inform
+from ctypes import byref, c_int, c_ulong, c_double
+from pyinform._prototype import prototype, ERROR, SERIES, VALUES
 from pyinform.error import ErrorCode, error_guard
+from pyinform.instrument import probe
 
 
-def relative_entropy(xs, ys, local=False):
+def relative_entropy(xs, ys, local=False, b=None):
     """
     Compute the local or global relative entropy between two time series
     treating each as observations from a distribution.
@@ -66,40 +67,48 @@ def relative_entropy(xs, ys, local=False):
     :param ys: the time series sampled from the prior distribution
     :type ys: a sequence or ``numpy.ndarray``
     :param bool local: compute the local relative entropy
+    :param int b: the base of the time series, inferred from the data if ``None``
     :return: the local or global relative entropy
     :rtype: float or ``numpy.ndarray``
     :raises ValueError: if the time series have different shapes
     :raises InformError: if an error occurs within the ``inform`` C call
     """
+    p = probe("relative_entropy")
+
     us = np.ascontiguousarray(xs, dtype=np.int32)
     vs = np.ascontiguousarray(ys, dtype=np.int32)
+    p.converted(xs, us)
+    p.converted(ys, vs)
     if us.shape != vs.shape:
         raise ValueError("timeseries lengths do not match")
+    elif us.size == 0:
+        raise ValueError("empty timeseries")
+    p.phase("convert")
 
-    b = max(2, np.amax(us) + 1, np.amax(vs) + 1)
+    if b is None:
+        b = max(2, np.amax(us) + 1, np.amax(vs) + 1)
+    p.phase("base")
 
-    xdata = us.ctypes.data_as(POINTER(c_int))
-    ydata = vs.ctypes.data_as(POINTER(c_int))
     n = us.size
 
     e = ErrorCode(0)
 
     if local is True:
         re = np.empty(b, dtype=np.float64)
-        out = re.ctypes.data_as(POINTER(c_double))
-        _local_relative_entropy(xdata, ydata, c_ulong(n), c_int(b), out, byref(e))
+        p.allocated(re)
+        p.phase("alloc")
+        _local_relative_entropy(us, vs, n, c_int(b), re, byref(e))
     else:
-        re = _relative_entropy(xdata, ydata, c_ulong(n), c_int(b), byref(e))
+        re = _relative_entropy(us, vs, n, c_int(b), byref(e))
 
     error_guard(e)
+    p.phase("kernel")
+    p.finish((us.size, vs.size), (b, b))
 
     return re
 
 
-_relative_entropy = _inform.inform_relative_entropy
-_relative_entropy.argtypes = [POINTER(c_int), POINTER(c_int), c_ulong, c_int, POINTER(c_int)]
-_relative_entropy.restype = c_double
+_relative_entropy = prototype("inform_relative_entropy", c_double, [SERIES, SERIES, c_ulong, c_int, ERROR])
 
-_local_relative_entropy = _inform.inform_local_relative_entropy
-_local_relative_entropy.argtypes = [POINTER(c_int), POINTER(c_int), c_ulong, c_int, POINTER(c_double), POINTER(c_int)]
-_local_relative_entropy.restype = POINTER(c_double)
+_local_relative_entropy = prototype("inform_local_relative_entropy", None,
+                                    [SERIES, SERIES, c_ulong, c_int, VALUES, ERROR])
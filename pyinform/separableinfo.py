@@ -0,0 +1,186 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Separable information [Lizier2010]_ quantifies the information gained about the
+next state of a target by considering its own past and each of its sources'
+pasts separately. It is the sum of the active information of the target and
+the apparent transfer entropy from each of the sources,
+
+.. math::
+
+    s_{X,i}(k) = a_{X,i}(k) + \\sum_{Y} t_{Y \\rightarrow X,i}(k)
+    \\quad \\textrm{and} \\quad
+    S_X(k) = \\langle s_{X,i}(k) \\rangle_i.
+
+A negative value indicates that the sources interact non-trivially in
+determining the target's next state, i.e. that the target's dynamics involve
+information modification.
+
+The target's :math:`k`-history and its joint state with the next state are
+encoded and counted once, and shared by every source. The histograms of the
+sources are then counted all together, a block of sources at a time, and
+optionally by a pool of *processes*.
+
+Examples
+--------
+
+.. doctest:: separable_info
+
+    >>> xs = [0,1,1,1,1,0,0,0,0]
+    >>> ys = [0,0,1,1,1,1,0,0,0]
+    >>> separable_info(xs, ys, k=2)
+    0.9852281360342516
+    >>> separable_info(xs, ys, k=2, local=True)
+    array([[0.80735492, 0.80735492, 0.80735492, 0.80735492, 1.22239242,
+            1.22239242, 1.22239242]])
+
+Any number of sources can be given, stacked along the first axis:
+
+.. doctest:: separable_info
+
+    >>> ws = [0,1,0,1,0,1,0,1,0]
+    >>> separable_info([xs, ws], ys, k=2)
+    1.09306920777189
+"""
+
+import numpy as np
+
+from pyinform import _histogram
+from pyinform.instrument import probe
+
+
+def separable_info(sources, target, k, local=False, b=None, processes=None):
+    """
+    Compute the average or local separable information of a target time series
+    with history length *k*, given one or many source time series.
+
+    The *sources* are either a single time series, with the same shape as the
+    *target*, or a stack of such time series (one more dimension).
+
+    :param sources: the source time series
+    :type sources: sequence or ``numpy.ndarray``
+    :param target: the target time series
+    :type target: sequence or ``numpy.ndarray``
+    :param int k: the history length
+    :param bool local: compute the local separable information
+    :param int b: the base of the time series, inferred from the data if ``None``
+    :param int processes: the number of worker processes counting the sources; computed serially if ``None``
+    :returns: the average or local separable information
+    :rtype: float or ``numpy.ndarray``
+    :raises ValueError: if the time series are empty or the target is greater than 2-D
+    :raises ValueError: if the sources do not have the shape of the target
+    :raises ValueError: if *k* is not positive or not less than the length of the time series
+    :raises ValueError: if a time series has states outside of the base
+    """
+    p = probe("separable_info")
+
+    xs = np.ascontiguousarray(target, np.int32)
+    ys = np.ascontiguousarray(sources, np.int32)
+    p.converted(target, xs)
+    p.converted(sources, ys)
+
+    if xs.ndim == 0 or xs.size == 0 or ys.size == 0:
+        raise ValueError("empty timeseries")
+    elif xs.ndim > 2:
+        raise ValueError("dimension greater than 2")
+    elif ys.shape == xs.shape:
+        ys = ys.reshape((1,) + xs.shape)
+    elif ys.shape[1:] != xs.shape:
+        raise ValueError("the sources must have the same shape as the target, or be a stack of them")
+    p.phase("convert")
+
+    if b is None:
+        b = max(2, np.amax(xs) + 1, np.amax(ys) + 1)
+    _histogram.check_states(xs, b)
+    _histogram.check_states(ys, b)
+    p.phase("base")
+
+    xs = xs.reshape(-1, xs.shape[-1])
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the history length must be positive and less than the length of the time series")
+
+    q = m - k
+    ys = ys.reshape(ys.shape[0], n, m)[:, :, k - 1:m - 1].reshape(ys.shape[0], n * q)
+    history, hsize = _histogram.encode([xs[:, i:i + q] for i in range(k)], [b] * k)
+    history, future = history.ravel(), xs[:, k:].ravel()
+    joint, jsize = _histogram.join(history, hsize, future, b)
+
+    # The histograms of the target, shared by every source
+    if local is True:
+        h = _histogram.local_counts(history, hsize).astype(np.float64)
+        hf = _histogram.local_counts(joint, jsize).astype(np.float64)
+        f = _histogram.local_counts(future, b)
+        si = np.log2(hf * float(n * q) / (h * f))
+    else:
+        h = _histogram.xlog2x_sum(_histogram.counts(history, hsize))
+        hf = _histogram.xlog2x_sum(_histogram.counts(joint, jsize))
+        f = _histogram.xlog2x_sum(_histogram.counts(future, b))
+        si = np.log2(n * q) - (h + f - hf) / (n * q)
+    p.phase("target")
+
+    si = si + _sources(ys, (history, hsize, future, int(b), h, hf), local, processes)
+    if local is True:
+        si = si.reshape(n, q)
+        p.allocated(si)
+    else:
+        si = float(si)
+    p.phase("kernel")
+    p.finish((xs.size, ys.size), (b,), k)
+
+    return si
+
+
+def _sources(ys, target_terms, local, processes):
+    """
+    Compute the sum of the (local) apparent transfer entropies from each row of
+    *ys*, the sources aligned with the target's histories, a block of sources
+    at a time.
+    """
+    l, q = ys.shape
+    step = max(1, _histogram.CHUNK_SIZE // q)
+    if processes is not None:
+        step = min(step, -(-l // (4 * processes)))
+    bounds = [(start, min(l, start + step)) for start in range(0, l, step)]
+
+    if processes is None or len(bounds) == 1:
+        return sum(_source_terms(ys[start:stop], target_terms, local) for start, stop in bounds)
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(ys, target_terms, local)) as pool:
+        return sum(pool.map(_worker_source_terms, bounds))
+
+
+def _source_terms(ys, target_terms, local):
+    """
+    Compute the sum of the (local) apparent transfer entropies from the rows of
+    *ys*, counting the histograms of every source together. The *target_terms*
+    hold the target's histories and next states, and the local counts or
+    :py:func:`~pyinform._histogram.xlog2x_sum` of their histograms.
+    """
+    history, hsize, future, b, h, hf = target_terms
+    s, ssize = _histogram.join(history, hsize, ys, b)
+    sf, sfsize = _histogram.join(s, ssize, future, b)
+
+    if local is True:
+        num = _histogram.row_local_counts(sf, sfsize) * h
+        den = _histogram.row_local_counts(s, ssize) * hf
+        return np.sum(np.log2(num / den), axis=0)
+
+    te = h - hf - _histogram.row_xlog2x_sums(s, ssize) + _histogram.row_xlog2x_sums(sf, sfsize)
+    return float(np.sum(te)) / history.size
+
+
+_worker_data = None
+
+
+def _init_worker(ys, target_terms, local):
+    global _worker_data
+    _worker_data = (ys, target_terms, local)
+
+
+def _worker_source_terms(bounds):
+    ys, target_terms, local = _worker_data
+    start, stop = bounds
+    return _source_terms(ys[start:stop], target_terms, local)
@@ -1,11 +1,13 @@
 # Copyright 2016-2019 Douglas G. Moore. All rights reserved.
 # Use of this source code is governed by a MIT
 # license that can be found in the LICENSE file.
+import numpy as np
+
 from ctypes import c_double, c_void_p
-from pyinform import _inform
+from pyinform import _inform, _estimators
 
 
-def entropy(p, b=2.0):
+def entropy(p, b=2.0, estimator="plugin"):
     """
     Compute the base-*b* shannon entropy of the distribution *p*.
 
@@ -35,15 +37,53 @@ def entropy(p, b=2.0):
         >>> shannon.entropy(d, b=3)
         0.579380164285695
 
+    The entropy computed from the distribution's frequencies, the plug-in
+    estimate, underestimates the entropy of the process from which the
+    observations were drawn when there are few observations per event. A
+    bias-corrected *estimator* can be chosen instead, computed from the same
+    counts:
+
+    ``"miller-madow"``
+        adds :math:`(m - 1)/2N` nats, where :math:`m` is the number of events
+        observed and :math:`N` the number of observations ([Miller1955]_);
+
+    ``"jackknife"``
+        the jackknife estimate, with each leave-one-out entropy updated from
+        the counts rather than recomputed ([Efron1981]_);
+
+    ``"chao-shen"``
+        the coverage-adjusted estimate of [Chao2003]_;
+
+    ``"nsb"``
+        the Bayesian estimate of [Nemenman2002]_, which takes the support of
+        the distribution to be the full set of possible events.
+
+    .. doctest:: shannon
+
+        >>> d = Dist([3,1,0,1])
+        >>> shannon.entropy(d)  # doctest: +ELLIPSIS
+        1.370950594454...
+        >>> shannon.entropy(d, estimator="miller-madow")  # doctest: +ELLIPSIS
+        1.659489602632...
+
     See [Shannon1948a]_ for more details.
 
     :param p: the distribution
     :type p: :py:class:`pyinform.dist.Dist`
     :param float b: the logarithmic base
+    :param str estimator: the entropy estimator, one of ``"plugin"``, ``"miller-madow"``, ``"jackknife"``, ``"chao-shen"`` or ``"nsb"``
     :return: the shannon entropy of the distribution
     :rtype: float
+    :raises ValueError: if the estimator is unknown
+    :raises ValueError: if the distribution is invalid and a bias-corrected estimator is requested
     """
-    return _entropy(p._dist, c_double(b))
+    if estimator == "plugin":
+        return _entropy(p._dist, c_double(b))
+    _estimators.check(estimator)
+    if not p.valid():
+        raise ValueError("the distribution is invalid")
+    counts = np.rint(p.dump() * p.counts())
+    return _estimators.entropy(counts, estimator, size=len(p)) / np.log2(b)
 
 
 def mutual_info(p_xy, p_x, p_y, b=2.0):
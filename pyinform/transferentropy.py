@@ -135,20 +135,89 @@ Two initial conditions, two background processes
              0.       ,  1.       ],
            [ 0.       ,  0.5849625,  1.       ,  0.5849625,  0.       ,
              1.       ,  0.       ]])
+
+Delayed interactions
+^^^^^^^^^^^^^^^^^^^^
+
+When the delay of the interaction is unknown, the transfer entropy can be
+computed over a range of delays of the source relative to the target in a
+single call. Here the target copies the source two time steps later, which
+appears at a delay of 1 as the source state :math:`x_i` is already one time
+step behind the target's next state :math:`y_{i+1}`:
+
+.. doctest:: transfer_entropy
+
+    >>> xs = [0,1,1,0,1,0,0,1,1,1,0,1,0,0,0,1,1,0,1,0]
+    >>> ys = [0,0,0,1,1,0,1,0,0,1,1,1,0,1,0,0,0,1,1,0]
+    >>> transfer_entropy(xs, ys, k=1, delay=range(4))
+    array([0.04314837, 0.99107606, 0.        , 0.06009553])
+
+Embedded histories
+^^^^^^^^^^^^^^^^^^
+
+A source may only be informative when several of its past states are taken
+together. Here the target's next state is the exclusive-or of the last two
+states of the source, which is all but invisible unless the source is
+embedded with a history length of :math:`l = 2`:
+
+.. doctest:: transfer_entropy
+
+    >>> xs = [0,1,1,0,1,0,0,1,1,1,0,1,0,0,0,1,1,0,1,0]
+    >>> ys = [0,0,1,0,1,1,1,0,1,0,0,1,1,1,0,0,1,0,1,1]
+    >>> transfer_entropy(xs, ys, k=1)  # doctest: +ELLIPSIS
+    0.008673528230...
+    >>> transfer_entropy(xs, ys, k=1, l=2)  # doctest: +ELLIPSIS
+    0.916123610870...
+
+The embeddings may also be spaced more than one time step apart via
+*tau_source* and *tau_target*.
 """
 import numpy as np
 
-from ctypes import byref, c_int, c_ulong, c_double, POINTER
-from pyinform import _inform
+from ctypes import byref, c_int, c_ulong, c_double
+from pyinform import _histogram
+from pyinform._prototype import prototype, ERROR, OPTIONAL_SERIES, SERIES, VALUES
 from pyinform.error import ErrorCode, error_guard
+from pyinform.instrument import probe
 
 
-def transfer_entropy(source, target, k, condition=None, local=False):
+def transfer_entropy(source, target, k, condition=None, local=False, b=None, delay=None,
+                     l=1, tau_source=1, tau_target=1, per_trial=False, ensemble=False):  # noqa: E741
     """
     Compute the local or average transfer entropy from one time series to
     another with target history length *k*. Optionally, time series can be
     provided against which to *condition*.
 
+    If a *delay* :math:`d` is given, the source is lagged :math:`d` time steps
+    behind the target, i.e. the result is that of
+    ``transfer_entropy(source[..., :-d], target[..., d:], k)``. The conditions
+    are aligned with the target. Given a sequence of delays, the average
+    transfer entropy at each delay is returned as a lag profile. The
+    target-side histograms are then counted once and updated incrementally
+    from one delay to the next, and only the histograms involving the source
+    are counted anew for each delay.
+
+    The target's history may be embedded with a spacing of *tau_target* time
+    steps, and the source may be embedded with a history length *l* and a
+    spacing of *tau_source* time steps. That is, the next state of the target
+    :math:`y_{i+1}` is predicted from the embeddings
+    :math:`(y_i, y_{i-\\tau_Y}, \\ldots, y_{i-(k-1)\\tau_Y})` and
+    :math:`(x_i, x_{i-\\tau_X}, \\ldots, x_{i-(l-1)\\tau_X})`, and the first
+    :math:`\\max\\{(k-1)\\tau_Y, (l-1)\\tau_X\\}` time steps are used only as
+    history. The embeddings are encoded directly from the time series, with
+    states relabeled into the observed states whenever the state space would
+    otherwise be too large.
+
+    If *per_trial* is ``True``, the transfer entropy of each initial condition
+    is computed separately, as if each row of the time series were passed
+    alone, in a single pass which counts the histograms of every row together.
+
+    If *ensemble* is ``True``, the probabilities are estimated at each time
+    step across the initial conditions rather than pooled over time, and the
+    transfer entropy is returned as a function of time: one value for each
+    time step at which the target's next state is predicted, or the local
+    values of each initial condition at each.
+
     :param source: the source time series
     :type source: sequence or ``numpy.ndarray``
     :param target: the target time series
@@ -157,21 +226,42 @@ def transfer_entropy(source, target, k, condition=None, local=False):
     :param condition: time series of any conditions
     :type condition: sequence or ``numpy.ndarray``
     :param bool local: compute the local transfer entropy
-    :returns: the average or local transfer entropy
+    :param int b: the base of the time series, inferred from the data if ``None``
+    :param delay: the delay, or a sequence of delays, of the source relative to the target
+    :type delay: int or sequence of ints
+    :param int l: the source history length
+    :param int tau_source: the spacing of the source's embedding
+    :param int tau_target: the spacing of the target's embedding
+    :param bool per_trial: compute the transfer entropy of each initial condition
+    :param bool ensemble: estimate the probabilities at each time step across the initial conditions
+    :returns: the average or local transfer entropy, the lag profile, or the transfer entropy of each initial condition
     :rtype: float or ``numpy.ndarray``
     :raises ValueError: if the time series have different shapes
     :raises ValueError: if either time series has no initial conditions
     :raises ValueError: if either time series is greater than 2-D
+    :raises ValueError: if a history length or embedding spacing is not positive
+    :raises ValueError: if the delay and embeddings leave no time steps
+    :raises ValueError: if *local* is requested along with a sequence of delays
+    :raises ValueError: if *per_trial* is requested along with *local* or a sequence of delays
+    :raises ValueError: if *ensemble* is requested along with *per_trial* or a sequence of delays
     :raises InformError: if an error occurs within the ``inform`` C call
     """
+    p = probe("transfer_entropy")
+
     ys = np.ascontiguousarray(source, np.int32)
     xs = np.ascontiguousarray(target, np.int32)
     cs = np.ascontiguousarray(condition, np.int32) if condition is not None else None
+    p.converted(source, ys)
+    p.converted(target, xs)
+    if cs is not None:
+        p.converted(condition, cs)
 
     if xs.shape != ys.shape:
         raise ValueError("source and target timeseries are different shapes")
     elif xs.ndim > 2:
         raise ValueError("source and target have too great a dimension; must be 2 or less")
+    elif xs.size == 0:
+        raise ValueError("empty timeseries")
 
     if cs is None:
         pass
@@ -186,14 +276,47 @@ def transfer_entropy(source, target, k, condition=None, local=False):
     elif cs.ndim > 3:
         raise ValueError("condition has too great a dimension; must be 3 or less")
 
-    ydata = ys.ctypes.data_as(POINTER(c_int))
-    xdata = xs.ctypes.data_as(POINTER(c_int))
-    cdata = cs.ctypes.data_as(POINTER(c_int)) if cs is not None else None
+    embedded = (l, tau_source, tau_target) != (1, 1, 1)
+    numpy_only = embedded or per_trial or ensemble
+    if numpy_only and min(k, l, tau_source, tau_target) < 1:
+        raise ValueError("history lengths and embedding spacings must be positive")
+    w = max((k - 1) * tau_target, (l - 1) * tau_source) + 1
 
-    if cs is None:
+    delays = np.asarray(0 if delay is None else delay, dtype=np.int64)
+    if delay is None and not numpy_only:
+        # The common case is validated by the inform C call itself
+        pass
+    elif np.any(delays < 0):
+        raise ValueError("delay must be non-negative")
+    elif np.any(delays >= xs.shape[-1] - w):
+        raise ValueError("the delay and embeddings must leave at least one time step")
+    elif per_trial is True and (local is True or delays.ndim != 0):
+        raise ValueError("per-trial values are only computed for the average transfer entropy at a single delay")
+    elif ensemble is True and (per_trial is True or delays.ndim != 0):
+        raise ValueError("ensemble values are only computed at a single delay, and not per trial")
+
+    if delay is not None:
+        if delays.ndim == 0 and delay != 0 and not numpy_only:
+            m = xs.shape[-1] - delay
+            ys = np.ascontiguousarray(ys[..., :m])
+            xs = np.ascontiguousarray(xs[..., delay:])
+            cs = np.ascontiguousarray(cs[..., delay:]) if cs is not None else None
+            p.allocated(ys)
+            p.allocated(xs)
+            if cs is not None:
+                p.allocated(cs)
+        elif delays.ndim != 0 and local is True:
+            raise ValueError("the local transfer entropy cannot be computed over a sequence of delays")
+
+    p.phase("convert")
+
+    if b is not None:
+        pass
+    elif cs is None:
         b = max(2, max(np.amax(xs), np.amax(ys)) + 1)
     else:
         b = max(2, max(np.amax(xs), np.amax(ys), np.amax(cs)) + 1)
+    p.phase("base")
 
     if cs is None:
         z = 0
@@ -209,25 +332,213 @@ def transfer_entropy(source, target, k, condition=None, local=False):
     else:
         n, m = xs.shape
 
+    if numpy_only or delays.ndim != 0:
+        te = _embedded_transfer_entropy(ys.reshape(n, m), xs.reshape(n, m),
+                                        cs.reshape(z, n, m) if cs is not None else np.empty((0, n, m), dtype=np.int32),
+                                        b, k, l, tau_source, tau_target, delays, local, per_trial, ensemble)
+        if local is True or per_trial is True or ensemble is True:
+            p.allocated(te)
+        p.phase("kernel")
+        p.finish((ys.size, xs.size) if cs is None else (ys.size, xs.size, cs.size),
+                 (b, b) if cs is None else (b, b, b), k)
+        return te
+
     e = ErrorCode(0)
 
     if local is True:
         q = max(0, m - k)
         te = np.empty((n, q), dtype=np.float64)
-        out = te.ctypes.data_as(POINTER(c_double))
-        _local_transfer_entropy(ydata, xdata, cdata, c_ulong(z), c_ulong(n), c_ulong(m), c_int(b), c_ulong(k), out, byref(e))
+        p.allocated(te)
+        p.phase("alloc")
+        _local_transfer_entropy(ys, xs, cs, z, n, m, c_int(b), k, te, byref(e))
     else:
-        te = _transfer_entropy(ydata, xdata, cdata, c_ulong(z), c_ulong(n), c_ulong(m), c_int(b), c_ulong(k), byref(e))
+        te = _transfer_entropy(ys, xs, cs, z, n, m, c_int(b), k, byref(e))
 
     error_guard(e)
+    p.phase("kernel")
+    if cs is None:
+        p.finish((ys.size, xs.size), (b, b), k)
+    else:
+        p.finish((ys.size, xs.size, cs.size), (b, b, b), k)
 
     return te
 
 
-_transfer_entropy = _inform.inform_transfer_entropy
-_transfer_entropy.argtypes = [POINTER(c_int), POINTER(c_int), POINTER(c_int), c_ulong, c_ulong, c_ulong, c_int, c_ulong, POINTER(c_int)]
-_transfer_entropy.restype = c_double
+def _embedded_transfer_entropy(source, target, conditions, b, k, src_k, tau_source, tau_target, delays, local,
+                               per_trial=False, ensemble=False):
+    """
+    Compute the transfer entropy from the *source* to the *target* with
+    embedded histories, and the source lagged by each of the *delays*.
+
+    The *source* and *target* are 2-D arrays with one initial condition per
+    row, and *conditions* is a 3-D array with one condition per block. Given a
+    single delay, the average, local or per-row transfer entropy is returned,
+    or with *ensemble* the average or local transfer entropy at each time step;
+    given a sequence of delays, the lag profile of the average transfer
+    entropy.
+    """
+    for xs in (source, target) + tuple(conditions):
+        _histogram.check_states(xs, b)
+
+    n, m = target.shape
+    w = max((k - 1) * tau_target, (src_k - 1) * tau_source) + 1
+    q = m - w
+
+    # The joint state of the target's history and the conditions, and the
+    # embedding of the source, at each time step before the target's next
+    # state is predicted.
+    rows = [target[:, w - 1 - j * tau_target:m - 1 - j * tau_target] for j in range(k)]
+    rows += [c[:, w - 1:m - 1] for c in conditions]
+    history, hsize = _histogram.encode(rows, [b] * len(rows))
+    future, fsize = _histogram.join(history, hsize, target[:, w:], b)
+    rows = [source[:, w - 1 - j * tau_source:m - 1 - j * tau_source] for j in range(src_k)]
+    embedding, esize = _histogram.encode(rows, [b] * src_k)
+
+    if local is True or per_trial is True or ensemble is True:
+        d = int(delays)
+        h, f = history[:, d:], future[:, d:]
+        hx, hxsize = _histogram.join(h, hsize, embedding[:, :q - d], esize)
+        fx, fxsize = _histogram.join(f, fsize, embedding[:, :q - d], esize)
+        if ensemble is True:
+            # Count the histograms of each time step across the initial conditions
+            h, f, hx, fx = h.T, f.T, hx.T, fx.T
+            if local is True:
+                num = _histogram.row_local_counts(fx, fxsize) * _histogram.row_local_counts(h, hsize)
+                den = _histogram.row_local_counts(f, fsize) * _histogram.row_local_counts(hx, hxsize)
+                return np.log2(num / den.astype(np.float64)).T
+            s = _histogram.row_xlog2x_sums(h, hsize) - _histogram.row_xlog2x_sums(f, fsize) \
+                + _histogram.row_xlog2x_sums(fx, fxsize) - _histogram.row_xlog2x_sums(hx, hxsize)
+            return s / n
+        if per_trial is True:
+            s = _histogram.row_xlog2x_sums(h, hsize) - _histogram.row_xlog2x_sums(f, fsize) \
+                + _histogram.row_xlog2x_sums(fx, fxsize) - _histogram.row_xlog2x_sums(hx, hxsize)
+            return s / (q - d)
+        num = _histogram.local_counts(fx, fxsize) * _histogram.local_counts(h, hsize)
+        den = _histogram.local_counts(f, fsize) * _histogram.local_counts(hx, hxsize)
+        return np.log2(num / den.astype(np.float64))
+
+    # Lagging the source by d drops the first d of the target's time steps,
+    # and the entropies are combined as sums of c*log2(c) over the histograms.
+    ds = np.atleast_1d(delays)
+    s = _histogram.suffix_xlog2x_sums(history, ds) - _histogram.suffix_xlog2x_sums(future, ds)
+    for i, d in enumerate(ds):
+        hx, hxsize = _histogram.join(history[:, d:], hsize, embedding[:, :q - d], esize)
+        fx, fxsize = _histogram.join(future[:, d:], fsize, embedding[:, :q - d], esize)
+        s[i] += _histogram.xlog2x_sum(_histogram.counts(fx, fxsize)) \
+            - _histogram.xlog2x_sum(_histogram.counts(hx, hxsize))
+    te = s / (n * (q - ds))
+    return te if np.ndim(delays) != 0 else float(te[0])
+
+
+def transfer_entropy_pair(x, y, k, local=False, b=None):
+    """
+    Compute the average or local transfer entropy in both directions between
+    two time series with history length *k*, and the net transfer entropy from
+    *x* to *y*.
+
+    The result is that of ``transfer_entropy(x, y, k)`` and
+    ``transfer_entropy(y, x, k)`` along with their difference, but the time
+    series are converted and scanned for their base once, and the histories of
+    each are encoded once. Each time series is the target in one direction, in
+    which its histories and next states are counted, and the source in the
+    other, in which its most recent states are joined with the other's
+    histories.
+
+    .. doctest:: transfer_entropy
+
+        >>> xs = [0,1,1,1,1,0,0,0,0]
+        >>> ys = [0,0,1,1,1,1,0,0,0]
+        >>> transfer_entropy_pair(xs, ys, k=2)
+        (0.6792696431662097, 0.0, 0.6792696431662097)
+
+    :param x: the first time series
+    :type x: sequence or ``numpy.ndarray``
+    :param y: the second time series
+    :type y: sequence or ``numpy.ndarray``
+    :param int k: the history length
+    :param bool local: compute the local transfer entropies
+    :param int b: the base of the time series, inferred from the data if ``None``
+    :returns: the average or local transfer entropy from *x* to *y*, from *y* to *x*, and their difference
+    :rtype: 3-tuple of floats or ``numpy.ndarray``
+    :raises ValueError: if the time series have different shapes
+    :raises ValueError: if either time series is empty or greater than 2-D
+    :raises ValueError: if *k* is not positive or not less than the length of the time series
+    :raises ValueError: if a time series has states outside of the base
+    """
+    p = probe("transfer_entropy_pair")
+
+    xs = np.ascontiguousarray(x, np.int32)
+    ys = np.ascontiguousarray(y, np.int32)
+    p.converted(x, xs)
+    p.converted(y, ys)
+
+    if xs.shape != ys.shape:
+        raise ValueError("the time series are different shapes")
+    elif xs.ndim == 0 or xs.size == 0:
+        raise ValueError("empty timeseries")
+    elif xs.ndim > 2:
+        raise ValueError("dimension greater than 2")
+    p.phase("convert")
+
+    if b is None:
+        b = max(2, np.amax(xs) + 1, np.amax(ys) + 1)
+    _histogram.check_states(xs, b)
+    _histogram.check_states(ys, b)
+    p.phase("base")
+
+    xs, ys = xs.reshape(-1, xs.shape[-1]), ys.reshape(-1, ys.shape[-1])
+    n, m = xs.shape
+    if k < 1 or m <= k:
+        raise ValueError("the history length must be positive and less than the length of the time series")
+
+    q = m - k
+    xy = _directed_terms(_history_terms(ys, b, k, q), xs[:, k - 1:m - 1], b, local)
+    yx = _directed_terms(_history_terms(xs, b, k, q), ys[:, k - 1:m - 1], b, local)
+    if local is True:
+        xy, yx = np.log2(xy), np.log2(yx)
+        p.allocated(xy)
+        p.allocated(yx)
+    else:
+        xy, yx = float(xy) / (n * q), float(yx) / (n * q)
+    p.phase("kernel")
+    p.finish((xs.size, ys.size), (b, b), k)
+
+    return xy, yx, xy - yx
+
+
+def _history_terms(xs, b, k, q):
+    """
+    Encode the *k*-histories of the rows of *xs* and their joint states with
+    the next state.
+    """
+    history, hsize = _histogram.encode([xs[:, i:i + q] for i in range(k)], [b] * k)
+    future, fsize = _histogram.join(history, hsize, xs[:, k:], b)
+    return history, hsize, future, fsize
+
+
+def _directed_terms(target_terms, source, b, local):
+    """
+    Compute the ratios of the local counts whose logarithms are the local
+    transfer entropies from the *source* states to the target, or the sum of
+    the :py:func:`~pyinform._histogram.xlog2x_sum` terms giving the average
+    transfer entropy times the number of observations.
+    """
+    history, hsize, future, fsize = target_terms
+    hs, hssize = _histogram.join(history, hsize, source, b)
+    fs, fssize = _histogram.join(future, fsize, source, b)
+    if local is True:
+        num = _histogram.local_counts(fs, fssize) * _histogram.local_counts(history, hsize)
+        den = _histogram.local_counts(future, fsize) * _histogram.local_counts(hs, hssize)
+        return num / den.astype(np.float64)
+    return _histogram.xlog2x_sum(_histogram.counts(history, hsize)) \
+        - _histogram.xlog2x_sum(_histogram.counts(future, fsize)) \
+        + _histogram.xlog2x_sum(_histogram.counts(fs, fssize)) \
+        - _histogram.xlog2x_sum(_histogram.counts(hs, hssize))
+
+
+_transfer_entropy = prototype("inform_transfer_entropy", c_double,
+                              [SERIES, SERIES, OPTIONAL_SERIES, c_ulong, c_ulong, c_ulong, c_int, c_ulong, ERROR])
 
-_local_transfer_entropy = _inform.inform_local_transfer_entropy
-_local_transfer_entropy.argtypes = [POINTER(c_int), POINTER(c_int), POINTER(c_int), c_ulong, c_ulong, c_ulong, c_int, c_ulong, POINTER(c_double), POINTER(c_int)]
-_local_transfer_entropy.restype = POINTER(c_double)
+_local_transfer_entropy = prototype("inform_local_transfer_entropy", None,
+                                    [SERIES, SERIES, OPTIONAL_SERIES, c_ulong, c_ulong, c_ulong, c_int, c_ulong,
+                                     VALUES, ERROR])
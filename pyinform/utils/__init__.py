@@ -2,5 +2,9 @@
 # Use of this source code is governed by a MIT
 # license that can be found in the LICENSE file.
 from pyinform.utils.binning import series_range, bin_series  # noqa: F401
+from pyinform.utils.blackbox import black_box                # noqa: F401
 from pyinform.utils.coalesce import coalesce_series          # noqa: F401
 from pyinform.utils.encoding import encode, decode           # noqa: F401
+from pyinform.utils.history import optimize_k                # noqa: F401
+from pyinform.utils.partitions import partitions             # noqa: F401
+from pyinform.utils.bootstrap import bootstrap, BootstrapResult  # noqa: F401
@@ -14,8 +14,10 @@ principle it can be difficult to decide exactly which binning approach.
 
 The second approach attempts to infer condinuous probability distributions from
 continuous data. This is potentially more robust, but more technically
-difficult. Unfortunately, PyInform does not yet have an implementation of
-information measures on continous distributions.
+difficult. PyInform provides the Kraskov-Stoegbauer-Grassberger
+nearest-neighbour estimators of the mutual information, conditional mutual
+information and transfer entropy of continuously-valued time series via
+:py:mod:`pyinform.ksg` (see :ref:`ksg`).
 
 This module (:py:mod:`pyinform.utils.binning`) provides a basic binning facility
 via the :py:func:`.bin_series` function.
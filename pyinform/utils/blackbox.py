@@ -0,0 +1,144 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Black-boxing (or coarse-graining) a system treats a group of its nodes as a
+single node, whose state at each time step is the joint state of the group,
+possibly together with the recent history and near future of each of the
+group's nodes. Measures of the coarse-grained series then describe the system
+at the scale of the groups rather than of the individual nodes.
+
+This module (:py:mod:`pyinform.utils.blackbox`) encodes every group of a
+partition of the nodes, over every initial condition and time step, a whole
+array at a time rather than one state at a time with :py:func:`.encode`.
+"""
+import numpy as np
+
+from pyinform import _histogram
+
+# The largest base which the inform C library accepts
+MAX_BASE = 2**31 - 1
+
+
+def black_box(series, parts=None, k=1, future=0, b=None, coalesce=False):
+    """
+    Coarse-grain a collection of time series, encoding the joint state of each
+    part of a partition of them into a single time series.
+
+    The *series* is an array with one time series per node, each either 1-D or
+    with one row per initial condition. The *parts* label the part to which
+    each node belongs, as in Inform's ``inform_black_box_parts``; every node is
+    in one part by default.
+
+    .. doctest:: utils
+
+        >>> xs = [[0,1,1,0,1,0], [1,1,0,0,1,0], [0,0,0,1,1,1]]
+        >>> utils.black_box(xs)
+        (array([2, 6, 4, 1, 7, 1]), 8)
+        >>> utils.black_box(xs, parts=[0,1,1])
+        (array([[0, 1, 1, 0, 1, 0],
+               [2, 2, 0, 1, 3, 1]]), array([2, 4]))
+
+    Each part may also include the last *k* states and next *future* states of
+    its nodes, given for all parts or one per part. The states are encoded
+    node by node, each node's states from the earliest to the latest, and the
+    coarse-grained series are aligned so that each covers the time steps for
+    which every part's history and future are available.
+
+    .. doctest:: utils
+
+        >>> utils.black_box(xs, parts=[0,1,1], k=[2,1])
+        (array([[1, 3, 2, 1, 2],
+               [2, 0, 1, 3, 1]]), array([4, 4]))
+        >>> utils.black_box(xs[0], k=2, future=1)
+        (array([3, 6, 5, 2]), 8)
+
+    Should the state space of a part not fit within a 32-bit integer, its
+    states are relabeled into the states which are observed, preserving their
+    order, so that the coarse-grained series can be passed to any measure
+    along with its base; with *coalesce* the states of every part are.
+
+    :param series: the time series of each node
+    :type series: sequence or ``numpy.ndarray``
+    :param parts: the part to which each node belongs, labeled from 0
+    :type parts: sequence of ints
+    :param k: the history length of each part
+    :type k: int or sequence of ints
+    :param future: the number of future states of each part
+    :type future: int or sequence of ints
+    :param b: the base of the time series, either one for all or one per node; inferred from the data if ``None``
+    :type b: int or sequence of ints
+    :param bool coalesce: relabel each part's states into the observed states
+    :return: the coarse-grained time series and the base of each
+    :rtype: the 2-tuple (``numpy.ndarray``, int or ``numpy.ndarray``)
+    :raises ValueError: if the time series are empty, or are not 1-D or 2-D per node
+    :raises ValueError: if the parts do not label each node, or a part has no nodes
+    :raises ValueError: if a history length is not positive or a future is negative
+    :raises ValueError: if the time series are too short for the histories and futures
+    :raises ValueError: if a time series has states outside of its base
+    """
+    xs = np.asarray(series, dtype=np.int32)
+    if xs.size == 0:
+        raise ValueError("empty timeseries")
+    elif xs.ndim == 1:
+        xs = xs.reshape(1, 1, -1)
+    elif xs.ndim == 2:
+        xs = xs.reshape(xs.shape[0], 1, -1)
+    elif xs.ndim != 3:
+        raise ValueError("the time series of each node must be 1-D or 2-D")
+    l, n, m = xs.shape
+
+    if b is None:
+        bs = np.maximum(2, np.amax(xs.reshape(l, -1), axis=1) + 1)
+    else:
+        bs = np.asarray(b, dtype=np.int64)
+        if bs.ndim == 0:
+            bs = np.full(l, bs, dtype=np.int64)
+        elif bs.shape != (l,):
+            raise ValueError("the number of bases does not match the number of nodes")
+    for x, base in zip(xs, bs):
+        _histogram.check_states(x, base)
+
+    labels = np.zeros(l, dtype=np.int64) if parts is None else np.asarray(parts, dtype=np.int64)
+    if labels.shape != (l,) or np.amin(labels) < 0:
+        raise ValueError("the parts must label each node with a non-negative integer")
+    p = int(np.amax(labels)) + 1
+    if np.unique(labels).size != p:
+        raise ValueError("every part must contain at least one node")
+
+    ks, fs = _lengths(k, p), _lengths(future, p)
+    if np.amin(ks) < 1 or np.amin(fs) < 0:
+        raise ValueError("the history lengths must be positive and the futures non-negative")
+    r = int(np.amax(ks))
+    q = m - r - int(np.amax(fs)) + 1
+    if q < 1:
+        raise ValueError("the time series are too short for the histories and futures")
+
+    box = np.empty((p, n, q), dtype=np.int64)
+    sizes = np.empty(p, dtype=np.int64)
+    for j in range(p):
+        nodes = np.flatnonzero(labels == j)
+        # The states at offsets r - k through r + future - 1 of each window
+        offsets = range(r - ks[j], r + fs[j])
+        codes, size = _histogram.encode([xs[i, :, t:t + q] for i in nodes for t in offsets],
+                                        [bs[i] for i in nodes for _ in offsets])
+        if coalesce is True or size > MAX_BASE:
+            codes, size = _histogram.compress(codes)
+        box[j], sizes[j] = codes, size
+
+    shape = np.shape(series)[1:-1] + (q,)
+    if parts is None:
+        return box.reshape(shape), int(sizes[0])
+    return box.reshape((p,) + shape), sizes
+
+
+def _lengths(lengths, p):
+    """
+    Broadcast a history or future length to one per part.
+    """
+    ls = np.asarray(lengths, dtype=np.int64)
+    if ls.ndim == 0:
+        return np.full(p, ls, dtype=np.int64)
+    elif ls.shape != (p,):
+        raise ValueError("the number of lengths does not match the number of parts")
+    return ls
@@ -0,0 +1,229 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+from collections import namedtuple
+
+import numpy as np
+
+from pyinform import _histogram
+from pyinform.activeinfo import active_info
+from pyinform.blockentropy import block_entropy
+from pyinform.conditionalentropy import conditional_entropy
+from pyinform.entropyrate import entropy_rate
+from pyinform.mutualinfo import mutual_info
+from pyinform.transferentropy import transfer_entropy
+
+BootstrapResult = namedtuple("BootstrapResult", ["value", "low", "high", "replicates"])
+BootstrapResult.__doc__ = """
+The result of :py:func:`bootstrap`.
+
+:param float value: the value of the measure on the original time series
+:param float low: the lower bound of the confidence interval
+:param float high: the upper bound of the confidence interval
+:param replicates: the value of the measure for each bootstrap replicate
+:type replicates: ``numpy.ndarray``
+"""
+
+# The largest number of elements in the per-unit histograms and the weights
+# of a chunk of replicates
+_DENSE_ELEMENTS = 2**24
+
+# The number of replicates drawn from each seed
+_CHUNK = 64
+
+
+def bootstrap(measure, series, n_boot, alpha=0.05, resample="trials", seed=None, processes=None, **kwargs):
+    """
+    Compute a bootstrap confidence interval for a time series measure.
+
+    Each bootstrap replicate resamples the *trials* (the initial conditions,
+    i.e. the rows of the time series) or the individual *samples* with
+    replacement. For :py:func:`~pyinform.activeinfo.active_info`,
+    :py:func:`~pyinform.entropyrate.entropy_rate`,
+    :py:func:`~pyinform.blockentropy.block_entropy`,
+    :py:func:`~pyinform.mutualinfo.mutual_info`,
+    :py:func:`~pyinform.conditionalentropy.conditional_entropy` and
+    :py:func:`~pyinform.transferentropy.transfer_entropy` the time series are
+    never resampled. Instead the histograms of each trial are counted once and
+    each replicate's histograms are the combination of those with multinomial
+    weights, many replicates at a time. Any other measure is recomputed on the
+    resampled trials, and so each of its time series must be a 2-D array with
+    one row per trial.
+
+    .. doctest:: utils
+
+        >>> series = [[0,0,1,1,1,1,0,0,0], [1,0,0,1,0,0,1,0,0], [1,1,0,0,1,1,0,0,1]]
+        >>> result = utils.bootstrap(active_info, series, 1000, k=2, seed=2019)
+        >>> result.value  # doctest: +ELLIPSIS
+        0.377852540693...
+        >>> result.replicates.shape
+        (1000,)
+
+    If *series* is a tuple, its elements are passed to the measure as
+    separate arguments, e.g. ``(xs, ys)`` for
+    :py:func:`~pyinform.mutualinfo.mutual_info`, and any additional keyword
+    arguments are passed on to the measure. The replicates can be computed in
+    parallel by a pool of *processes*, and are the same for a given *seed*
+    however many processes are used.
+
+    :param measure: the measure, called as ``measure(*series, **kwargs)``
+    :param series: the time series, or a tuple of time series
+    :type series: sequence, ``numpy.ndarray`` or tuple
+    :param int n_boot: the number of bootstrap replicates
+    :param float alpha: the confidence interval covers the central :math:`1 - \\alpha` of the replicates
+    :param str resample: resample either the ``"trials"`` or the ``"samples"``
+    :param int seed: the seed of the random number generator
+    :param int processes: the number of worker processes; computed serially if ``None``
+    :return: the value of the measure, the confidence interval and the replicates
+    :rtype: :py:class:`BootstrapResult`
+    :raises ValueError: if *resample* is neither ``"trials"`` nor ``"samples"``
+    :raises ValueError: if there are fewer than two trials to resample
+    :raises ValueError: if *measure* does not support resampling samples
+    :raises ValueError: if the time series of any other measure do not each have a row per trial
+    :raises ValueError: if a time series has negative states
+    :raises ValueError: if *measure* does not return a single value
+    """
+    if resample not in ("trials", "samples"):
+        raise ValueError("unknown resampling {!r}".format(resample))
+    elif n_boot < 1:
+        raise ValueError("at least one replicate is required")
+
+    args = series if isinstance(series, tuple) else (series,)
+    args = tuple(np.ascontiguousarray(xs, dtype=np.int32) for xs in args)
+    for xs in args:
+        if xs.size != 0 and np.amin(xs) < 0:
+            raise ValueError("time series has negative states")
+
+    value = measure(*args, **kwargs)
+    if np.ndim(value) != 0:
+        raise ValueError("the measure must return a single value, e.g. not local values")
+
+    terms = _terms(measure, args, kwargs)
+    if terms is None:
+        if resample == "samples":
+            raise ValueError("the samples of {} cannot be resampled".format(getattr(measure, "__name__", measure)))
+        elif any(xs.ndim != 2 or xs.shape[0] != args[0].shape[0] for xs in args):
+            raise ValueError("the trials of {} cannot be resampled; each time series must have one row per trial"
+                             .format(getattr(measure, "__name__", measure)))
+        state = (measure, args, kwargs)
+        units = args[0].shape[0]
+    else:
+        state = [_unit_histograms(coef, codes, resample) for coef, codes in terms]
+        units = state[0][1].shape[0]
+
+    if units < 2:
+        raise ValueError("at least two trials are required to resample")
+
+    rng = np.random.RandomState(seed)
+    sizes = [min(_CHUNK, n_boot - start) for start in range(0, n_boot, _CHUNK)]
+    tasks = list(zip(sizes, rng.randint(2**31 - 1, size=len(sizes))))
+    if processes is None:
+        _init_worker(state)
+        replicates = [_worker_replicates(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(state,)) as pool:
+            replicates = list(pool.map(_worker_replicates, tasks))
+    replicates = np.concatenate(replicates)
+
+    low, high = np.percentile(replicates, [50.0 * alpha, 100.0 - 50.0 * alpha])
+    return BootstrapResult(value, low, high, replicates)
+
+
+def _terms(measure, args, kwargs):
+    """
+    Express *measure* as a sum of entropies, returning the coefficient and the
+    (2-D) state codes of each entropy, or ``None`` if the measure is not
+    supported. The arguments have already been validated by the measure.
+    """
+    rows = [xs.reshape(-1, xs.shape[-1]) for xs in args]
+    bases = [max(2, int(np.amax(xs)) + 1) for xs in rows]
+
+    if measure in (active_info, entropy_rate, block_entropy) and len(rows) == 1 \
+            and "k" in kwargs and set(kwargs) <= {"k", "b"}:
+        xs, b = rows[0], bases[0]
+        k = kwargs["k"]
+        if measure is block_entropy:
+            q = xs.shape[1] - k + 1
+            blocks, _ = _histogram.encode([xs[:, i:i + q] for i in range(k)], [b] * k)
+            return [(1.0, blocks)]
+        q = xs.shape[1] - k
+        history, hsize = _histogram.encode([xs[:, i:i + q] for i in range(k)], [b] * k)
+        future, _ = _histogram.join(history, hsize, xs[:, k:], b)
+        if measure is active_info:
+            return [(1.0, history), (1.0, xs[:, k:]), (-1.0, future)]
+        return [(1.0, future), (-1.0, history)]
+
+    elif measure in (mutual_info, conditional_entropy) and len(rows) == 2 \
+            and set(kwargs) <= {"b"} and rows[0].shape == rows[1].shape:
+        joint, _ = _histogram.join(rows[0], bases[0], rows[1], bases[1])
+        if measure is mutual_info:
+            return [(1.0, rows[0]), (1.0, rows[1]), (-1.0, joint)]
+        return [(1.0, joint), (-1.0, rows[0])]
+
+    elif measure is transfer_entropy and len(rows) == 2 and "k" in kwargs \
+            and set(kwargs) <= {"k", "b"} and rows[0].shape == rows[1].shape:
+        source, target = rows
+        b, k = max(bases), kwargs["k"]
+        q = target.shape[1] - k
+        history, hsize = _histogram.encode([target[:, i:i + q] for i in range(k)], [b] * k)
+        future, fsize = _histogram.join(history, hsize, target[:, k:], b)
+        hx, _ = _histogram.join(history, hsize, source[:, k - 1:-1], b)
+        fx, _ = _histogram.join(future, fsize, source[:, k - 1:-1], b)
+        return [(1.0, future), (-1.0, history), (-1.0, fx), (1.0, hx)]
+
+    return None
+
+
+def _unit_histograms(coef, codes, resample):
+    """
+    Relabel the *codes* of a term into the observed states and, if small
+    enough, count the histogram of each resampled unit.
+    """
+    labels, size = _histogram.compress(codes)
+    if resample == "samples":
+        labels = labels.reshape(-1, 1)
+    units, length = labels.shape
+    if units * size > _DENSE_ELEMENTS:
+        return coef, labels, None
+    offsets = np.arange(units, dtype=np.int64)[:, np.newaxis] * size
+    counts = np.bincount((labels + offsets).ravel(), minlength=units * size)
+    return coef, labels, counts.reshape(units, size).astype(np.float64)
+
+
+_worker_state = None
+
+
+def _init_worker(state):
+    global _worker_state
+    _worker_state = state
+
+
+def _worker_replicates(task):
+    """
+    Compute a chunk of replicates drawn from the given seed.
+    """
+    n, seed = task
+    rng = np.random.RandomState(seed)
+
+    if isinstance(_worker_state, tuple):
+        measure, args, kwargs = _worker_state
+        units = args[0].shape[0]
+        weights = rng.multinomial(units, np.full(units, 1.0 / units), size=n)
+        return np.asarray([measure(*(np.repeat(xs, w, axis=0) for xs in args), **kwargs) for w in weights])
+
+    units = _worker_state[0][1].shape[0]
+    replicates = np.zeros(n, dtype=np.float64)
+    step = max(1, _DENSE_ELEMENTS // units)
+    for start in range(0, n, step):
+        weights = rng.multinomial(units, np.full(units, 1.0 / units), size=min(step, n - start))
+        block = replicates[start:start + weights.shape[0]]
+        for coef, labels, counts in _worker_state:
+            if counts is not None:
+                block += coef * _histogram.entropies(np.dot(weights, counts))
+            else:
+                length = labels.shape[1]
+                block += coef * np.asarray([
+                    _histogram.entropy(np.bincount(labels.ravel(), weights=np.repeat(w, length)))
+                    for w in weights])
+    return replicates
@@ -0,0 +1,122 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import numpy as np
+
+
+def optimize_k(measure, series, k_max, criterion="surrogate", k_min=1, surrogates=100,
+               alpha=0.05, tolerance=0.01, seed=None, **kwargs):
+    """
+    Select the history length of a measure such as
+    :py:func:`~pyinform.activeinfo.active_info` or
+    :py:func:`~pyinform.transferentropy.transfer_entropy`.
+
+    The measure is evaluated at increasing history lengths, starting from
+    *k_min*, and the search stops at the first history length which does not
+    improve upon the previous one. The previous history length is then
+    selected, so history lengths beyond the first which fails to improve the
+    measure are never evaluated.
+
+    Whether a history length is an improvement is decided by the *criterion*:
+
+    ``"surrogate"``
+        The gain in the measure over the previous history length is compared
+        to the gains observed when the first time series is shuffled in time,
+        and is an improvement if it is significant at the level *alpha*. As
+        the plug-in estimates of the measures are biased upwards by an amount
+        which grows with the history length, this is the more reliable of the
+        criteria. The surrogates for a history length stop being evaluated as
+        soon as the gain can no longer be significant.
+
+    ``"gain"``
+        The gain in the measure over the previous history length is an
+        improvement if it is greater than *tolerance* bits.
+
+    For example, the state of the following time series is the exclusive-or
+    of its previous two states, so a history length of 2 is selected
+
+    .. doctest:: utils
+
+        >>> xs = [1,1,0,1,1,0,1,1,0,1,1,0,1,1,0,1,1,0,1,1,0]
+        >>> utils.optimize_k(active_info, xs, 4, criterion="gain")  # doctest: +ELLIPSIS
+        (2, 0.949452015...)
+
+    If *series* is a tuple, its elements are passed to the measure as
+    separate arguments, e.g. ``(source, target)`` for
+    :py:func:`~pyinform.transferentropy.transfer_entropy`, and any additional
+    keyword arguments are passed on to the measure.
+
+    :param measure: the measure, called as ``measure(*series, k, **kwargs)``
+    :param series: the time series, or a tuple of time series
+    :type series: sequence, ``numpy.ndarray`` or tuple
+    :param int k_max: the largest history length to consider
+    :param str criterion: the criterion, either ``"surrogate"`` or ``"gain"``
+    :param int k_min: the smallest history length to consider
+    :param int surrogates: the number of surrogates for the ``"surrogate"`` criterion
+    :param float alpha: the significance level of the ``"surrogate"`` criterion
+    :param float tolerance: the smallest gain (in bits) accepted by the ``"gain"`` criterion
+    :param int seed: the seed of the random number generator used to shuffle the surrogates
+    :return: the selected history length and the value of the measure for it
+    :rtype: the 2-tuple (int, float)
+    :raises ValueError: if the criterion is unknown
+    :raises ValueError: if the history lengths are not ``1 <= k_min <= k_max``
+    :raises ValueError: if there are too few surrogates to reach the significance level
+    """
+    if criterion not in ("surrogate", "gain"):
+        raise ValueError("unknown criterion {!r}".format(criterion))
+    elif k_min < 1 or k_max < k_min:
+        raise ValueError("history lengths must satisfy 1 <= k_min <= k_max")
+    elif criterion == "surrogate" and alpha * (surrogates + 1) < 1:
+        raise ValueError("too few surrogates to reach the significance level")
+
+    args = series if isinstance(series, tuple) else (series,)
+    args = tuple(np.ascontiguousarray(xs, dtype=np.int32) for xs in args)
+
+    def evaluate(args, k):
+        return measure(*(args + (k,)), **kwargs)
+
+    if criterion == "surrogate":
+        # Each surrogate is regenerated from its own seed for every history
+        # length, so that its gains are measured on the same shuffle without
+        # holding all of the shuffled time series in memory.
+        rng = np.random.RandomState(seed)
+        seeds = rng.randint(2**31 - 1, size=surrogates)
+        # The gain is significant if (exceeded + 1) / (surrogates + 1) <= alpha
+        limit = alpha * (surrogates + 1) - 1
+        nulls = np.asarray([evaluate(_shuffle(args, s), k_min) for s in seeds])
+
+    best, value = k_min, evaluate(args, k_min)
+    for k in range(k_min + 1, k_max + 1):
+        current = evaluate(args, k)
+        gain = current - value
+        if criterion == "gain":
+            improved = gain > tolerance
+        else:
+            improved, exceeded = True, 0
+            for i, s in enumerate(seeds):
+                null = evaluate(_shuffle(args, s), k)
+                if null - nulls[i] >= gain:
+                    exceeded += 1
+                    if exceeded > limit:
+                        improved = False
+                        break
+                nulls[i] = null
+        if not improved:
+            break
+        best, value = k, current
+    return best, value
+
+
+def _shuffle(args, seed):
+    """
+    Shuffle the first of the time series in time, independently for each
+    initial condition.
+    """
+    rng = np.random.RandomState(seed)
+    xs = args[0]
+    if xs.ndim == 1:
+        shuffled = rng.permutation(xs)
+    else:
+        order = np.argsort(rng.random_sample(xs.shape), axis=-1)
+        shuffled = np.take_along_axis(xs, order, axis=-1)
+    return (shuffled,) + args[1:]
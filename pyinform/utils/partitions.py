@@ -0,0 +1,92 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+"""
+Many measures of the integration of a system of variables, e.g.
+:py:mod:`pyinform.integration`, consider every way of partitioning the
+variables into disjoint blocks. The number of partitions (the Bell number)
+grows faster than exponentially with the number of variables, so this module
+(:py:mod:`pyinform.utils.partitions`) enumerates them lazily, one at a time.
+
+Each partition is a tuple of blocks, and each block is a bitmask of the
+variables it contains, the :math:`i`-th variable being the :math:`i`-th
+bit. The blocks are ordered by their first variable.
+"""
+
+
+def partitions(n, blocks=None):
+    """
+    Lazily generate the partitions of *n* variables, optionally only those
+    with exactly *blocks* blocks.
+
+    The partitions are generated in lexicographic order of their restricted
+    growth strings, i.e. of the labels ``(a_0, ..., a_{n-1})`` of the block
+    of each variable, in which each label is at most one more than the
+    largest label before it.
+
+    .. doctest:: utils
+
+        >>> list(utils.partitions(3))
+        [(7,), (3, 4), (5, 2), (1, 6), (1, 2, 4)]
+        >>> list(utils.partitions(3, blocks=2))
+        [(3, 4), (5, 2), (1, 6)]
+
+    :param int n: the number of variables
+    :param int blocks: the number of blocks in each partition, or ``None`` for any number
+    :return: a generator of the partitions
+    :raises ValueError: if *n* is not positive, or *blocks* is not in ``[1, n]``
+    """
+    if n < 1:
+        raise ValueError("the number of variables must be positive")
+    elif blocks is not None and not 1 <= blocks <= n:
+        raise ValueError("the number of blocks must be between 1 and the number of variables")
+    return _completions([0], n, blocks)
+
+
+def _completions(prefix, n, blocks=None):
+    """
+    Lazily generate the partitions of *n* variables whose restricted growth
+    strings begin with *prefix*, optionally with exactly *blocks* blocks.
+    """
+    labels = list(prefix) + [0] * (n - len(prefix))
+    # The largest label among the first i + 1 variables, for each i
+    maxima = [0] * n
+    for i in range(1, len(prefix)):
+        maxima[i] = max(maxima[i - 1], labels[i])
+    fixed = len(prefix)
+    limit = n if blocks is None else blocks
+
+    i = fixed
+    while True:
+        # Fill the remaining labels with the smallest (or, given a number of
+        # blocks, the smallest admissible) values
+        for j in range(i, n):
+            top = maxima[j - 1] if j > 0 else 0
+            need = blocks is not None and top + 1 < blocks - (n - 1 - j)
+            labels[j] = top + 1 if need else 0
+            maxima[j] = max(top, labels[j])
+        if blocks is None or maxima[n - 1] + 1 == blocks:
+            yield _masks(labels, maxima[n - 1] + 1)
+
+        # Advance the rightmost label which can be incremented
+        i = n - 1
+        while i >= fixed:
+            top = maxima[i - 1] if i > 0 else 0
+            if i > 0 and labels[i] <= top and labels[i] + 1 < limit:
+                labels[i] += 1
+                maxima[i] = max(top, labels[i])
+                i += 1
+                break
+            i -= 1
+        else:
+            return
+
+
+def _masks(labels, count):
+    """
+    Convert a restricted growth string into a tuple of block bitmasks.
+    """
+    masks = [0] * count
+    for i, label in enumerate(labels):
+        masks[label] |= 1 << i
+    return tuple(masks)
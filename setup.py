@@ -35,6 +35,7 @@ setup(
     url='https://github.com/elife-asu/pyinform',
     license=license,
     install_requires=['numpy'],
+    extras_require={'ksg': ['scipy']},
     setup_requires=['green'],
     packages=['pyinform', 'pyinform.utils'],
     package_data={'pyinform': inform_files},
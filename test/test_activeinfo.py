@@ -2,6 +2,7 @@
 # Use of this source code is governed by a MIT
 # license that can be found in the LICENSE file.
 import unittest
+import numpy as np
 from pyinform.error import InformError
 from pyinform.activeinfo import active_info
 
@@ -91,6 +92,17 @@ class TestActiveInfo(unittest.TestCase):
               [1, 1, 0, 0, 0, 1, 1, 2, 2]]
         self.assertAlmostEqual(1.324291, active_info(xs, 2), places=6)
 
+    def test_active_info_explicit_base(self):
+        xs = [[3, 3, 3, 2, 1, 0, 0, 0, 1], [2, 2, 3, 3, 3, 3, 2, 1, 0]]
+        self.assertAlmostEqual(active_info(xs, 2), active_info(xs, 2, b=4), places=6)
+        self.assertAlmostEqual(active_info(xs, 2), active_info(xs, 2, b=8), places=6)
+
+        with self.assertRaises(InformError):
+            active_info(xs, 2, b=3)
+
+        with self.assertRaises(ValueError):
+            active_info([], 2, b=2)
+
 
 class TestLocalActiveInfo(unittest.TestCase):
     def test_active_info_empty(self):
@@ -181,5 +193,58 @@ class TestLocalActiveInfo(unittest.TestCase):
                                active_info(xs, 2, local=True).mean(), places=6)
 
 
+class TestPerTrialActiveInfo(unittest.TestCase):
+    def test_active_info_per_trial_invalid(self):
+        series = [[0, 0, 1, 1, 1, 1, 0, 0, 0], [1, 0, 0, 1, 0, 0, 1, 0, 0]]
+        with self.assertRaises(ValueError):
+            active_info(series, 2, local=True, per_trial=True)
+
+        with self.assertRaises(ValueError):
+            active_info(series, 0, per_trial=True)
+
+        with self.assertRaises(ValueError):
+            active_info(series, 9, per_trial=True)
+
+        with self.assertRaises(ValueError):
+            active_info(series, 2, b=1, per_trial=True)
+
+    def test_active_info_per_trial(self):
+        series = [[0, 0, 1, 1, 1, 1, 0, 0, 0], [1, 0, 0, 1, 0, 0, 1, 0, 0]]
+        self.assertTrue(np.allclose([0.305958, 0.863120], active_info(series, 2, per_trial=True), atol=1e-6))
+
+    def test_active_info_per_trial_rows(self):
+        series = np.random.randint(0, 4, (20, 50))
+        expect = [active_info(xs, 3) for xs in series]
+        got = active_info(series, 3, per_trial=True)
+        self.assertEqual((20,), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+
+class TestEnsembleActiveInfo(unittest.TestCase):
+    def test_active_info_ensemble_invalid(self):
+        series = [[0, 0, 1, 1, 1, 1, 0, 0, 0], [1, 0, 0, 1, 0, 0, 1, 0, 0]]
+        with self.assertRaises(ValueError):
+            active_info(series, 2, per_trial=True, ensemble=True)
+
+        with self.assertRaises(ValueError):
+            active_info(series, 0, ensemble=True)
+
+        with self.assertRaises(ValueError):
+            active_info(series, 9, ensemble=True)
+
+    def test_active_info_ensemble_time_steps(self):
+        series = np.random.randint(0, 3, (40, 12))
+        expect = [active_info(series[:, t:t + 3], 2) for t in range(10)]
+        got = active_info(series, 2, ensemble=True)
+        self.assertEqual((10,), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+        expect = np.hstack([active_info(series[:, t:t + 3], 2, local=True) for t in range(10)])
+        got = active_info(series, 2, local=True, ensemble=True)
+        self.assertEqual((40, 10), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+        self.assertTrue(np.allclose(active_info(series, 2, ensemble=True), got.mean(axis=0)))
+
+
 if __name__ == "__main__":
     unittest.main()
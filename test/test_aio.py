@@ -0,0 +1,100 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import sys
+import time
+import unittest
+import numpy as np
+from pyinform.activeinfo import active_info
+from pyinform.mutualinfo import mutual_info
+from pyinform.transferentropy import transfer_entropy
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from pyinform import aio
+else:
+    aio = None
+
+
+@unittest.skipIf(aio is None, "asyncio requires Python 3.5 or later")
+class TestAsyncMeasures(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        aio.configure()
+
+    def test_configure_invalid(self):
+        with self.assertRaises(ValueError):
+            aio.configure(threads=0)
+
+        with self.assertRaises(ValueError):
+            aio.configure(concurrency=0)
+
+    def test_transfer_entropy(self):
+        xs, ys = [0, 1, 1, 1, 1, 0, 0, 0, 0], [0, 0, 1, 1, 1, 1, 0, 0, 0]
+        te = self.loop.run_until_complete(aio.transfer_entropy(xs, ys, 2))
+        self.assertAlmostEqual(transfer_entropy(xs, ys, 2), te)
+
+    def test_lag_profile(self):
+        xs = np.random.randint(0, 2, 1000)
+        ys = np.random.randint(0, 2, 1000)
+        delays = range(2 * aio.DELAY_CHUNK + 3)
+        te = self.loop.run_until_complete(aio.transfer_entropy(xs, ys, 2, delay=delays))
+        self.assertTrue(np.allclose(transfer_entropy(xs, ys, 2, delay=delays), te))
+        mi = self.loop.run_until_complete(aio.mutual_info(xs, ys, delay=delays))
+        self.assertTrue(np.allclose(mutual_info(xs, ys, delay=delays), mi))
+
+    def test_per_trial(self):
+        xs = np.random.randint(0, 2, (aio.TRIAL_CHUNK + 10, 20))
+        ys = np.random.randint(0, 2, (aio.TRIAL_CHUNK + 10, 20))
+        ai = self.loop.run_until_complete(aio.active_info(xs, 2, per_trial=True))
+        self.assertTrue(np.allclose(active_info(xs, 2, per_trial=True), ai))
+        te = self.loop.run_until_complete(aio.transfer_entropy(xs, ys, 2, per_trial=True))
+        self.assertTrue(np.allclose(transfer_entropy(xs, ys, 2, per_trial=True), te))
+
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(aio.active_info([], 2))
+
+    def test_concurrency(self):
+        aio.configure(threads=2, concurrency=1)
+        start = time.time()
+
+        async def go():
+            return await asyncio.gather(*[aio.run(time.sleep, 0.1) for _ in range(3)])
+
+        self.loop.run_until_complete(go())
+        self.assertGreaterEqual(time.time() - start, 0.3)
+
+    def test_cancel_holds_slot(self):
+        aio.configure(threads=2, concurrency=1)
+        start = time.time()
+        task = self.loop.create_task(aio.run(time.sleep, 0.2))
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(task)
+        self.loop.run_until_complete(aio.run(time.sleep, 0))
+        self.assertGreaterEqual(time.time() - start, 0.2)
+
+    def test_cancel_map(self):
+        calls = []
+
+        def measure(x):
+            calls.append(x)
+            time.sleep(0.05)
+            return x
+
+        task = self.loop.create_task(aio.map(measure, range(100)))
+        self.loop.run_until_complete(asyncio.sleep(0.12))
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(task)
+        self.loop.run_until_complete(asyncio.sleep(0.1))
+        self.assertLess(len(calls), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import unittest
+import numpy as np
+from pyinform import batch
+from pyinform.activeinfo import active_info
+from pyinform.error import InformError
+from pyinform.transferentropy import transfer_entropy
+
+
+class TestBatchMap(unittest.TestCase):
+    def test_map_invalid_threads(self):
+        with self.assertRaises(ValueError):
+            batch.map(active_info, [[0, 1, 0, 1]], threads=0, k=1)
+
+    def test_map_empty(self):
+        self.assertEqual([], batch.map(active_info, [], threads=2, k=1))
+
+    def test_map_series(self):
+        series = [np.random.randint(0, 2, 100) for _ in range(20)]
+        expect = [active_info(xs, 2) for xs in series]
+        for threads in [1, 3, None]:
+            self.assertEqual(expect, batch.map(active_info, series, threads=threads, k=2))
+
+    def test_map_tuples(self):
+        pairs = [(np.random.randint(0, 2, 100), np.random.randint(0, 2, 100)) for _ in range(20)]
+        expect = [transfer_entropy(xs, ys, 2) for xs, ys in pairs]
+        self.assertEqual(expect, batch.map(transfer_entropy, pairs, threads=4, k=2))
+
+    def test_map_generator(self):
+        series = (np.random.randint(0, 2, 100) for _ in range(50))
+        self.assertEqual(50, len(batch.map(active_info, series, threads=2, k=1)))
+
+    def test_map_error(self):
+        series = [[0, 1, 0, 1], [0, 1, 0, 1], [-1, 0, 1, 0]]
+        with self.assertRaises(InformError):
+            batch.map(active_info, series, threads=2, k=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
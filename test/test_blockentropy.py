@@ -2,6 +2,7 @@
 # Use of this source code is governed by a MIT
 # license that can be found in the LICENSE file.
 import unittest
+import numpy as np
 from pyinform.error import InformError
 from pyinform.blockentropy import block_entropy
 
@@ -91,6 +92,17 @@ class TestBlockEntropy(unittest.TestCase):
               [1, 1, 0, 0, 0, 1, 1, 2, 2]]
         self.assertAlmostEqual(3.010977, block_entropy(xs, 2), places=6)
 
+    def test_block_entropy_explicit_base(self):
+        xs = [[3, 3, 3, 2, 1, 0, 0, 0, 1], [2, 2, 3, 3, 3, 3, 2, 1, 0]]
+        self.assertAlmostEqual(block_entropy(xs, 2), block_entropy(xs, 2, b=4), places=6)
+        self.assertAlmostEqual(block_entropy(xs, 2), block_entropy(xs, 2, b=8), places=6)
+
+        with self.assertRaises(InformError):
+            block_entropy(xs, 2, b=3)
+
+        with self.assertRaises(ValueError):
+            block_entropy([], 2, b=2)
+
 
 class TestLocalBlockEntropy(unittest.TestCase):
     def test_block_entropy_empty(self):
@@ -181,5 +193,105 @@ class TestLocalBlockEntropy(unittest.TestCase):
                                block_entropy(xs, 2, local=True).mean(), places=6)
 
 
+class TestEstimatedBlockEntropy(unittest.TestCase):
+    def test_block_entropy_estimator_invalid(self):
+        series = [0, 0, 1, 1, 1, 1, 0, 0, 0]
+        with self.assertRaises(ValueError):
+            block_entropy(series, 2, estimator="grassberger")
+
+        with self.assertRaises(ValueError):
+            block_entropy(series, 2, local=True, estimator="miller-madow")
+
+        with self.assertRaises(ValueError):
+            block_entropy(series, 9, estimator="miller-madow")
+
+        with self.assertRaises(ValueError):
+            block_entropy(series, 0, estimator="miller-madow")
+
+        with self.assertRaises(ValueError):
+            block_entropy(series, 2, b=1, estimator="miller-madow")
+
+    def test_block_entropy_miller_madow(self):
+        series = [[0, 0, 1, 1, 1, 1, 0, 0, 0], [1, 0, 0, 1, 0, 0, 1, 0, 0]]
+        # 16 blocks of 4 distinct states
+        correction = 3.0 / (2.0 * 16 * np.log(2.0))
+        self.assertAlmostEqual(block_entropy(series, 2) + correction,
+                               block_entropy(series, 2, estimator="miller-madow"), places=6)
+
+    def test_block_entropy_jackknife(self):
+        series = np.random.randint(0, 2, 50)
+        blocks = [tuple(series[i:i + 3]) for i in range(48)]
+        loo = []
+        for i in range(48):
+            rest = blocks[:i] + blocks[i + 1:]
+            p = np.asarray([rest.count(x) for x in set(rest)], dtype=np.float64) / 47
+            loo.append(-np.sum(p * np.log2(p)))
+        expect = 48 * block_entropy(series, 3) - 47.0 / 48 * np.sum(loo)
+        self.assertAlmostEqual(expect, block_entropy(series, 3, estimator="jackknife"), places=6)
+
+    def test_block_entropy_estimators_converge(self):
+        series = np.random.randint(0, 4, (10, 10000))
+        for estimator in ["miller-madow", "jackknife", "chao-shen", "nsb"]:
+            self.assertAlmostEqual(block_entropy(series, 2),
+                                   block_entropy(series, 2, estimator=estimator), delta=0.01)
+
+    def test_block_entropy_estimators_undersampled(self):
+        series = np.random.randint(0, 2, 300)
+        plugin = block_entropy(series, 8)
+        for estimator in ["miller-madow", "jackknife", "chao-shen", "nsb"]:
+            estimate = block_entropy(series, 8, estimator=estimator)
+            self.assertGreater(estimate, plugin)
+            self.assertLess(abs(8.0 - estimate), abs(8.0 - plugin))
+
+
+class TestPerTrialBlockEntropy(unittest.TestCase):
+    def test_block_entropy_per_trial_invalid(self):
+        series = [[0, 0, 1, 1, 1, 1, 0, 0, 0], [1, 0, 0, 1, 0, 0, 1, 0, 0]]
+        with self.assertRaises(ValueError):
+            block_entropy(series, 2, local=True, per_trial=True)
+
+        with self.assertRaises(ValueError):
+            block_entropy(series, 2, estimator="nsb", per_trial=True)
+
+        with self.assertRaises(ValueError):
+            block_entropy(series, 0, per_trial=True)
+
+    def test_block_entropy_per_trial_rows(self):
+        series = np.random.randint(0, 4, (20, 50))
+        expect = [block_entropy(xs, 3) for xs in series]
+        got = block_entropy(series, 3, per_trial=True)
+        self.assertEqual((20,), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+
+class TestEnsembleBlockEntropy(unittest.TestCase):
+    def test_block_entropy_ensemble_invalid(self):
+        series = [[0, 0, 1, 1, 1, 1, 0, 0, 0], [1, 0, 0, 1, 0, 0, 1, 0, 0]]
+        with self.assertRaises(ValueError):
+            block_entropy(series, 2, per_trial=True, ensemble=True)
+
+        with self.assertRaises(ValueError):
+            block_entropy(series, 2, estimator="nsb", ensemble=True)
+
+        with self.assertRaises(ValueError):
+            block_entropy(series, 0, ensemble=True)
+
+    def test_block_entropy_ensemble_time_steps(self):
+        series = np.random.randint(0, 3, (40, 12))
+        pairs = series[:, :-1] * 3 + series[:, 1:]
+        expect = np.empty((40, 11))
+        for t in range(11):
+            _, inverse, counts = np.unique(pairs[:, t], return_inverse=True, return_counts=True)
+            expect[:, t] = -np.log2(counts[inverse.ravel()] / 40.0)
+
+        got = block_entropy(series, 2, ensemble=True)
+        self.assertEqual((11,), got.shape)
+        self.assertTrue(np.allclose(np.mean(expect, axis=0), got))
+
+        got = block_entropy(series, 2, local=True, ensemble=True)
+        self.assertEqual((40, 11), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -91,6 +91,20 @@ class TestConditionalEntropy(unittest.TestCase):
 
         self.assertAlmostEqual(expect, got)
 
+    def test_conditional_entropy_explicit_base(self):
+        xs = [0, 0, 1, 1, 2, 1, 1, 0, 0]
+        ys = [0, 0, 0, 1, 1, 1, 0, 0, 0]
+        self.assertAlmostEqual(conditional_entropy(xs, ys),
+                               conditional_entropy(xs, ys, b=(3, 2)), places=6)
+        self.assertAlmostEqual(conditional_entropy(xs, ys),
+                               conditional_entropy(xs, ys, b=4), places=6)
+
+        with self.assertRaises(InformError):
+            conditional_entropy(xs, ys, b=2)
+
+        with self.assertRaises(ValueError):
+            conditional_entropy([], [], b=2)
+
 
 class TestLocalConditionalEntropy(unittest.TestCase):
     def test_conditional_entropy_empty(self):
@@ -0,0 +1,124 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import unittest
+import numpy as np
+from pyinform.conditionalentropy import conditional_entropy
+from pyinform.conditionalmutualinfo import (conditional_mutual_info,
+                                            conditional_mutual_info_batch)
+from pyinform.dist import Dist
+from pyinform.mutualinfo import mutual_info
+from pyinform import shannon
+
+
+class TestConditionalMutualInfo(unittest.TestCase):
+    def test_conditional_mutual_info_empty(self):
+        with self.assertRaises(ValueError):
+            conditional_mutual_info([], [], [])
+
+    def test_conditional_mutual_info_shapes(self):
+        with self.assertRaises(ValueError):
+            conditional_mutual_info([0, 1, 1], [0, 1], [0, 1, 1])
+
+        with self.assertRaises(ValueError):
+            conditional_mutual_info([0, 1, 1], [0, 1, 1], [0, 1])
+
+        with self.assertRaises(ValueError):
+            conditional_mutual_info([0, 1, 1], [0, 1, 1], [[[0, 1, 1]]])
+
+    def test_conditional_mutual_info_negative_states(self):
+        with self.assertRaises(ValueError):
+            conditional_mutual_info([-1, 0, 0], [0, 0, 1], [0, 1, 1])
+
+        with self.assertRaises(ValueError):
+            conditional_mutual_info([1, 0, 0], [0, 0, 1], [0, -1, 1])
+
+    def test_conditional_mutual_info_explicit_base(self):
+        with self.assertRaises(ValueError):
+            conditional_mutual_info([2, 0, 0], [0, 0, 1], [0, 1, 1], b=2)
+
+        xs = np.random.randint(0, 3, 50)
+        ys = np.random.randint(0, 2, 50)
+        zs = np.random.randint(0, 4, (2, 50))
+        expect = conditional_mutual_info(xs, ys, zs)
+        self.assertAlmostEqual(expect, conditional_mutual_info(xs, ys, zs, b=4), places=6)
+        self.assertAlmostEqual(expect, conditional_mutual_info(xs, ys, zs, b=(3, 2, 4)), places=6)
+        self.assertAlmostEqual(expect, conditional_mutual_info(xs, ys, zs, b=(3, 2, [4, 5])), places=6)
+
+    def test_conditional_mutual_info_dist(self):
+        xs = np.random.randint(0, 3, 100)
+        ys = np.random.randint(0, 2, 100)
+        zs = np.random.randint(0, 2, 100)
+
+        p_xyz, p_xz, p_yz, p_z = Dist(12), Dist(6), Dist(4), Dist(2)
+        for x, y, z in zip(xs, ys, zs):
+            p_xyz.tick(4 * x + 2 * y + z)
+            p_xz.tick(2 * x + z)
+            p_yz.tick(2 * y + z)
+            p_z.tick(z)
+
+        expect = shannon.conditional_mutual_info(p_xyz, p_xz, p_yz, p_z)
+        self.assertAlmostEqual(expect, conditional_mutual_info(xs, ys, zs), places=6)
+        self.assertAlmostEqual(expect, conditional_mutual_info(xs, ys, zs, local=True).mean(), places=6)
+
+    def test_conditional_mutual_info_constant_condition(self):
+        xs = np.random.randint(0, 3, 100)
+        ys = np.random.randint(0, 3, 100)
+        zs = np.zeros(100, dtype=np.int32)
+        self.assertAlmostEqual(mutual_info(xs, ys), conditional_mutual_info(xs, ys, zs), places=6)
+
+    def test_conditional_mutual_info_self(self):
+        xs = np.random.randint(0, 3, 100)
+        zs = np.random.randint(0, 3, 100)
+        self.assertAlmostEqual(conditional_entropy(zs, xs), conditional_mutual_info(xs, xs, zs), places=6)
+
+    def test_conditional_mutual_info_multiple_conditions(self):
+        xs = np.random.randint(0, 2, 100)
+        ys = np.random.randint(0, 2, 100)
+        zs = np.random.randint(0, 2, (2, 100))
+        ws = 2 * zs[0] + zs[1]
+        self.assertAlmostEqual(conditional_mutual_info(xs, ys, ws),
+                               conditional_mutual_info(xs, ys, zs), places=6)
+
+    def test_conditional_mutual_info_2D(self):
+        xs = np.random.randint(0, 2, (4, 25))
+        ys = np.random.randint(0, 2, (4, 25))
+        zs = np.random.randint(0, 2, (4, 25))
+        expect = conditional_mutual_info(xs.ravel(), ys.ravel(), zs.ravel())
+        self.assertAlmostEqual(expect, conditional_mutual_info(xs, ys, zs), places=6)
+        self.assertEqual((4, 25), conditional_mutual_info(xs, ys, zs, local=True).shape)
+
+    def test_conditional_mutual_info_local(self):
+        xs = [0, 0, 1, 1, 1, 1, 0, 0, 0]
+        ys = [0, 1, 1, 1, 1, 0, 0, 0, 1]
+        zs = [0, 0, 1, 1, 0, 0, 1, 1, 1]
+        expect = [0.0, 0.0, 0.736966, 0.736966, 0.0, 0.0, 0.736966, 0.736966, -0.847997]
+        got = conditional_mutual_info(xs, ys, zs, local=True)
+        for u, v in zip(expect, got):
+            self.assertAlmostEqual(u, v, places=6)
+        self.assertAlmostEqual(0.233318, conditional_mutual_info(xs, ys, zs), places=6)
+
+
+class TestConditionalMutualInfoBatch(unittest.TestCase):
+    def test_conditional_mutual_info_batch_shapes(self):
+        with self.assertRaises(ValueError):
+            conditional_mutual_info_batch([0, 1, 1], [0, 1, 1], [0, 1, 1])
+
+        with self.assertRaises(ValueError):
+            conditional_mutual_info_batch([[0, 1, 1]], [[0, 1]], [0, 1, 1])
+
+        with self.assertRaises(ValueError):
+            conditional_mutual_info_batch([[0, 1, 1]], [[0, 1, 1]], [0, 1])
+
+    def test_conditional_mutual_info_batch(self):
+        xs = np.random.randint(0, 3, (5, 100))
+        ys = np.random.randint(0, 2, (5, 100))
+        zs = np.random.randint(0, 4, (2, 100))
+        got = conditional_mutual_info_batch(xs, ys, zs)
+        self.assertEqual((5,), got.shape)
+        for x, y, value in zip(xs, ys, got):
+            self.assertAlmostEqual(conditional_mutual_info(x, y, zs), value, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 # Use of this source code is governed by a MIT
 # license that can be found in the LICENSE file.
 import unittest
+import numpy as np
 from pyinform.error import InformError
 from pyinform.entropyrate import entropy_rate
 
@@ -91,6 +92,17 @@ class TestEntropyRate(unittest.TestCase):
               [1, 1, 0, 0, 0, 1, 1, 2, 2]]
         self.assertAlmostEqual(0.544468, entropy_rate(xs, 2), places=6)
 
+    def test_entropy_rate_explicit_base(self):
+        xs = [[3, 3, 3, 2, 1, 0, 0, 0, 1], [2, 2, 3, 3, 3, 3, 2, 1, 0]]
+        self.assertAlmostEqual(entropy_rate(xs, 2), entropy_rate(xs, 2, b=4), places=6)
+        self.assertAlmostEqual(entropy_rate(xs, 2), entropy_rate(xs, 2, b=8), places=6)
+
+        with self.assertRaises(InformError):
+            entropy_rate(xs, 2, b=3)
+
+        with self.assertRaises(ValueError):
+            entropy_rate([], 2, b=2)
+
 
 class TestLocalEntropyRate(unittest.TestCase):
     def test_entropy_rate_empty(self):
@@ -181,5 +193,87 @@ class TestLocalEntropyRate(unittest.TestCase):
                                entropy_rate(xs, 2, local=True).mean(), places=6)
 
 
+class TestEstimatedEntropyRate(unittest.TestCase):
+    def test_entropy_rate_estimator_invalid(self):
+        series = [0, 0, 1, 1, 1, 1, 0, 0, 0]
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 2, estimator="grassberger")
+
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 2, local=True, estimator="nsb")
+
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 9, estimator="nsb")
+
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 2, b=1, estimator="nsb")
+
+    def test_entropy_rate_miller_madow(self):
+        series = [[0, 0, 1, 1, 1, 1, 0, 0, 0], [1, 0, 0, 1, 0, 0, 1, 0, 0]]
+        # 14 histories of 4 distinct states, and of 7 distinct states with the next state
+        correction = (6.0 - 3.0) / (2.0 * 14 * np.log(2.0))
+        self.assertAlmostEqual(entropy_rate(series, 2) + correction,
+                               entropy_rate(series, 2, estimator="miller-madow"), places=6)
+
+    def test_entropy_rate_estimators_converge(self):
+        series = np.random.randint(0, 2, (10, 10000))
+        for estimator in ["miller-madow", "jackknife", "chao-shen", "nsb"]:
+            self.assertAlmostEqual(entropy_rate(series, 2),
+                                   entropy_rate(series, 2, estimator=estimator), delta=0.01)
+
+    def test_entropy_rate_estimators_undersampled(self):
+        series = np.random.randint(0, 2, 300)
+        plugin = entropy_rate(series, 6)
+        for estimator in ["miller-madow", "nsb"]:
+            estimate = entropy_rate(series, 6, estimator=estimator)
+            self.assertGreater(estimate, plugin)
+            self.assertLess(abs(1.0 - estimate), abs(1.0 - plugin))
+
+
+class TestPerTrialEntropyRate(unittest.TestCase):
+    def test_entropy_rate_per_trial_invalid(self):
+        series = [[0, 0, 1, 1, 1, 1, 0, 0, 0], [1, 0, 0, 1, 0, 0, 1, 0, 0]]
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 2, local=True, per_trial=True)
+
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 2, estimator="miller-madow", per_trial=True)
+
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 9, per_trial=True)
+
+    def test_entropy_rate_per_trial_rows(self):
+        series = np.random.randint(0, 4, (20, 50))
+        expect = [entropy_rate(xs, 2) for xs in series]
+        got = entropy_rate(series, 2, per_trial=True)
+        self.assertEqual((20,), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+
+class TestEnsembleEntropyRate(unittest.TestCase):
+    def test_entropy_rate_ensemble_invalid(self):
+        series = [[0, 0, 1, 1, 1, 1, 0, 0, 0], [1, 0, 0, 1, 0, 0, 1, 0, 0]]
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 2, per_trial=True, ensemble=True)
+
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 2, estimator="miller-madow", ensemble=True)
+
+        with self.assertRaises(ValueError):
+            entropy_rate(series, 9, ensemble=True)
+
+    def test_entropy_rate_ensemble_time_steps(self):
+        series = np.random.randint(0, 3, (40, 12))
+        expect = [entropy_rate(series[:, t:t + 3], 2) for t in range(10)]
+        got = entropy_rate(series, 2, ensemble=True)
+        self.assertEqual((10,), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+        expect = np.hstack([entropy_rate(series[:, t:t + 3], 2, local=True) for t in range(10)])
+        got = entropy_rate(series, 2, local=True, ensemble=True)
+        self.assertEqual((40, 10), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -65,6 +65,14 @@ class TestError(unittest.TestCase):
             e = sys.exc_info()[1]
             self.assertEqual(1000, e.error_code.value)
 
+    def test_error_guard_agrees_with_inform(self):
+        for code in range(-20, 20):
+            if err.is_failure(code):
+                with self.assertRaises(err.InformError):
+                    err.error_guard(err.ErrorCode(code))
+            else:
+                err.error_guard(err.ErrorCode(code))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,151 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import unittest
+import numpy as np
+from pyinform import gaussian
+
+
+def coupled(n, seed, trials=1):
+    rng = np.random.RandomState(seed)
+    source, target = rng.normal(size=(trials, n)), np.zeros((trials, n))
+    for i in range(1, n):
+        target[:, i] = 0.5 * target[:, i - 1] + 0.8 * source[:, i - 1] + rng.normal(size=trials)
+    return source, target
+
+
+class TestMutualInfo(unittest.TestCase):
+    def test_mutual_info_invalid(self):
+        with self.assertRaises(ValueError):
+            gaussian.mutual_info([], [])
+        with self.assertRaises(ValueError):
+            gaussian.mutual_info([0.1, 0.2, 0.3], [0.1, 0.2])
+        with self.assertRaises(ValueError):
+            gaussian.mutual_info([0.1, np.inf, 0.3], [0.1, 0.2, 0.3])
+        with self.assertRaises(ValueError):
+            gaussian.mutual_info([1.0, 1.0, 1.0], [0.1, 0.2, 0.3])
+        with self.assertRaises(ValueError):
+            gaussian.mutual_info([0.1, 0.2, 0.3], [0.3, 0.2, 0.1], delay=3)
+        with self.assertRaises(ValueError):
+            gaussian.mutual_info([0.1, 0.2, 0.3], [0.3, 0.2, 0.1], delay=[0, 1], local=True)
+
+    def test_mutual_info_correlation(self):
+        rng = np.random.RandomState(2019)
+        xs = rng.normal(size=1000)
+        ys = xs + rng.normal(size=1000)
+        rho = np.corrcoef(xs, ys)[0, 1]
+        self.assertAlmostEqual(-0.5 * np.log2(1 - rho**2), gaussian.mutual_info(xs, ys))
+
+    def test_mutual_info_local(self):
+        source, target = coupled(200, seed=1, trials=3)
+        local = gaussian.mutual_info(source, target, local=True)
+        self.assertEqual((3, 200), local.shape)
+        self.assertAlmostEqual(gaussian.mutual_info(source, target), np.mean(local))
+
+    def test_mutual_info_delay(self):
+        source, target = coupled(200, seed=2, trials=3)
+        profile = gaussian.mutual_info(source, target, delay=[0, 1, 2])
+        for d, mi in enumerate(profile):
+            self.assertAlmostEqual(gaussian.mutual_info(source[:, :200 - d], target[:, d:]), mi)
+        self.assertTrue(profile[1] > 0.2)
+
+    def test_mutual_info_matrix(self):
+        rng = np.random.RandomState(2019)
+        data = rng.normal(size=(4, 500))
+        data[1] += data[0]
+        mi = gaussian.mutual_info_matrix(data)
+        self.assertEqual((4, 4), mi.shape)
+        for i in range(4):
+            self.assertAlmostEqual(0.5 * np.log2(2 * np.pi * np.e * np.var(data[i])), mi[i, i])
+            for j in range(4):
+                if i != j:
+                    self.assertAlmostEqual(gaussian.mutual_info(data[i], data[j]), mi[i, j])
+        self.assertTrue(np.allclose(mi, gaussian.mutual_info_matrix(data.T, axis=1)))
+
+
+class TestTransferEntropy(unittest.TestCase):
+    def test_transfer_entropy_invalid(self):
+        source, target = coupled(20, seed=1)
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy(source, target, k=0)
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy(source, target, k=20)
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy(source, target, k=2, delay=18)
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy(source, target, k=2, delay=-1)
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy(source, target, k=2, delay=[0, 1], local=True)
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy(source, target, k=2, condition=target[:, :-1])
+
+    def test_transfer_entropy_autoregressive(self):
+        source, target = coupled(20000, seed=2019)
+        self.assertAlmostEqual(0.5 * np.log2(1.64), gaussian.transfer_entropy(source, target, k=1), delta=0.01)
+        self.assertAlmostEqual(0.0, gaussian.transfer_entropy(target, source, k=1), delta=0.01)
+
+    def test_transfer_entropy_regression(self):
+        source, target = coupled(300, seed=3)
+        x, y = target[0], source[0]
+        design = np.column_stack([np.ones(298), x[1:-1], x[:-2]])
+        restricted = np.linalg.lstsq(design, x[2:], rcond=None)[1][0]
+        design = np.column_stack([design, y[1:-1]])
+        full = np.linalg.lstsq(design, x[2:], rcond=None)[1][0]
+        self.assertAlmostEqual(0.5 * np.log2(restricted / full), gaussian.transfer_entropy(y, x, k=2))
+
+    def test_transfer_entropy_local(self):
+        source, target = coupled(200, seed=4, trials=3)
+        local = gaussian.transfer_entropy(source, target, k=2, local=True)
+        self.assertEqual((3, 198), local.shape)
+        self.assertAlmostEqual(gaussian.transfer_entropy(source, target, k=2), np.mean(local))
+
+    def test_transfer_entropy_delay(self):
+        source, target = coupled(200, seed=5, trials=3)
+        profile = gaussian.transfer_entropy(source, target, k=2, delay=[0, 1, 2])
+        for d, te in enumerate(profile):
+            self.assertAlmostEqual(gaussian.transfer_entropy(source[:, :200 - d], target[:, d:], k=2), te)
+
+    def test_transfer_entropy_condition(self):
+        source, target = coupled(500, seed=6)
+        x, y = target[0], source[0]
+        zs = np.random.RandomState(7).normal(size=(2, 1, 500))
+        design = np.column_stack([np.ones(499), x[:-1], zs[0, 0, :-1], zs[1, 0, :-1]])
+        restricted = np.linalg.lstsq(design, x[1:], rcond=None)[1][0]
+        design = np.column_stack([design, y[:-1]])
+        full = np.linalg.lstsq(design, x[1:], rcond=None)[1][0]
+        self.assertAlmostEqual(0.5 * np.log2(restricted / full),
+                               gaussian.transfer_entropy(source, target, k=1, condition=zs))
+
+    def test_transfer_entropy_matrix(self):
+        rng = np.random.RandomState(2019)
+        data = rng.normal(size=(5, 3, 200))
+        data[2, :, 1:] += 0.7 * data[0, :, :-1]
+        data[4, :, 3:] += 0.7 * data[1, :, :-3]
+        for k, delay in [(1, 0), (2, 0), (2, 1), (1, 2)]:
+            te = gaussian.transfer_entropy_matrix(data, k, delay=delay)
+            self.assertEqual((5, 5), te.shape)
+            for i in range(5):
+                self.assertEqual(0.0, te[i, i])
+                for j in range(5):
+                    if i != j:
+                        self.assertAlmostEqual(gaussian.transfer_entropy(data[i], data[j], k, delay=delay), te[i, j])
+
+        profile = gaussian.transfer_entropy_matrix(data, 1, delay=[0, 1, 2])
+        self.assertEqual((3, 5, 5), profile.shape)
+        self.assertTrue(np.allclose(profile[2], gaussian.transfer_entropy_matrix(data, 1, delay=2)))
+        self.assertEqual((0, 2), np.unravel_index(np.argmax(profile[0]), (5, 5)))
+        self.assertEqual((1, 4), np.unravel_index(np.argmax(profile[2]), (5, 5)))
+
+    def test_transfer_entropy_matrix_invalid(self):
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy_matrix(np.zeros(10), 1)
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy_matrix(np.random.normal(size=(3, 10)), 0)
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy_matrix(np.random.normal(size=(3, 10)), 2, delay=8)
+        with self.assertRaises(ValueError):
+            gaussian.transfer_entropy_matrix(np.ones((3, 10)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
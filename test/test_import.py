@@ -11,6 +11,38 @@ class TestImport(unittest.TestCase):
         except ImportError:
             self.fail("cannot import pyinform package")
 
+    def test_libpath_is_loaded_library(self):
+        import pyinform
+        self.assertEqual(pyinform._inform._name, pyinform.get_libpath())
+
+    def test_libpath_is_cached(self):
+        import os
+        import pyinform
+        path = pyinform.get_libpath()
+        previous = os.environ.get(pyinform.LIBINFORM_ENV)
+        os.environ[pyinform.LIBINFORM_ENV] = "/no/such/libinform.so"
+        try:
+            self.assertEqual(path, pyinform.get_libpath())
+        finally:
+            if previous is None:
+                del os.environ[pyinform.LIBINFORM_ENV]
+            else:
+                os.environ[pyinform.LIBINFORM_ENV] = previous
+
+    def test_libversion(self):
+        import pyinform
+        version = pyinform.get_libversion()
+        if version is not None:
+            self.assertIsInstance(version, tuple)
+            self.assertTrue(all(isinstance(x, int) for x in version))
+
+    def test_parse_libversion(self):
+        from pyinform import _parse_libversion
+        self.assertEqual((1, 0, 1), _parse_libversion("/a/b/libinform.so.1.0.1"))
+        self.assertEqual((1, 0, 1), _parse_libversion("libinform.1.0.1.dylib"))
+        self.assertEqual((1,), _parse_libversion("libinform.so.1"))
+        self.assertIsNone(_parse_libversion("inform.dll"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,81 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import unittest
+import numpy as np
+from pyinform import instrument
+from pyinform.activeinfo import active_info
+from pyinform.mutualinfo import mutual_info
+from pyinform.transferentropy import transfer_entropy
+
+
+class TestInstrument(unittest.TestCase):
+    def test_disabled(self):
+        self.assertIs(instrument._null_probe, instrument.probe("active_info"))
+
+    def test_record(self):
+        with instrument.record() as records:
+            active_info([0, 0, 1, 1, 1, 1, 0, 0, 0], k=2)
+        self.assertEqual(1, len(records))
+
+        rec = records[0]
+        self.assertEqual("active_info", rec.measure)
+        self.assertEqual((9,), rec.sizes)
+        self.assertEqual((2,), rec.bases)
+        self.assertEqual(2, rec.k)
+        self.assertEqual({"convert", "base", "kernel"}, set(rec.phases))
+        self.assertTrue(all(t >= 0.0 for t in rec.phases.values()))
+
+    def test_record_removes_hook(self):
+        with instrument.record():
+            pass
+        self.assertEqual([], instrument._hooks)
+
+        active_info([0, 0, 1, 1, 1, 1, 0, 0, 0], k=2)
+        self.assertEqual([], instrument._hooks)
+
+    def test_record_local(self):
+        with instrument.record() as records:
+            ai = active_info([0, 0, 1, 1, 1, 1, 0, 0, 0], k=2, local=True)
+        rec = records[0]
+        self.assertIn("alloc", rec.phases)
+        self.assertEqual(ai.nbytes + 9 * 4, rec.nbytes)
+
+    def test_record_no_conversion(self):
+        xs = np.asarray([0, 0, 1, 1, 1, 1, 0, 0, 0], dtype=np.int32)
+        with instrument.record() as records:
+            active_info(xs, k=2)
+        self.assertEqual(0, records[0].nbytes)
+
+    def test_record_transfer_entropy(self):
+        xs = [0, 1, 1, 1, 1, 0, 0, 0, 0]
+        ys = [0, 0, 1, 1, 1, 1, 0, 0, 0]
+        ws = [0, 1, 1, 1, 1, 0, 1, 1, 1]
+        with instrument.record() as records:
+            transfer_entropy(xs, ys, k=2)
+            transfer_entropy(xs, ys, k=2, condition=ws)
+        self.assertEqual(2, len(records))
+        self.assertEqual((9, 9), records[0].sizes)
+        self.assertEqual((9, 9, 9), records[1].sizes)
+
+    def test_record_as_dict(self):
+        with instrument.record() as records:
+            mutual_info([0, 0, 1, 1], [0, 1, 1, 2])
+        rec = records[0]._asdict()
+        self.assertEqual("mutual_info", rec["measure"])
+        self.assertEqual((2, 3), rec["bases"])
+        self.assertIsNone(rec["k"])
+
+    def test_hook(self):
+        records = []
+        instrument.add_hook(records.append)
+        try:
+            active_info([0, 0, 1, 1, 1, 1, 0, 0, 0], k=2)
+            active_info([0, 0, 1, 1, 1, 1, 0, 0, 0], k=1)
+        finally:
+            instrument.remove_hook(records.append)
+        self.assertEqual([2, 1], [rec.k for rec in records])
+
+
+if __name__ == "__main__":
+    unittest.main()
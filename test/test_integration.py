@@ -0,0 +1,133 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import unittest
+import numpy as np
+from collections import Counter
+from pyinform import _histogram
+from pyinform.integration import integration, minimum_information_partition, subset_entropies
+from pyinform.utils import partitions
+
+
+def entropy_reference(rows):
+    n = float(len(rows[0]))
+    return -sum(c / n * np.log2(c / n) for c in Counter(zip(*rows)).values())
+
+
+class TestSubsetEntropies(unittest.TestCase):
+    def test_subset_entropies_empty(self):
+        with self.assertRaises(ValueError):
+            subset_entropies([])
+        with self.assertRaises(ValueError):
+            subset_entropies([[]])
+
+    def test_subset_entropies_dimensions(self):
+        with self.assertRaises(ValueError):
+            subset_entropies([0, 1, 1])
+
+    def test_subset_entropies_invalid_base(self):
+        with self.assertRaises(ValueError):
+            subset_entropies([[0, 1, 2], [0, 1, 1]], b=2)
+        with self.assertRaises(ValueError):
+            subset_entropies([[0, 1, 2], [0, 1, 1]], b=[3, 2, 2])
+
+    def test_subset_entropies(self):
+        xs = np.random.RandomState(2019).randint(0, 3, size=(5, 60))
+        h = subset_entropies(xs)
+        self.assertEqual((32,), h.shape)
+        self.assertEqual(0.0, h[0])
+        for m in range(1, 32):
+            self.assertAlmostEqual(entropy_reference([x for i, x in enumerate(xs) if m >> i & 1]), h[m])
+        self.assertTrue(np.allclose(h, subset_entropies(xs, b=[3, 4, 3, 5, 3])))
+
+    def test_subset_entropies_initial_conditions(self):
+        xs = np.random.RandomState(2019).randint(0, 2, size=(3, 4, 20))
+        h = subset_entropies(xs)
+        self.assertTrue(np.allclose(h, subset_entropies(xs.reshape(3, 80))))
+
+    def test_subset_entropies_compress(self):
+        xs = np.random.RandomState(2019).randint(0, 4, size=(6, 100))
+        expect = subset_entropies(xs)
+        dense_size = _histogram.DENSE_SIZE
+        try:
+            _histogram.DENSE_SIZE = 16
+            self.assertTrue(np.allclose(expect, subset_entropies(xs)))
+        finally:
+            _histogram.DENSE_SIZE = dense_size
+
+    def test_subset_entropies_processes(self):
+        xs = np.random.RandomState(2019).randint(0, 2, size=(7, 100))
+        self.assertTrue(np.allclose(subset_entropies(xs), subset_entropies(xs, processes=2)))
+
+
+class TestIntegration(unittest.TestCase):
+    def test_integration_invalid_partition(self):
+        xs = [[0, 1, 1, 0], [1, 1, 0, 0], [0, 0, 0, 1]]
+        with self.assertRaises(ValueError):
+            integration(xs, [(1, 2)])
+        with self.assertRaises(ValueError):
+            integration(xs, [(3, 6)])
+        with self.assertRaises(ValueError):
+            integration(xs, [(7, 0)])
+
+    def test_integration_bipartitions(self):
+        xs = np.random.RandomState(2019).randint(0, 2, size=(5, 50))
+        expect = integration(xs, partitions(5, blocks=2))
+        self.assertEqual((15,), expect.shape)
+        self.assertTrue(np.allclose(expect, integration(xs)))
+
+    def test_integration(self):
+        xs = np.random.RandomState(2019).randint(0, 3, size=(4, 50))
+        whole = entropy_reference(xs)
+        ps = list(partitions(4))
+        expect = [sum(entropy_reference([xs[i] for i in range(4) if m >> i & 1]) for m in p) - whole for p in ps]
+        self.assertTrue(np.allclose(expect, integration(xs, ps)))
+        self.assertAlmostEqual(expect[1], integration(xs, [[[0, 1, 2], [3]]])[0])
+
+    def test_integration_independent(self):
+        xs = [[0, 0, 1, 1], [0, 1, 0, 1], [0, 1, 0, 1]]
+        self.assertTrue(np.allclose([1.0, 1.0, 0.0], integration(xs)))
+
+
+class TestMinimumInformationPartition(unittest.TestCase):
+    def test_minimum_information_partition_invalid(self):
+        with self.assertRaises(ValueError):
+            minimum_information_partition([[0, 1, 1, 0]])
+        with self.assertRaises(ValueError):
+            minimum_information_partition([[0, 1, 1, 0], [1, 1, 0, 0]], blocks=3)
+        with self.assertRaises(ValueError):
+            minimum_information_partition([[0, 1, 1, 0], [1, 1, 0, 0]], blocks=1)
+
+    def test_minimum_information_partition(self):
+        xs = np.random.RandomState(2019).randint(0, 2, size=(5, 40))
+        h = subset_entropies(xs)
+        candidates = [p for p in partitions(5) if len(p) > 1]
+        infos = integration(xs, candidates)
+        for blocks in [None, 2, 3, 5]:
+            for normalize in [True, False]:
+                scores = []
+                for p, info in zip(candidates, infos):
+                    if blocks is not None and len(p) != blocks:
+                        scores.append(np.inf)
+                    elif normalize:
+                        scores.append(info / ((len(p) - 1) * min(h[m] for m in p)))
+                    else:
+                        scores.append(info)
+                i = int(np.argmin(scores))
+                partition, info = minimum_information_partition(xs, blocks=blocks, normalize=normalize)
+                self.assertEqual(candidates[i], partition)
+                self.assertAlmostEqual(infos[i], info)
+
+    def test_minimum_information_partition_independent(self):
+        xs = [[0, 0, 1, 1, 0, 1], [0, 0, 1, 1, 0, 1], [0, 1, 0, 1, 1, 1]]
+        self.assertEqual(((3, 4), 0.0), minimum_information_partition(xs))
+
+    def test_minimum_information_partition_processes(self):
+        xs = np.random.RandomState(2019).randint(0, 2, size=(6, 60))
+        for blocks in [None, 2]:
+            self.assertEqual(minimum_information_partition(xs, blocks=blocks),
+                             minimum_information_partition(xs, blocks=blocks, processes=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import unittest
+import numpy as np
+from pyinform import ksg
+
+
+def gaussian_pair(rho, n, seed):
+    rng = np.random.RandomState(seed)
+    xs = rng.normal(size=n)
+    ys = rho * xs + np.sqrt(1 - rho**2) * rng.normal(size=n)
+    return xs, ys
+
+
+def max_norm_distances(points):
+    points = np.asarray(points, dtype=np.float64).reshape(len(points), -1)
+    return np.max(np.abs(points[:, np.newaxis] - points[np.newaxis]), axis=2)
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        self.chunk, self.block = ksg.CHUNK, ksg.BRUTE_BLOCK
+
+    def tearDown(self):
+        ksg.CHUNK, ksg.BRUTE_BLOCK = self.chunk, self.block
+
+    def test_neighbors(self):
+        rng = np.random.RandomState(2019)
+        points = np.round(rng.normal(size=(300, 2)), 1)
+        d = max_norm_distances(points)
+        eps = np.sort(d, axis=1)[:, 3]
+        counts = np.where(eps > 0, np.sum(d < eps[:, np.newaxis], axis=1) - 1, 0)
+
+        index = ksg._Index(points)
+        for chunk, block, threads in [(1 << 14, 1 << 22, None), (64, 1000, 3)]:
+            ksg.CHUNK, ksg.BRUTE_BLOCK = chunk, block
+            self.assertTrue(np.array_equal(eps, index.kth_distances(3, threads)))
+            self.assertTrue(np.array_equal(counts, index.counts(eps, threads)))
+
+
+class TestMutualInfo(unittest.TestCase):
+    def test_mutual_info_invalid(self):
+        with self.assertRaises(ValueError):
+            ksg.mutual_info([], [])
+        with self.assertRaises(ValueError):
+            ksg.mutual_info([0.1, 0.2, 0.3], [0.1, 0.2])
+        with self.assertRaises(ValueError):
+            ksg.mutual_info([[[0.1, 0.2]]], [[[0.1, 0.2]]])
+        with self.assertRaises(ValueError):
+            ksg.mutual_info([0.1, np.nan, 0.3], [0.1, 0.2, 0.3])
+        with self.assertRaises(ValueError):
+            ksg.mutual_info([0.1, 0.2, 0.3], [0.3, 0.2, 0.1], neighbors=3)
+        with self.assertRaises(ValueError):
+            ksg.mutual_info([0.1, 0.2, 0.3], [0.3, 0.2, 0.1], neighbors=0)
+
+    def test_mutual_info_gaussian(self):
+        for rho in [0.0, 0.5, 0.9]:
+            xs, ys = gaussian_pair(rho, 4000, seed=1)
+            self.assertAlmostEqual(-0.5 * np.log2(1 - rho**2), ksg.mutual_info(xs, ys), delta=0.03)
+
+    def test_mutual_info_local(self):
+        xs, ys = gaussian_pair(0.5, 1000, seed=2)
+        local = ksg.mutual_info(xs.reshape(4, 250), ys.reshape(4, 250), local=True)
+        self.assertEqual((4, 250), local.shape)
+        self.assertAlmostEqual(ksg.mutual_info(xs, ys), np.mean(local))
+
+    def test_mutual_info_threads(self):
+        xs, ys = gaussian_pair(0.5, 1000, seed=3)
+        self.assertEqual(ksg.mutual_info(xs, ys), ksg.mutual_info(xs, ys, threads=4))
+
+
+class TestConditionalMutualInfo(unittest.TestCase):
+    def test_conditional_mutual_info_invalid(self):
+        with self.assertRaises(ValueError):
+            ksg.conditional_mutual_info([0.1, 0.2, 0.3], [0.3, 0.2, 0.1], [0.1, 0.2])
+        with self.assertRaises(ValueError):
+            ksg.conditional_mutual_info([0.1, 0.2, 0.3], [0.3, 0.2, 0.1], np.empty((0, 3)))
+
+    def test_conditional_mutual_info_common_driver(self):
+        rng = np.random.RandomState(2019)
+        zs = rng.normal(size=3000)
+        xs = zs + rng.normal(size=3000)
+        ys = zs + rng.normal(size=3000)
+        self.assertAlmostEqual(-0.5 * np.log2(0.75), ksg.mutual_info(xs, ys), delta=0.03)
+        self.assertAlmostEqual(0.0, ksg.conditional_mutual_info(xs, ys, zs), delta=0.03)
+        self.assertAlmostEqual(0.0, ksg.conditional_mutual_info(xs, ys, [zs, rng.normal(size=3000)]), delta=0.03)
+
+    def test_conditional_mutual_info_batch(self):
+        rng = np.random.RandomState(2019)
+        xs, ys, zs = rng.normal(size=(3, 2, 500))
+        expect = [ksg.conditional_mutual_info(x, y, zs) for x, y in zip(xs, ys)]
+        self.assertTrue(np.array_equal(expect, ksg.conditional_mutual_info_batch(xs, ys, zs)))
+
+
+class TestTransferEntropy(unittest.TestCase):
+    def coupled(self, n, seed):
+        rng = np.random.RandomState(seed)
+        source, target = rng.normal(size=n), np.zeros(n)
+        for i in range(1, n):
+            target[i] = 0.5 * target[i - 1] + 0.8 * source[i - 1] + rng.normal()
+        return source, target
+
+    def test_transfer_entropy_invalid(self):
+        source, target = self.coupled(20, seed=1)
+        with self.assertRaises(ValueError):
+            ksg.transfer_entropy(source, target, k=0)
+        with self.assertRaises(ValueError):
+            ksg.transfer_entropy(source, target, k=20)
+        with self.assertRaises(ValueError):
+            ksg.transfer_entropy(source, target[:-1], k=1)
+
+    def test_transfer_entropy_autoregressive(self):
+        source, target = self.coupled(3000, seed=2019)
+        self.assertAlmostEqual(0.5 * np.log2(1.64), ksg.transfer_entropy(source, target, k=1), delta=0.03)
+        self.assertAlmostEqual(0.0, ksg.transfer_entropy(target, source, k=1), delta=0.03)
+
+    def test_transfer_entropy_is_conditional_mutual_info(self):
+        source, target = self.coupled(500, seed=3)
+        te = ksg.transfer_entropy(source, target, k=2)
+        cmi = ksg.conditional_mutual_info(target[2:], source[1:-1], [target[:-2], target[1:-1]])
+        self.assertEqual(cmi, te)
+
+    def test_transfer_entropy_condition(self):
+        source, target = self.coupled(500, seed=4)
+        condition = np.random.RandomState(5).normal(size=500)
+        te = ksg.transfer_entropy(source, target, k=1, condition=condition)
+        cmi = ksg.conditional_mutual_info(target[1:], source[:-1], [target[:-1], condition[:-1]])
+        self.assertEqual(cmi, te)
+
+    def test_transfer_entropy_local(self):
+        source, target = self.coupled(1000, seed=6)
+        local = ksg.transfer_entropy(source.reshape(4, 250), target.reshape(4, 250), k=2, local=True)
+        self.assertEqual((4, 248), local.shape)
+        self.assertAlmostEqual(ksg.transfer_entropy(source.reshape(4, 250), target.reshape(4, 250), k=2),
+                               np.mean(local))
+
+
+if __name__ == "__main__":
+    unittest.main()
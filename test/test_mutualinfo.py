@@ -4,7 +4,7 @@
 import unittest
 import numpy as np
 from pyinform.error import InformError
-from pyinform.mutualinfo import mutual_info
+from pyinform.mutualinfo import mutual_info, multi_info, mutual_info_matrix
 
 
 class TestMutualInfo(unittest.TestCase):
@@ -70,6 +70,19 @@ class TestMutualInfo(unittest.TestCase):
         self.assertAlmostEqual(0.954434,
                                mutual_info([1, 0, 0, 1, 0, 0, 1, 0], [2, 0, 1, 2, 0, 1, 2, 0]), places=6)
 
+    def test_mutual_info_single_observation(self):
+        self.assertAlmostEqual(0.0, mutual_info([1], [0]), places=6)
+        self.assertEqual((1,), mutual_info([1], [0], local=True).shape)
+
+    def test_mutual_info_no_copy(self):
+        from pyinform import instrument
+        xs = np.random.randint(0, 5, 100).astype(np.int32)
+        ys = np.random.randint(0, 5, 100).astype(np.int32)
+        with instrument.record() as records:
+            mi = mutual_info(xs, ys)
+        self.assertEqual(0, records[0].nbytes)
+        self.assertAlmostEqual(multi_info([xs, ys]), mi, places=6)
+
     def test_mutual_info_2D(self):
         xs = np.random.randint(0, 5, 20)
         ys = np.random.randint(0, 5, 20)
@@ -81,6 +94,18 @@ class TestMutualInfo(unittest.TestCase):
 
         self.assertAlmostEqual(expect, got)
 
+    def test_mutual_info_explicit_base(self):
+        xs = [0, 0, 1, 1, 2, 1, 1, 0, 0]
+        ys = [0, 0, 0, 1, 1, 1, 0, 0, 0]
+        self.assertAlmostEqual(mutual_info(xs, ys), mutual_info(xs, ys, b=(3, 2)), places=6)
+        self.assertAlmostEqual(mutual_info(xs, ys), mutual_info(xs, ys, b=4), places=6)
+
+        with self.assertRaises(InformError):
+            mutual_info(xs, ys, b=2)
+
+        with self.assertRaises(ValueError):
+            mutual_info([], [], b=2)
+
 
 class TestLocalMutualInfo(unittest.TestCase):
     def test_mutual_info_empty(self):
@@ -159,5 +184,162 @@ class TestLocalMutualInfo(unittest.TestCase):
         self.assertTrue((expect == np.reshape(got, expect.shape)).all())
 
 
+class TestMultiInfo(unittest.TestCase):
+    def test_multi_info_empty(self):
+        with self.assertRaises(ValueError):
+            multi_info([])
+
+        with self.assertRaises(ValueError):
+            multi_info([[], []])
+
+    def test_multi_info_dimensions(self):
+        with self.assertRaises(ValueError):
+            multi_info([0, 1, 1])
+
+    def test_multi_info_bases(self):
+        with self.assertRaises(ValueError):
+            multi_info([[0, 1, 1], [1, 1, 0]], b=[2, 2, 2])
+
+    def test_multi_info_negative_states(self):
+        with self.assertRaises(InformError):
+            multi_info([[-1, 0, 0], [0, 0, 1]])
+
+        with self.assertRaises(ValueError):
+            multi_info([[-1, 0, 0], [0, 0, 1]], subsets=[[0, 1]])
+
+    def test_multi_info_two_series(self):
+        xs = np.random.randint(0, 5, 20)
+        ys = np.random.randint(0, 3, 20)
+        self.assertAlmostEqual(mutual_info(xs, ys), multi_info([xs, ys]), places=6)
+        self.assertAlmostEqual(mutual_info(xs, ys), multi_info(np.asarray([xs, ys], dtype=np.int32)), places=6)
+        self.assertAlmostEqual(mutual_info(xs, ys), multi_info([xs, ys], b=[5, 3]), places=6)
+
+        expect = mutual_info(xs, ys, local=True)
+        got = multi_info([xs, ys], local=True)
+        self.assertEqual(expect.shape, got.shape)
+        for u, v in zip(expect, got):
+            self.assertAlmostEqual(u, v, places=6)
+
+    def test_multi_info_2D(self):
+        xs = np.random.randint(0, 2, (3, 4, 5))
+        self.assertAlmostEqual(multi_info(xs), multi_info(np.reshape(xs, (3, 20))), places=6)
+        self.assertEqual((4, 5), multi_info(xs, local=True).shape)
+
+    def test_multi_info(self):
+        xs = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1]
+        ys = [0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1]
+        zs = [0, 1, 1, 0, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 1, 0, 1, 0, 1]
+        self.assertAlmostEqual(0.373534, multi_info([xs, ys, zs]), places=6)
+        self.assertAlmostEqual(0.373534, multi_info([xs, ys, zs], local=True).mean(), places=6)
+
+    def test_multi_info_subsets(self):
+        series = np.random.randint(0, 3, (6, 50))
+        subsets = [[0, 1], [2, 4, 5], [0, 1, 2, 3, 4, 5], [-1, 3]]
+        got = multi_info(series, subsets=subsets)
+        self.assertEqual((len(subsets),), got.shape)
+        for subset, value in zip(subsets, got):
+            self.assertAlmostEqual(multi_info(series[subset]), value, places=6)
+
+        with self.assertRaises(ValueError):
+            multi_info(series, subsets=subsets, local=True)
+
+        with self.assertRaises(IndexError):
+            multi_info(series, subsets=[[0, 6]])
+
+
+class TestMutualInfoMatrix(unittest.TestCase):
+    def test_mutual_info_matrix_empty(self):
+        with self.assertRaises(ValueError):
+            mutual_info_matrix([[], []])
+
+    def test_mutual_info_matrix_dimensions(self):
+        with self.assertRaises(ValueError):
+            mutual_info_matrix([0, 1, 1])
+
+        with self.assertRaises(ValueError):
+            mutual_info_matrix([[[0, 1, 1]]])
+
+    def test_mutual_info_matrix_states(self):
+        with self.assertRaises(ValueError):
+            mutual_info_matrix([[-1, 0, 0], [0, 0, 1]])
+
+        with self.assertRaises(ValueError):
+            mutual_info_matrix([[2, 0, 0], [0, 0, 1]], b=2)
+
+    def test_mutual_info_matrix(self):
+        series = np.random.randint(0, 4, (5, 100))
+        series[1] = (series[0] + np.random.randint(0, 2, 100)) % 4
+        mi = mutual_info_matrix(series)
+        self.assertEqual((5, 5), mi.shape)
+        for i in range(5):
+            for j in range(5):
+                self.assertAlmostEqual(mutual_info(series[i], series[j]), mi[i, j], places=6)
+
+    def test_mutual_info_matrix_axis(self):
+        series = np.random.randint(0, 3, (4, 50))
+        expect = mutual_info_matrix(series)
+        got = mutual_info_matrix(series.T, axis=1)
+        self.assertTrue(np.allclose(expect, got))
+
+    def test_mutual_info_matrix_bases(self):
+        series = np.random.randint(0, 3, (4, 50))
+        expect = mutual_info_matrix(series)
+        self.assertTrue(np.allclose(expect, mutual_info_matrix(series, b=3)))
+        self.assertTrue(np.allclose(expect, mutual_info_matrix(series, b=[3, 4, 5, 6])))
+
+        with self.assertRaises(ValueError):
+            mutual_info_matrix(series, b=[3, 3])
+
+    def test_mutual_info_matrix_processes(self):
+        series = np.random.randint(0, 3, (6, 50))
+        expect = mutual_info_matrix(series)
+        got = mutual_info_matrix(series, processes=2)
+        self.assertTrue(np.allclose(expect, got))
+
+
+class TestLaggedMutualInfo(unittest.TestCase):
+    def test_mutual_info_delay_invalid(self):
+        xs = [0, 0, 1, 1, 2, 1, 1, 0, 0]
+        ys = [0, 0, 0, 1, 1, 1, 0, 0, 0]
+        with self.assertRaises(ValueError):
+            mutual_info(xs, ys, delay=-1)
+
+        with self.assertRaises(ValueError):
+            mutual_info(xs, ys, delay=9)
+
+        with self.assertRaises(ValueError):
+            mutual_info(xs, ys, delay=[0, 9])
+
+        with self.assertRaises(ValueError):
+            mutual_info(xs, ys, delay=[0, 1], local=True)
+
+    def test_mutual_info_delay(self):
+        xs = np.random.randint(0, 3, 100)
+        ys = np.random.randint(0, 2, 100)
+        self.assertAlmostEqual(mutual_info(xs, ys), mutual_info(xs, ys, delay=0), places=6)
+        for d in [1, 5, 20]:
+            self.assertAlmostEqual(mutual_info(xs[:-d], ys[d:]),
+                                   mutual_info(xs, ys, delay=d), places=6)
+            self.assertTrue(np.allclose(mutual_info(xs[:-d], ys[d:], local=True),
+                                        mutual_info(xs, ys, delay=d, local=True)))
+
+    def test_mutual_info_lag_profile(self):
+        xs = np.random.randint(0, 3, 100)
+        ys = np.random.randint(0, 2, 100)
+        delays = [3, 0, 1, 99, 3]
+        expect = [mutual_info(xs[:100 - d], ys[d:]) for d in delays]
+        got = mutual_info(xs, ys, delay=delays)
+        self.assertEqual((5,), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+    def test_mutual_info_lag_profile_2D(self):
+        xs = np.random.randint(0, 3, (3, 50))
+        ys = np.random.randint(0, 3, (3, 50))
+        delays = range(10)
+        expect = [mutual_info(xs[:, :50 - d], ys[:, d:]) for d in delays]
+        self.assertTrue(np.allclose(expect, mutual_info(xs, ys, delay=delays)))
+        self.assertTrue(np.allclose(expect, mutual_info(xs, ys, b=(3, 4), delay=delays)))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,103 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import unittest
+import numpy as np
+from collections import Counter
+from pyinform.predictiveinfo import predictive_info, excess_entropy
+
+
+def local_reference(series, kp, kf):
+    xs = np.atleast_2d(series)
+    pasts, futures = [], []
+    for row in xs:
+        for t in range(kp, xs.shape[1] - kf + 1):
+            pasts.append(tuple(row[t - kp:t]))
+            futures.append(tuple(row[t:t + kf]))
+    joints = list(zip(pasts, futures))
+    p, f, j = Counter(pasts), Counter(futures), Counter(joints)
+    n = float(len(joints))
+    pi = [np.log2(n * j[(a, c)] / (p[a] * f[c])) for a, c in joints]
+    return np.reshape(pi, (xs.shape[0], -1))
+
+
+class TestPredictiveInfo(unittest.TestCase):
+    def test_predictive_info_empty(self):
+        with self.assertRaises(ValueError):
+            predictive_info([], 1, 1)
+        with self.assertRaises(ValueError):
+            predictive_info([[]], 1, 1)
+
+    def test_predictive_info_dimensions(self):
+        with self.assertRaises(ValueError):
+            predictive_info([[[1]]], 1, 1)
+
+    def test_predictive_info_invalid_lengths(self):
+        with self.assertRaises(ValueError):
+            predictive_info([0, 1, 1, 0], 0, 1)
+        with self.assertRaises(ValueError):
+            predictive_info([0, 1, 1, 0], 1, 0)
+        with self.assertRaises(ValueError):
+            predictive_info([0, 1, 1, 0], 3, 2)
+        with self.assertRaises(ValueError):
+            predictive_info([0, 1, 1, 0], [1, 3], [1, 2])
+        with self.assertRaises(ValueError):
+            predictive_info([0, 1, 1, 0], [], 1)
+
+    def test_predictive_info_invalid_base(self):
+        with self.assertRaises(ValueError):
+            predictive_info([0, 1, 2, 0], 1, 1, b=2)
+
+    def test_predictive_info_local_grid(self):
+        with self.assertRaises(ValueError):
+            predictive_info([0, 1, 1, 0, 1], [1, 2], 1, local=True)
+
+    def test_predictive_info(self):
+        rng = np.random.RandomState(2019)
+        for b in [2, 3, 5]:
+            xs = rng.randint(0, b, size=(3, 40))
+            for kp, kf in [(1, 1), (2, 1), (1, 3), (3, 2)]:
+                expect = local_reference(xs, kp, kf)
+                self.assertAlmostEqual(np.mean(expect), predictive_info(xs, kp, kf))
+                self.assertTrue(np.allclose(expect, predictive_info(xs, kp, kf, local=True)))
+
+    def test_predictive_info_single_initial_condition(self):
+        xs = [0, 0, 1, 1, 1, 1, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 0, 1]
+        self.assertAlmostEqual(0.233458593344, predictive_info(xs, 2, 1))
+        self.assertEqual((1, 16), predictive_info(xs, 2, 1, local=True).shape)
+
+    def test_predictive_info_grid(self):
+        xs = np.random.RandomState(2019).randint(0, 3, size=(2, 50))
+        kp, kf = [1, 4, 2], [3, 1]
+        grid = predictive_info(xs, kp, kf)
+        self.assertEqual((3, 2), grid.shape)
+        for i, a in enumerate(kp):
+            for j, c in enumerate(kf):
+                self.assertAlmostEqual(predictive_info(xs, a, c), grid[i, j])
+        self.assertEqual((3,), predictive_info(xs, kp, 2).shape)
+
+
+class TestExcessEntropy(unittest.TestCase):
+    def test_excess_entropy_invalid(self):
+        with self.assertRaises(ValueError):
+            excess_entropy([0, 1, 1, 0], 0)
+        with self.assertRaises(ValueError):
+            excess_entropy([0, 1, 1, 0], 3)
+        with self.assertRaises(ValueError):
+            excess_entropy([0, 1, 1, 0], [1, 2], local=True)
+
+    def test_excess_entropy(self):
+        xs = np.random.RandomState(2019).randint(0, 2, size=(4, 30))
+        for k in [1, 2, 3]:
+            self.assertAlmostEqual(predictive_info(xs, k, k), excess_entropy(xs, k))
+            self.assertTrue(np.allclose(predictive_info(xs, k, k, local=True), excess_entropy(xs, k, local=True)))
+        self.assertTrue(np.allclose([excess_entropy(xs, k) for k in [3, 1, 2]], excess_entropy(xs, [3, 1, 2])))
+
+    def test_excess_entropy_periodic(self):
+        xs = [[0, 1, 2] * 5, [1, 2, 0] * 5, [2, 0, 1] * 5]
+        for k in [1, 2, 3]:
+            self.assertAlmostEqual(np.log2(3), excess_entropy(xs, k))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import unittest
+import numpy as np
+from ctypes import c_double, c_int, c_ulong
+from pyinform._prototype import prototype, ERROR, OPTIONAL_SERIES, SERIES, VALUES
+from pyinform.activeinfo import active_info
+
+
+class TestPrototype(unittest.TestCase):
+    def test_series_wrong_dtype(self):
+        with self.assertRaises(TypeError):
+            SERIES.from_param(np.zeros(4, dtype=np.int64))
+
+        with self.assertRaises(TypeError):
+            VALUES.from_param(np.zeros(4, dtype=np.int32))
+
+    def test_series_not_contiguous(self):
+        with self.assertRaises(TypeError):
+            SERIES.from_param(np.zeros((4, 4), dtype=np.int32)[:, 0])
+
+    def test_series_read_only(self):
+        xs = np.asarray([0, 0, 1, 1, 1, 1, 0, 0, 0], dtype=np.int32)
+        expect = active_info(xs, 2)
+        xs.flags.writeable = False
+        SERIES.from_param(xs)
+        self.assertAlmostEqual(expect, active_info(xs, 2))
+
+    def test_optional_series(self):
+        self.assertIsNone(OPTIONAL_SERIES.from_param(None))
+        OPTIONAL_SERIES.from_param(np.zeros(4, dtype=np.int32))
+        with self.assertRaises(TypeError):
+            SERIES.from_param(None)
+
+    def test_prototype_cached(self):
+        argtypes = [SERIES, c_ulong, c_ulong, c_int, c_ulong, ERROR]
+        f = prototype("inform_block_entropy", c_double, argtypes)
+        self.assertIs(f, prototype("inform_block_entropy", c_double, list(argtypes)))
+        self.assertIsNot(f, prototype("inform_block_entropy", None, argtypes))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -126,6 +126,17 @@ class TestRelativeEntropy(unittest.TestCase):
 
         self.assertQuasiEqual(expect, got)
 
+    def test_relative_entropy_explicit_base(self):
+        xs = [0, 1, 0, 0, 0, 0, 0, 0, 0, 1]
+        ys = [0, 1, 1, 1, 1, 0, 0, 1, 0, 0]
+        self.assertAlmostEqual(relative_entropy(xs, ys),
+                               relative_entropy(xs, ys, b=2), places=6)
+        self.assertAlmostEqual(relative_entropy(xs, ys),
+                               relative_entropy(xs, ys, b=3), places=6)
+
+        with self.assertRaises(ValueError):
+            relative_entropy([], [], b=2)
+
 
 class TestLocalRelativeEntropy(unittest.TestCase):
     def assertQuasiEqual(self, expect, got, places=7):
@@ -0,0 +1,91 @@
+# Copyright 2016-2019 Douglas G. Moore. All rights reserved.
+# Use of this source code is governed by a MIT
+# license that can be found in the LICENSE file.
+import unittest
+import numpy as np
+from pyinform import _histogram
+from pyinform.activeinfo import active_info
+from pyinform.separableinfo import separable_info
+from pyinform.transferentropy import transfer_entropy
+
+
+class TestSeparableInfo(unittest.TestCase):
+    def test_separable_info_empty(self):
+        with self.assertRaises(ValueError):
+            separable_info([], [], 1)
+        with self.assertRaises(ValueError):
+            separable_info([[]], [1, 0], 1)
+
+    def test_separable_info_dimensions(self):
+        with self.assertRaises(ValueError):
+            separable_info([[[[1]]]], [[[1]]], 1)
+
+    def test_separable_info_shapes(self):
+        with self.assertRaises(ValueError):
+            separable_info([0, 1, 1], [0, 1, 1, 0], 1)
+        with self.assertRaises(ValueError):
+            separable_info([[0, 1, 1], [1, 0, 1]], [0, 1, 1, 0], 1)
+
+    def test_separable_info_invalid_history(self):
+        with self.assertRaises(ValueError):
+            separable_info([0, 1, 1, 0], [0, 1, 1, 0], 0)
+        with self.assertRaises(ValueError):
+            separable_info([0, 1, 1, 0], [0, 1, 1, 0], 4)
+
+    def test_separable_info_invalid_base(self):
+        with self.assertRaises(ValueError):
+            separable_info([0, 1, 2, 0], [0, 1, 1, 0], 1, b=2)
+
+    def test_separable_info_single_source(self):
+        xs = [0, 1, 1, 1, 1, 0, 0, 0, 0]
+        ys = [0, 0, 1, 1, 1, 1, 0, 0, 0]
+        self.assertAlmostEqual(0.985228136034, separable_info(xs, ys, 2))
+        self.assertTrue(np.allclose([[0.80735492, 0.80735492, 0.80735492, 0.80735492,
+                                      1.22239242, 1.22239242, 1.22239242]],
+                                    separable_info(xs, ys, 2, local=True)))
+
+    def test_separable_info_many_sources(self):
+        xs = [0, 1, 1, 1, 1, 0, 0, 0, 0]
+        ws = [0, 1, 0, 1, 0, 1, 0, 1, 0]
+        ys = [0, 0, 1, 1, 1, 1, 0, 0, 0]
+        self.assertAlmostEqual(1.093069207772, separable_info([xs, ws], ys, 2))
+
+    def test_separable_info_decomposition(self):
+        rng = np.random.RandomState(2019)
+        target = rng.randint(0, 2, size=(3, 50))
+        sources = rng.randint(0, 2, size=(4, 3, 50))
+        for k in [1, 2, 3]:
+            expect = active_info(target, k) + sum(transfer_entropy(s, target, k) for s in sources)
+            self.assertAlmostEqual(expect, separable_info(sources, target, k))
+
+            expect = active_info(target, k, local=True) + sum(transfer_entropy(s, target, k, local=True)
+                                                              for s in sources)
+            self.assertTrue(np.allclose(expect, separable_info(sources, target, k, local=True)))
+
+    def test_separable_info_blocks(self):
+        rng = np.random.RandomState(2019)
+        target = rng.randint(0, 3, size=200)
+        sources = rng.randint(0, 3, size=(7, 200))
+        expect = separable_info(sources, target, 2)
+        local = separable_info(sources, target, 2, local=True)
+
+        chunk_size = _histogram.CHUNK_SIZE
+        try:
+            _histogram.CHUNK_SIZE = 400
+            self.assertAlmostEqual(expect, separable_info(sources, target, 2))
+            self.assertTrue(np.allclose(local, separable_info(sources, target, 2, local=True)))
+        finally:
+            _histogram.CHUNK_SIZE = chunk_size
+
+    def test_separable_info_processes(self):
+        rng = np.random.RandomState(2019)
+        target = rng.randint(0, 2, size=(2, 100))
+        sources = rng.randint(0, 2, size=(6, 2, 100))
+        self.assertAlmostEqual(separable_info(sources, target, 2),
+                               separable_info(sources, target, 2, processes=2))
+        self.assertTrue(np.allclose(separable_info(sources, target, 2, local=True),
+                                    separable_info(sources, target, 2, local=True, processes=2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
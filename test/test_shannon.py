@@ -6,6 +6,7 @@ import numpy as np
 
 from math import isnan, log
 from pyinform.dist import Dist
+from pyinform.blockentropy import block_entropy
 from pyinform.shannon import conditional_entropy, entropy, relative_entropy
 
 
@@ -212,5 +213,37 @@ class TestShannon(unittest.TestCase):
             self.assertAlmostEqual(log(5., b), relative_entropy(p, q, b))
 
 
+class TestEstimatedEntropy(unittest.TestCase):
+    def test_entropy_estimator_invalid(self):
+        with self.assertRaises(ValueError):
+            entropy(Dist([1, 2]), estimator="grassberger")
+
+        for estimator in ["miller-madow", "jackknife", "chao-shen", "nsb"]:
+            with self.assertRaises(ValueError):
+                entropy(Dist(5), estimator=estimator)
+
+    def test_entropy_plugin(self):
+        d = Dist([3, 1, 0, 1])
+        self.assertAlmostEqual(entropy(d), entropy(d, estimator="plugin"), places=6)
+
+    def test_entropy_miller_madow(self):
+        d = Dist([3, 1, 0, 1])
+        self.assertAlmostEqual(entropy(d) + 2.0 / (2.0 * 5 * log(2.0)),
+                               entropy(d, estimator="miller-madow"), places=6)
+        self.assertAlmostEqual(entropy(d, b=3) + 2.0 / (2.0 * 5 * log(3.0)),
+                               entropy(d, b=3, estimator="miller-madow"), places=6)
+
+    def test_entropy_single_event(self):
+        for estimator in ["miller-madow", "jackknife", "chao-shen"]:
+            self.assertAlmostEqual(0.0, entropy(Dist([0, 5]), estimator=estimator), places=6)
+
+    def test_entropy_block_entropy(self):
+        series = np.random.randint(0, 4, 100)
+        d = Dist(np.bincount(series, minlength=4))
+        for estimator in ["miller-madow", "jackknife", "chao-shen", "nsb"]:
+            self.assertAlmostEqual(block_entropy(series, 1, estimator=estimator),
+                                   entropy(d, estimator=estimator), places=6)
+
+
 if __name__ == "__main__":
     unittest.main()
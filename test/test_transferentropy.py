@@ -4,7 +4,7 @@
 import unittest
 import numpy as np
 from pyinform.error import InformError
-from pyinform.transferentropy import transfer_entropy
+from pyinform.transferentropy import transfer_entropy, transfer_entropy_pair
 
 
 class TestTransferEntropy(unittest.TestCase):
@@ -224,6 +224,21 @@ class TestTransferEntropy(unittest.TestCase):
         self.assertAlmostEqual(0.000000, transfer_entropy(
             xs, ys, condition=xs, k=2), places=6)
 
+    def test_transfer_entropy_explicit_base(self):
+        xs = [0, 1, 1, 1, 1, 0, 0, 0, 0]
+        ys = [0, 0, 1, 1, 1, 1, 0, 0, 2]
+        ws = [0, 1, 1, 1, 1, 0, 1, 1, 1]
+        self.assertAlmostEqual(transfer_entropy(xs, ys, 2),
+                               transfer_entropy(xs, ys, 2, b=3), places=6)
+        self.assertAlmostEqual(transfer_entropy(xs, ys, 2, condition=ws),
+                               transfer_entropy(xs, ys, 2, condition=ws, b=5), places=6)
+
+        with self.assertRaises(InformError):
+            transfer_entropy(xs, ys, 2, b=2)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy([], [], 2, b=2)
+
 
 class TestLocalTransferEntropy(unittest.TestCase):
     def test_transfer_entropy_empty(self):
@@ -416,5 +431,244 @@ class TestLocalTransferEntropy(unittest.TestCase):
             xs, ys, 2, condition=cs, local=True).mean(), places=6)
 
 
+class TestLaggedTransferEntropy(unittest.TestCase):
+    def test_transfer_entropy_delay_invalid(self):
+        xs = [0, 1, 1, 0, 1, 0, 0, 1, 1]
+        ys = [0, 0, 0, 1, 1, 0, 1, 0, 0]
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, delay=-1)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, delay=7)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, delay=[0, 7])
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, delay=[0, 1], local=True)
+
+    def test_transfer_entropy_delay_zero(self):
+        xs = np.random.randint(0, 2, 100)
+        ys = np.random.randint(0, 2, 100)
+        self.assertAlmostEqual(transfer_entropy(xs, ys, 2),
+                               transfer_entropy(xs, ys, 2, delay=0), places=6)
+
+    def test_transfer_entropy_delay(self):
+        xs = np.random.randint(0, 2, 100)
+        ys = np.random.randint(0, 2, 100)
+        for d in [1, 5, 20]:
+            expect = transfer_entropy(xs[:-d], ys[d:], 2)
+            self.assertAlmostEqual(expect, transfer_entropy(xs, ys, 2, delay=d), places=6)
+            self.assertTrue(np.allclose(transfer_entropy(xs[:-d], ys[d:], 2, local=True),
+                                        transfer_entropy(xs, ys, 2, delay=d, local=True)))
+
+    def test_transfer_entropy_lag_profile(self):
+        xs = np.random.randint(0, 3, (2, 100))
+        ys = np.random.randint(0, 3, (2, 100))
+        delays = [3, 0, 1, 10, 3]
+        expect = [transfer_entropy(xs[:, :100 - d], ys[:, d:], 2) for d in delays]
+        got = transfer_entropy(xs, ys, 2, delay=delays)
+        self.assertEqual((5,), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+    def test_transfer_entropy_lag_profile_condition(self):
+        xs = np.random.randint(0, 2, 100)
+        ys = np.random.randint(0, 2, 100)
+        ws = np.random.randint(0, 2, (2, 100))
+        delays = range(0, 20, 4)
+        expect = [transfer_entropy(xs[:100 - d], ys[d:], 2, condition=ws[:, d:]) for d in delays]
+        self.assertTrue(np.allclose(expect, transfer_entropy(xs, ys, 2, condition=ws, delay=delays)))
+
+    def test_transfer_entropy_lag_profile_peak(self):
+        xs = np.random.randint(0, 2, 1000)
+        ys = np.roll(xs, 4)
+        profile = transfer_entropy(xs, ys, 1, delay=range(8))
+        self.assertEqual(3, np.argmax(profile))
+        self.assertAlmostEqual(1.0, profile[3], delta=0.05)
+
+
+class TestEmbeddedTransferEntropy(unittest.TestCase):
+    def test_transfer_entropy_embedding_invalid(self):
+        xs = [0, 1, 1, 0, 1, 0, 0, 1, 1]
+        ys = [0, 0, 0, 1, 1, 0, 1, 0, 0]
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, l=0)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, tau_source=0)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, tau_target=0)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, tau_target=8)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, l=5, tau_source=2)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, l=2, b=1)
+
+    def test_transfer_entropy_embedding_default(self):
+        xs = np.random.randint(0, 3, (2, 100))
+        ys = np.random.randint(0, 3, (2, 100))
+        ws = np.random.randint(0, 3, (2, 100))
+        # Spacing the source embedding has no effect when l = 1
+        self.assertAlmostEqual(transfer_entropy(xs, ys, 2, condition=ws),
+                               transfer_entropy(xs, ys, 2, condition=ws, tau_source=3), places=6)
+        self.assertTrue(np.allclose(transfer_entropy(xs, ys, 2, condition=ws, local=True),
+                                    transfer_entropy(xs, ys, 2, condition=ws, tau_source=3, local=True)))
+
+    def test_transfer_entropy_source_history(self):
+        xs = np.random.randint(0, 2, 1000)
+        ys = np.zeros(1000, dtype=np.int32)
+        ys[2:] = xs[1:-1] ^ xs[:-2]
+        self.assertAlmostEqual(0.0, transfer_entropy(xs, ys, 1), delta=0.05)
+        self.assertAlmostEqual(1.0, transfer_entropy(xs, ys, 1, l=2), delta=0.05)
+        self.assertAlmostEqual(1.0, transfer_entropy(xs, ys, 1, l=2, local=True).mean(), delta=0.05)
+
+    def test_transfer_entropy_source_spacing(self):
+        xs = np.random.randint(0, 2, 1000)
+        ys = np.zeros(1000, dtype=np.int32)
+        ys[4:] = xs[3:-1] ^ xs[:-4]
+        self.assertAlmostEqual(0.0, transfer_entropy(xs, ys, 1, l=2), delta=0.05)
+        self.assertAlmostEqual(1.0, transfer_entropy(xs, ys, 1, l=2, tau_source=3), delta=0.05)
+
+    def test_transfer_entropy_target_spacing(self):
+        xs = np.random.randint(0, 2, 1000)
+        ys = np.random.randint(0, 2, 1000)
+        # Spacing the target embedding has no effect when k = 1
+        self.assertAlmostEqual(transfer_entropy(xs, ys, 1),
+                               transfer_entropy(xs, ys, 1, tau_target=5), places=6)
+        local = transfer_entropy(xs, ys, 3, tau_target=2, local=True)
+        self.assertEqual((1, 995), local.shape)
+        self.assertAlmostEqual(transfer_entropy(xs, ys, 3, tau_target=2), local.mean(), places=6)
+
+    def test_transfer_entropy_embedding_delay(self):
+        xs = np.random.randint(0, 2, (2, 100))
+        ys = np.random.randint(0, 2, (2, 100))
+        delays = [0, 3, 1]
+        expect = [transfer_entropy(xs[:, :100 - d], ys[:, d:], 2, l=2, tau_source=2) for d in delays]
+        self.assertTrue(np.allclose(expect, transfer_entropy(xs, ys, 2, l=2, tau_source=2, delay=delays)))
+        self.assertAlmostEqual(expect[1], transfer_entropy(xs, ys, 2, l=2, tau_source=2, delay=3), places=6)
+
+
+class TestPerTrialTransferEntropy(unittest.TestCase):
+    def test_transfer_entropy_per_trial_invalid(self):
+        xs = np.random.randint(0, 2, (4, 20))
+        ys = np.random.randint(0, 2, (4, 20))
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, local=True, per_trial=True)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, delay=[0, 1], per_trial=True)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 0, per_trial=True)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 20, per_trial=True)
+
+    def test_transfer_entropy_per_trial_rows(self):
+        xs = np.random.randint(0, 3, (20, 50))
+        ys = np.random.randint(0, 3, (20, 50))
+        expect = [transfer_entropy(x, y, 2) for x, y in zip(xs, ys)]
+        got = transfer_entropy(xs, ys, 2, per_trial=True)
+        self.assertEqual((20,), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+    def test_transfer_entropy_per_trial_condition(self):
+        xs = np.random.randint(0, 2, (10, 50))
+        ys = np.random.randint(0, 2, (10, 50))
+        zs = np.random.randint(0, 2, (10, 50))
+        expect = [transfer_entropy(x, y, 1, condition=z) for x, y, z in zip(xs, ys, zs)]
+        self.assertTrue(np.allclose(expect, transfer_entropy(xs, ys, 1, condition=zs, per_trial=True)))
+
+    def test_transfer_entropy_per_trial_embedding(self):
+        xs = np.random.randint(0, 2, (10, 60))
+        ys = np.random.randint(0, 2, (10, 60))
+        expect = [transfer_entropy(x, y, 2, l=2, tau_target=2, delay=1) for x, y in zip(xs, ys)]
+        got = transfer_entropy(xs, ys, 2, l=2, tau_target=2, delay=1, per_trial=True)
+        self.assertTrue(np.allclose(expect, got))
+
+
+class TestEnsembleTransferEntropy(unittest.TestCase):
+    def test_transfer_entropy_ensemble_invalid(self):
+        xs = np.random.randint(0, 2, (4, 20))
+        ys = np.random.randint(0, 2, (4, 20))
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, per_trial=True, ensemble=True)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 2, delay=[0, 1], ensemble=True)
+
+        with self.assertRaises(ValueError):
+            transfer_entropy(xs, ys, 0, ensemble=True)
+
+    def test_transfer_entropy_ensemble_time_steps(self):
+        xs = np.random.randint(0, 3, (40, 12))
+        ys = np.random.randint(0, 3, (40, 12))
+        expect = [transfer_entropy(xs[:, t:t + 3], ys[:, t:t + 3], 2) for t in range(10)]
+        got = transfer_entropy(xs, ys, 2, ensemble=True)
+        self.assertEqual((10,), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+        expect = np.hstack([transfer_entropy(xs[:, t:t + 3], ys[:, t:t + 3], 2, local=True) for t in range(10)])
+        got = transfer_entropy(xs, ys, 2, local=True, ensemble=True)
+        self.assertEqual((40, 10), got.shape)
+        self.assertTrue(np.allclose(expect, got))
+
+    def test_transfer_entropy_ensemble_condition(self):
+        xs = np.random.randint(0, 2, (40, 12))
+        ys = np.random.randint(0, 2, (40, 12))
+        zs = np.random.randint(0, 2, (40, 12))
+        expect = [transfer_entropy(xs[:, t:t + 2], ys[:, t:t + 2], 1, condition=zs[:, t:t + 2]) for t in range(11)]
+        self.assertTrue(np.allclose(expect, transfer_entropy(xs, ys, 1, condition=zs, ensemble=True)))
+
+    def test_transfer_entropy_ensemble_delay(self):
+        xs = np.random.randint(0, 2, (40, 12))
+        ys = np.random.randint(0, 2, (40, 12))
+        expect = transfer_entropy(xs[:, :-2], ys[:, 2:], 2, ensemble=True)
+        self.assertTrue(np.allclose(expect, transfer_entropy(xs, ys, 2, delay=2, ensemble=True)))
+
+
+class TestTransferEntropyPair(unittest.TestCase):
+    def test_transfer_entropy_pair_invalid(self):
+        with self.assertRaises(ValueError):
+            transfer_entropy_pair([], [], 1)
+        with self.assertRaises(ValueError):
+            transfer_entropy_pair([0, 1, 1, 0], [0, 1, 1], 1)
+        with self.assertRaises(ValueError):
+            transfer_entropy_pair([[[0, 1]]], [[[0, 1]]], 1)
+        with self.assertRaises(ValueError):
+            transfer_entropy_pair([0, 1, 1, 0], [0, 1, 1, 0], 0)
+        with self.assertRaises(ValueError):
+            transfer_entropy_pair([0, 1, 1, 0], [0, 1, 1, 0], 4)
+        with self.assertRaises(ValueError):
+            transfer_entropy_pair([0, 1, 2, 0], [0, 1, 1, 0], 1, b=2)
+
+    def test_transfer_entropy_pair(self):
+        xs = [0, 1, 1, 1, 1, 0, 0, 0, 0]
+        ys = [0, 0, 1, 1, 1, 1, 0, 0, 0]
+        xy, yx, net = transfer_entropy_pair(xs, ys, 2)
+        self.assertAlmostEqual(0.679270, xy, places=6)
+        self.assertAlmostEqual(0.0, yx, places=6)
+        self.assertAlmostEqual(0.679270, net, places=6)
+
+    def test_transfer_entropy_pair_directions(self):
+        xs = np.random.randint(0, 3, (4, 30))
+        ys = np.random.randint(0, 3, (4, 30))
+        for k in [1, 2, 3]:
+            xy, yx, net = transfer_entropy_pair(xs, ys, k)
+            self.assertAlmostEqual(transfer_entropy(xs, ys, k), xy)
+            self.assertAlmostEqual(transfer_entropy(ys, xs, k), yx)
+            self.assertAlmostEqual(xy - yx, net)
+
+            xy, yx, net = transfer_entropy_pair(xs, ys, k, local=True)
+            self.assertTrue(np.allclose(transfer_entropy(xs, ys, k, local=True), xy))
+            self.assertTrue(np.allclose(transfer_entropy(ys, xs, k, local=True), yx))
+            self.assertTrue(np.allclose(xy - yx, net))
+
+
 if __name__ == "__main__":
     unittest.main()
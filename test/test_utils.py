@@ -4,7 +4,11 @@
 import unittest
 import numpy as np
 from pyinform.error import InformError
-from pyinform.utils import bin_series, coalesce_series, decode, encode, series_range
+from pyinform.activeinfo import active_info
+from pyinform.mutualinfo import mutual_info
+from pyinform.transferentropy import transfer_entropy
+from pyinform.utils import (bin_series, black_box, bootstrap, coalesce_series, decode, encode, optimize_k, partitions,
+                            series_range)
 
 
 class TestSeriesRange(unittest.TestCase):
@@ -150,6 +154,87 @@ class TestBinning(unittest.TestCase):
             ([[0, 0, 1, 1, 2, 2], [2, 2, 1, 1, 0, 0]] == binned).all())
 
 
+class TestBlackBox(unittest.TestCase):
+    def test_black_box_empty(self):
+        with self.assertRaises(ValueError):
+            black_box([])
+        with self.assertRaises(ValueError):
+            black_box([[]])
+
+    def test_black_box_dimensions(self):
+        with self.assertRaises(ValueError):
+            black_box([[[[0, 1]]]])
+
+    def test_black_box_invalid_parts(self):
+        xs = [[0, 1, 1, 0], [1, 1, 0, 0], [0, 0, 0, 1]]
+        with self.assertRaises(ValueError):
+            black_box(xs, parts=[0, 1])
+        with self.assertRaises(ValueError):
+            black_box(xs, parts=[0, -1, 0])
+        with self.assertRaises(ValueError):
+            black_box(xs, parts=[0, 2, 0])
+
+    def test_black_box_invalid_lengths(self):
+        xs = [[0, 1, 1, 0], [1, 1, 0, 0], [0, 0, 0, 1]]
+        with self.assertRaises(ValueError):
+            black_box(xs, k=0)
+        with self.assertRaises(ValueError):
+            black_box(xs, future=-1)
+        with self.assertRaises(ValueError):
+            black_box(xs, k=3, future=2)
+        with self.assertRaises(ValueError):
+            black_box(xs, parts=[0, 1, 1], k=[1, 2, 3])
+
+    def test_black_box_invalid_base(self):
+        with self.assertRaises(ValueError):
+            black_box([[0, 1, 2], [0, 1, 1]], b=2)
+        with self.assertRaises(ValueError):
+            black_box([[0, 1, 2], [0, 1, 1]], b=[3, 2, 2])
+
+    def test_black_box_encode(self):
+        rng = np.random.RandomState(2019)
+        xs = rng.randint(0, 3, size=(4, 2, 12))
+        parts, ks, fs = [1, 0, 1, 0], [2, 3], [1, 0]
+        box, bases = black_box(xs, parts=parts, k=ks, future=fs, b=3)
+        self.assertEqual((2, 2, 9), box.shape)
+        self.assertEqual([3**6, 3**6], list(bases))
+        for j in range(2):
+            nodes = [i for i, part in enumerate(parts) if part == j]
+            for trial in range(2):
+                for u in range(9):
+                    t = u + 2
+                    state = [xs[i, trial, s] for i in nodes for s in range(t - ks[j] + 1, t + fs[j] + 1)]
+                    self.assertEqual(sum(x * 3**e for e, x in enumerate(reversed(state))), box[j, trial, u])
+
+    def test_black_box_single_part(self):
+        xs = [[0, 1, 1, 0, 1, 0], [1, 1, 0, 0, 1, 0], [0, 0, 0, 1, 1, 1]]
+        box, base = black_box(xs)
+        self.assertEqual(8, base)
+        self.assertEqual([2, 6, 4, 1, 7, 1], list(box))
+        box, base = black_box(xs[0], k=2, future=1)
+        self.assertEqual(8, base)
+        self.assertEqual([3, 6, 5, 2], list(box))
+
+    def test_black_box_overflow(self):
+        xs = np.random.RandomState(2019).randint(0, 2, size=(80, 3, 50))
+        box, base = black_box(xs)
+        self.assertEqual((3, 50), box.shape)
+        self.assertEqual(np.int64, box.dtype)
+        self.assertEqual(150, np.unique(box).size)
+        self.assertTrue(np.amax(box) < base < 2**31)
+
+        coalesced, base = black_box(xs, coalesce=True)
+        self.assertEqual(150, base)
+        self.assertTrue(np.array_equal(np.unique(box, return_inverse=True)[1].reshape(3, 50), coalesced))
+
+    def test_black_box_int32_overflow(self):
+        xs = np.random.RandomState(2019).randint(0, 2, size=(34, 3, 50))
+        box, base = black_box(xs, parts=[0] * 33 + [1])
+        self.assertTrue(np.array_equal([150, 2], base))
+        self.assertEqual(150, np.unique(box[0]).size)
+        self.assertTrue(np.array_equal(xs[33], box[1]))
+
+
 class TestCoalesce(unittest.TestCase):
     def test_empty(self):
         with self.assertRaises(InformError):
@@ -267,5 +352,186 @@ class TestEncoding(unittest.TestCase):
             self.assertEqual(i, encode(state, b=3))
 
 
+class TestOptimizeK(unittest.TestCase):
+    def test_optimize_k_invalid(self):
+        xs = np.random.randint(0, 2, 100)
+        with self.assertRaises(ValueError):
+            optimize_k(active_info, xs, 4, criterion="aic")
+
+        with self.assertRaises(ValueError):
+            optimize_k(active_info, xs, 4, k_min=0)
+
+        with self.assertRaises(ValueError):
+            optimize_k(active_info, xs, 2, k_min=3)
+
+        with self.assertRaises(ValueError):
+            optimize_k(active_info, xs, 4, surrogates=10, alpha=0.05)
+
+    def test_optimize_k_surrogate_level(self):
+        xs = np.arange(100) % 7
+
+        def significant(exceeding):
+            calls = []
+
+            def measure(ys, k):
+                if np.array_equal(xs, ys):
+                    return 0.5 * k
+                calls.append(k)
+                return 1.0 if k == 2 and calls.count(2) <= exceeding else 0.0
+
+            return optimize_k(measure, xs, 2, surrogates=99, alpha=0.05)[0] == 2
+
+        # p = (exceeding + 1) / (surrogates + 1) is compared to alpha = 0.05
+        self.assertTrue(significant(4))
+        self.assertFalse(significant(5))
+
+    def test_optimize_k_early_stop(self):
+        calls = []
+
+        def measure(xs, k):
+            calls.append(k)
+            return min(k, 3) * 0.5
+
+        self.assertEqual((3, 1.5), optimize_k(measure, [0, 1, 0, 1], 10, criterion="gain"))
+        self.assertEqual([1, 2, 3, 4], calls)
+
+    def test_optimize_k_arguments(self):
+        def measure(xs, ys, k, scale=1.0):
+            self.assertEqual(np.int32, xs.dtype)
+            self.assertEqual(np.int32, ys.dtype)
+            return scale * min(k, 2)
+
+        self.assertEqual((2, 4.0), optimize_k(measure, ([0, 1], [1, 0]), 5, criterion="gain", scale=2.0))
+
+    def test_optimize_k_gain(self):
+        xs = [1, 1, 0, 1, 1, 0, 1, 1, 0, 1, 1, 0, 1, 1, 0, 1, 1, 0, 1, 1, 0]
+        k, value = optimize_k(active_info, xs, 4, criterion="gain")
+        self.assertEqual(2, k)
+        self.assertAlmostEqual(active_info(xs, 2), value, places=6)
+
+    def test_optimize_k_surrogate(self):
+        rng = np.random.RandomState(2019)
+        xs = np.zeros(2000, dtype=np.int32)
+        flips = rng.random_sample(2000) < 0.1
+        for t in range(2, 2000):
+            xs[t] = xs[t - 2] ^ flips[t]
+        self.assertEqual(2, optimize_k(active_info, xs, 6, seed=2019)[0])
+
+        xs = rng.randint(0, 2, (3, 300))
+        self.assertEqual(1, optimize_k(active_info, xs, 5, seed=2019)[0])
+
+    def test_optimize_k_transfer_entropy(self):
+        rng = np.random.RandomState(2019)
+        source = rng.randint(0, 2, 2000)
+        target = np.zeros(2000, dtype=np.int32)
+        for t in range(2, 2000):
+            target[t] = source[t - 1] ^ target[t - 2]
+        k, value = optimize_k(transfer_entropy, (source, target), 5, seed=2019)
+        self.assertEqual(2, k)
+        self.assertAlmostEqual(1.0, value, delta=0.05)
+
+
+class TestBootstrap(unittest.TestCase):
+    def test_bootstrap_invalid(self):
+        xs = np.random.randint(0, 2, (4, 20))
+        with self.assertRaises(ValueError):
+            bootstrap(active_info, xs, 10, resample="blocks", k=2)
+
+        with self.assertRaises(ValueError):
+            bootstrap(active_info, xs, 0, k=2)
+
+        with self.assertRaises(ValueError):
+            bootstrap(active_info, xs[0], 10, k=2)
+
+        with self.assertRaises(ValueError):
+            bootstrap(active_info, -xs, 10, k=2)
+
+        with self.assertRaises(ValueError):
+            bootstrap(lambda xs: 0.0, xs, 10, resample="samples")
+
+        with self.assertRaises(ValueError):
+            bootstrap(lambda xs: np.zeros(xs.shape), xs, 10)
+
+        with self.assertRaises(ValueError):
+            bootstrap(lambda xs: 0.0, xs[0], 10)
+
+        with self.assertRaises(ValueError):
+            bootstrap(lambda xs, ys: 0.0, (xs, xs[0]), 10)
+
+        with self.assertRaises(ValueError):
+            bootstrap(lambda xs, ys: 0.0, (xs, xs[:2]), 10)
+
+    def test_bootstrap_matches_recomputation(self):
+        rng = np.random.RandomState(2019)
+        xs = rng.randint(0, 3, (8, 40))
+        ys = (xs + rng.randint(0, 2, (8, 40))) % 3
+
+        def generic(measure):
+            return lambda *args, **kwargs: measure(*args, **kwargs)
+
+        for measure, series, kwargs in [(active_info, xs, {"k": 2}),
+                                        (mutual_info, (xs, ys), {}),
+                                        (transfer_entropy, (xs, ys), {"k": 2})]:
+            expected = bootstrap(generic(measure), series, 100, seed=2019, **kwargs)
+            got = bootstrap(measure, series, 100, seed=2019, **kwargs)
+            self.assertAlmostEqual(expected.value, got.value, places=6)
+            self.assertTrue(np.allclose(expected.replicates, got.replicates))
+
+    def test_bootstrap_interval(self):
+        rng = np.random.RandomState(2019)
+        xs = rng.randint(0, 2, (20, 100))
+        result = bootstrap(active_info, xs, 500, seed=2019, k=2)
+        self.assertEqual((500,), result.replicates.shape)
+        self.assertAlmostEqual(active_info(xs, 2), result.value, places=6)
+        self.assertLessEqual(result.low, result.high)
+        self.assertAlmostEqual(np.percentile(result.replicates, 2.5), result.low)
+        self.assertAlmostEqual(np.percentile(result.replicates, 97.5), result.high)
+
+    def test_bootstrap_samples(self):
+        rng = np.random.RandomState(2019)
+        xs = rng.randint(0, 2, 200)
+        ys = xs ^ (rng.random_sample(200) < 0.2)
+        result = bootstrap(mutual_info, (xs, ys), 200, resample="samples", seed=2019)
+        self.assertLess(result.low, mutual_info(xs, ys))
+        self.assertGreater(result.high, mutual_info(xs, ys))
+
+    def test_bootstrap_seed(self):
+        xs = np.random.randint(0, 2, (6, 30))
+        serial = bootstrap(active_info, xs, 130, seed=7, k=2)
+        parallel = bootstrap(active_info, xs, 130, seed=7, processes=2, k=2)
+        self.assertTrue(np.allclose(serial.replicates, parallel.replicates))
+
+
+class TestPartitions(unittest.TestCase):
+    def test_partitions_invalid(self):
+        with self.assertRaises(ValueError):
+            partitions(0)
+        with self.assertRaises(ValueError):
+            partitions(3, blocks=0)
+        with self.assertRaises(ValueError):
+            partitions(3, blocks=4)
+
+    def test_partitions_small(self):
+        self.assertEqual([(1,)], list(partitions(1)))
+        self.assertEqual([(7,), (3, 4), (5, 2), (1, 6), (1, 2, 4)], list(partitions(3)))
+        self.assertEqual([(3, 4), (5, 2), (1, 6)], list(partitions(3, blocks=2)))
+
+    def test_partitions_count(self):
+        bell = [1, 2, 5, 15, 52, 203, 877, 4140]
+        for n, count in enumerate(bell, 1):
+            ps = list(partitions(n))
+            self.assertEqual(count, len(ps))
+            self.assertEqual(count, len(set(ps)))
+            for p in ps:
+                self.assertEqual((1 << n) - 1, sum(p))
+                self.assertEqual(list(p), sorted(p, key=lambda m: m & -m))
+
+    def test_partitions_blocks(self):
+        for n in range(1, 8):
+            ps = list(partitions(n))
+            for blocks in range(1, n + 1):
+                self.assertEqual([p for p in ps if len(p) == blocks], list(partitions(n, blocks=blocks)))
+
+
 if __name__ == "__main__":
     unittest.main()